@@ -19,6 +19,13 @@ import os
 import time
 import Live
 import RemixNet
+import Logger
+import Profiler
+import Scheduler
+import EventBus
+import BeatClock
+import LiveApiProxy
+from BaseHandler import send_batch
 
 # ******************************************************************************
 # Main script module AaMakro5oul
@@ -27,40 +34,152 @@ import RemixNet
 class AaMakro5oul:
     __doc__ = 'Script for AaMakro5oul controller'
 
+    # base addresses of the modules, a lazy module starts with the first
+    # message received for one of them
+    m_hModuleAddrs = {
+        'TrackDevBeatRepeat': ['/track/dev/brepeat'],
+        'TrackDevEq3'       : ['/track/dev/eq3'],
+        'TrackDevFilter'    : ['/track/dev/filter'],
+        'TrackDevRev'       : ['/track/dev/rev'],
+        'TrackDevEcho'      : ['/track/dev/echo'],
+        'TrackDevChorus'    : ['/track/dev/chor'],
+        'TrackDevFlanger'   : ['/track/dev/flan'],
+        'TrackDevPhaser'    : ['/track/dev/phas'],
+        'TrackDevSelect'    : ['/track/dev/select'],
+        'RootCmd'           : ['/root', '/label', '/session/tools', '/session/controller', '/pad/mouse/pos/song'],
+        'SessionCmd'        : ['/session/cmd'],
+        'SessionZoom'       : ['/session/zoom'],
+        'SessionTempo'      : ['/session/tempo'],
+        'TrackCmd'          : ['/track/cmd'],
+        'TrackClip'         : ['/track/clip'],
+        'TrackVolAuto'      : ['/track/vol/auto'],
+        'TrackVol'          : ['/track/vol'],
+        'TrackKeyboard'     : ['/note'],
+        'TrackTranspose'    : ['/track/transp'],
+        'TrackFx'           : ['/track/fx'],
+        'SceneCmd'          : ['/scene/cmd'],
+        'ClipCmd'           : ['/clip/cmd'],
+        'ClipLoop'          : ['/clip/loop'],
+        'CrossCmd'          : ['/cross/cmd'],
+        'SeqCmd'            : ['/seq/cmd'],
+        'SeqBeat'           : ['/seq/beat'],
+        'SeqBeatNote'       : ['/seq/beat/note'],
+        'LoopJump'          : ['/loop/jump'],
+        'LoopRoll'          : ['/loop/roll'],
+        'MovePos'           : ['/move/pos'],
+        'PadMouse'          : ['/pad/mouse'],
+    }
+
     def __init__(self, _oCtrlInstance):
         self.c_instance      = _oCtrlInstance
         self.m_oCtrlInstance = _oCtrlInstance
 
+        # the records are buffered and written on every tick, see Logger.py
+        self.m_oLogger   = Logger.Logger()
+        self.m_nLogLevel = Logger.DEBUG # everything is kept until the config is loaded
         self.load_config()
+        sRootPath = '%s/%s' % (os.getenv('HOME'), self.m_sProductDir)
+        nLogLevel = Logger.LEVELS[self.m_sLogLevel] if (self.m_hConfig['bLog']) else Logger.OFF
+        self.m_oLogger.configure(sRootPath, nLogLevel, self.m_hLogLevels, self.m_nLogBuffer, self.m_nLogFlushMs, self.m_nLogFileKb, self.m_nLogFiles, self.m_bLogLive)
+        self.m_nLogLevel = self.m_oLogger.level(self.m_sProductName)
+        self.m_hConfig['oLogger'] = self.m_oLogger
 
         self.m_oOscServer = RemixNet.OSCServer(self, self.m_sTxAddr, self.m_nTxPort, self.m_sRxAddr, self.m_nRxPort)
+        self.m_oOscServer.setMaxDatagramSize(self.m_nTxMaxDatagram)
+        self.m_oOscServer.callbackManager.setCoalescing(self.m_bRxCoalesce)
+        self.m_oOscServer.callbackManager.setBudget(self.m_nRxMaxMsgs, self.m_nRxMaxTime / 1000.0)
+        self.m_oOscServer.callbackManager.setPriorities(self.m_aRxPrioHigh, self.m_aRxPrioLow)
+        self.m_oOscServer.callbackManager.setLogger(self.log_error)
+        self.m_oOscServer.udpServer.setDropPrefixes(self.m_aRxDrop)
+        self.m_oOscServer.udpServer.setReceiveBuffer(self.m_nRxMaxDatagram, self.m_nRxBuffer)
+        self.m_oOscServer.setDedup(self.m_bTxDedup)
+        if (len(self.m_aTxPrefixes) > 0):
+            self.m_oOscServer.setDefaultPrefixes(self.m_aTxPrefixes)
+        for aClient in self.m_aTxClients:
+            self.m_oOscServer.addTarget(aClient[0], aClient[1], aClient[2])
+        if (self.m_nTcpPort > 0):
+            self.m_oOscServer.openStream(self.m_sRxAddr, self.m_nTcpPort, self.m_sTcpFraming)
+        self.m_oOscServer.setQueueing(self.m_bTxQueue, self.m_aTxImmediate)
+        if (self.m_bRecord):
+            sTime = time.strftime('%Y_%m_%d__%H_%M_%S')
+            sPath = '%s/%s/osc_%s.rec' % (os.getenv('HOME'), self.m_sProductDir, sTime)
+            self.m_oOscServer.setRecorder(RemixNet.TrafficRecorder(self, sPath, self.m_nRecordMaxMb * 1024 * 1024))
+
+        # count the Live API calls of the modules (debug), see LiveApiProxy.py
+        self.m_oApiAccount = None
+        if (self.m_bLiveProxy):
+            sRootPath = '%s/%s' % (os.getenv('HOME'), self.m_sProductDir)
+            self.m_oApiAccount    = LiveApiProxy.LiveApiAccount(self, sRootPath, self.m_nLiveProxyDump)
+            self.m_oCtrlInstance  = LiveApiProxy.CtrlInstanceProxy(_oCtrlInstance, self.m_oApiAccount)
+            self.m_oOscServer.callbackManager.add(self.m_oApiAccount.on_stats_query, '/debug/liveapi')
+            self.log('> %s: Live API accounting on', self.m_sProductName)
+
+        # timed and beat aligned tasks of the modules, see Scheduler.py
+        self.m_oScheduler = Scheduler.Scheduler(self, self.m_nSchedBudget)
+        self.m_hConfig['oScheduler'] = self.m_oScheduler
+
+        # events between the modules, see EventBus.py
+        self.m_oEventBus = EventBus.EventBus(self, self.m_aEventCoalesce)
+        self.m_hConfig['oEventBus'] = self.m_oEventBus
+
+        # song time to wall time, see BeatClock.py
+        self.m_oBeatClock = BeatClock.BeatClock(self)
+        self.m_hConfig['oBeatClock'] = self.m_oBeatClock
 
         # load modules
-        self.log('> %s: resetting controller ...' % (self.m_sProductName))
-
-        self.m_aModules = []
-
-        # higher prio during iteration of sync events
-        self.add_modules('TrackDev', ['BeatRepeat', 'Eq3', 'Filter', 'Rev', 'Echo', 'Chorus', 'Flanger', 'Phaser', 'Select'])
-
-        # lower prio for iteration of sync events
-        self.add_modules('Root'    , ['Cmd'])
-        self.add_modules('Session' , ['Cmd', 'Zoom', 'Tempo'])
-        self.add_modules('Track'   , ['Cmd', 'Clip', 'VolAuto', 'Vol', 'Keyboard', 'Transpose', 'Fx'])
-        self.add_modules('Scene'   , ['Cmd'])
-        self.add_modules('Clip'    , ['Cmd', 'Loop'])
-        self.add_modules('Cross'   , ['Cmd'])
-        self.add_modules('Seq'     , ['Cmd', 'Beat', 'BeatNote'])
-        self.add_modules('Loop'    , ['Jump', 'Roll'])
-        self.add_modules('Move'    , ['Pos'])
-        self.add_modules('Pad'     , ['Mouse'])
-
-        self.log('> %s: controller reset' % (self.m_sProductName))
+        self.log('> %s: resetting controller ...', self.m_sProductName)
+
+        self.m_aModules     = []
+        self.m_hLazyModules = {} # modules not started yet -> True
+        self.m_aLoadTimes   = [] # [module, import secs, construct secs]
+
+        # the GUI reset messages of all the modules are merged in a single snapshot
+        self.m_oOscServer.beginSnapshot()
+        try:
+            # higher prio during iteration of sync events
+            self.add_modules('TrackDev', ['BeatRepeat', 'Eq3', 'Filter', 'Rev', 'Echo', 'Chorus', 'Flanger', 'Phaser', 'Select'])
+
+            # lower prio for iteration of sync events
+            self.add_modules('Root'    , ['Cmd'])
+            self.add_modules('Session' , ['Cmd', 'Zoom', 'Tempo'])
+            self.add_modules('Track'   , ['Cmd', 'Clip', 'VolAuto', 'Vol', 'Keyboard', 'Transpose', 'Fx'])
+            self.add_modules('Scene'   , ['Cmd'])
+            self.add_modules('Clip'    , ['Cmd', 'Loop'])
+            self.add_modules('Cross'   , ['Cmd'])
+            self.add_modules('Seq'     , ['Cmd', 'Beat', 'BeatNote'])
+            self.add_modules('Loop'    , ['Jump', 'Roll'])
+            self.add_modules('Move'    , ['Pos'])
+            self.add_modules('Pad'     , ['Mouse'])
+        finally:
+            nStart = time.time()
+            nSent  = self.m_oOscServer.endSnapshot()
+            nSnapshotTime = time.time() - nStart
+
+        self.log('> %s: controller reset', self.m_sProductName)
+        self.log_load_times(self.m_aLoadTimes)
+        hStats = self.m_oOscServer.stats()
+        # the GUI sync is one send for all the modules, hence timed here and not per module
+        self.log('> %s: startup snapshot: %d messages merged into %d, sent in %.1f ms', self.m_sProductName, hStats['snapshotGathered'], nSent, 1000.0 * nSnapshotTime)
+        if (len(self.m_hLazyModules) > 0):
+            self.log('> %s: lazy modules: %s', self.m_sProductName, ', '.join(sorted(self.m_hLazyModules.keys())))
+            self.m_oOscServer.callbackManager.setFallback(self.start_lazy_module)
         self.send(self.m_sDeviceAddr, 1.0)
 
-        # add this instance as on observer of modules
-        for oModule in self.m_aModules:
-            oModule.add_observer(self)
+        # the modules get the events they subscribed to from now on
+        self.m_oEventBus.open()
+
+        # time the hot paths of the modules, nothing is wrapped when off
+        self.m_oProfiler = None
+        if (self.m_bProfile):
+            sRootPath = '%s/%s' % (os.getenv('HOME'), self.m_sProductDir)
+            self.m_oProfiler = Profiler.Profiler(self, sRootPath, self.m_nProfileDump)
+            for oModule in self.m_aModules:
+                self.m_oProfiler.wrap_module(oModule)
+            self.m_oProfiler.wrap(self.m_oOscServer, 'processIncomingUDP', 'OSCServer.processIncomingUDP')
+            self.m_oProfiler.wrap(self.m_oScheduler, 'run_timed', 'Scheduler.run_timed')
+            self.m_oProfiler.wrap(self.m_oLogger, 'flush', 'Logger.flush')
+            self.m_oOscServer.callbackManager.add(self.m_oProfiler.on_stats_query, '/debug/stats')
+            self.log('> %s: profiler on', self.m_sProductName)
 
 
     def load_config(self):
@@ -76,6 +195,41 @@ class AaMakro5oul:
         self.m_sRxAddr = '127.0.0.1' # Ableton Live will open a UDP port in the localhost address
         self.m_nRxPort = 2720
 
+        self.m_nTxMaxDatagram = 8192 # max bytes of the bundles sent to the OSC server
+        self.m_aTxPrefixes    = []   # address prefixes sent to tx_addr:tx_port, all if empty
+        self.m_aTxClients     = []   # more clients: [addr, port, address prefixes]
+
+        self.m_nTcpPort       = 0      # TCP port for the bundles (snapshots), 0 -> no TCP
+        self.m_sTcpFraming    = 'slip' # 'slip' (OSC 1.1) or 'length' (OSC 1.0)
+        self.m_bRxCoalesce    = False # keep only the newest fader value received in a tick
+        self.m_nRxMaxMsgs     = 0     # max messages dispatched per tick, 0 -> no limit
+        self.m_nRxMaxTime     = 0     # max milliseconds dispatching per tick, 0 -> no limit
+        self.m_aRxPrioHigh    = []    # address prefixes dispatched first
+        self.m_aRxPrioLow     = []    # address prefixes dispatched last
+        self.m_aRxDrop        = []    # address prefixes dropped before decoding
+        self.m_nRxMaxDatagram = 8192  # max bytes of the datagrams received
+        self.m_nRxBuffer      = 0     # bytes of the socket receive buffer, 0 -> system default
+        self.m_bTxDedup       = False # do not send again what was last sent to an address
+        self.m_bTxQueue       = False # send the messages of a tick or listener together
+        self.m_aTxImmediate   = []    # address prefixes sent right away even when queueing
+        self.m_bRecord        = False # record the UDP traffic in osc_<time>.rec (next to this config)
+        self.m_nRecordMaxMb   = 64    # max size of the recording in megabytes
+        self.m_bProfile       = False # time the modules, see Profiler.py
+        self.m_nProfileDump   = 60    # seconds between dumps of profile.txt, 0 -> never
+        self.m_bLiveProxy     = False # count the Live API calls of the modules, see LiveApiProxy.py
+        self.m_nLiveProxyDump = 60    # seconds between dumps of live_api.txt, 0 -> never
+        self.m_nSchedBudget   = 5     # max milliseconds of a scheduled task before warning, 0 -> no warning
+        self.m_aEventCoalesce = ['new_tracks_sel', 'new_scenes_sel'] # events delivered once per tick
+        self.m_aModulesOn     = None  # modules loaded, all if None
+        self.m_aModulesLazy   = []    # modules started on the first message to their base address
+        self.m_sLogLevel      = 'info' # level of the records logged, see Logger.py
+        self.m_hLogLevels     = {}    # module -> level, overrides log_level
+        self.m_nLogBuffer     = 4096  # max records waiting to be written
+        self.m_nLogFlushMs    = 1     # max milliseconds writing records per tick
+        self.m_nLogFileKb     = 1024  # kilobytes of log.txt before rotating it
+        self.m_nLogFiles      = 3     # rotated log files kept
+        self.m_bLogLive       = False # write the records to the Log.txt of Live too
+
         # device
         self.m_sDeviceId   = 'session_controller_%s'  % (self.m_sProductName)
         self.m_sDeviceAddr = '/session/controller/%s' % (self.m_sProductName)
@@ -96,7 +250,7 @@ class AaMakro5oul:
 
         # try to open configuration file ***************************************
 
-        self.log('> %s: loading config ...' % (self.m_sProductName))
+        self.log('> %s: loading config ...', self.m_sProductName)
 
         sHome     = os.getenv('HOME')
         sFileName = 'config.txt'
@@ -104,10 +258,10 @@ class AaMakro5oul:
 
         bFileExists = os.path.isfile(sFilePath)
         if (bFileExists == False):
-            self.log('> config file "%s" not found!' % (sFilePath))
+            self.log('> config file "%s" not found!', sFilePath)
             return # config file does not exist, nothing else to do here!
 
-        self.log('> reading: "%s"' % (sFilePath))
+        self.log('> reading: "%s"', sFilePath)
         # read presets file
         oFile = open(sFilePath, 'r')
 
@@ -130,7 +284,7 @@ class AaMakro5oul:
 
             sName   = aTokens[0].strip()
             sValue  = aTokens[1].strip()
-            self.log('>   parsing: %16s | %s' % (sName, sValue))
+            self.log('>   parsing: %16s | %s', sName, sValue)
 
             # parse the value of the config feature
 
@@ -142,11 +296,83 @@ class AaMakro5oul:
                 self.m_sRxAddr = sValue
             elif (sName == 'rx_port'):
                 self.m_nRxPort = int(sValue)
+            elif (sName == 'tx_max_datagram'):
+                self.m_nTxMaxDatagram = int(sValue)
+            elif (sName == 'tcp_port'):
+                self.m_nTcpPort = int(sValue)
+            elif (sName == 'tcp_framing'):
+                self.m_sTcpFraming = sValue
+            elif (sName == 'tx_prefixes'):
+                self.m_aTxPrefixes = self.parse_list(sValue)
+            elif (sName == 'tx_client'):
+                aAddr     = sValue.split(':')
+                aPrefixes = self.parse_list(aTokens[2]) if (len(aTokens) > 2) else []
+                if (len(aPrefixes) == 0):
+                    aPrefixes = [''] # every address
+                self.m_aTxClients.append([aAddr[0].strip(), int(aAddr[1]), aPrefixes])
+            elif (sName == 'rx_coalesce'):
+                self.m_bRxCoalesce = (sValue == 'true')
+            elif (sName == 'rx_max_msgs'):
+                self.m_nRxMaxMsgs = int(sValue)
+            elif (sName == 'rx_max_time'):
+                self.m_nRxMaxTime = int(sValue)
+            elif (sName == 'rx_prio_high'):
+                self.m_aRxPrioHigh = self.parse_list(sValue)
+            elif (sName == 'rx_prio_low'):
+                self.m_aRxPrioLow = self.parse_list(sValue)
+            elif (sName == 'rx_drop'):
+                self.m_aRxDrop = self.parse_list(sValue)
+            elif (sName == 'rx_max_datagram'):
+                self.m_nRxMaxDatagram = int(sValue)
+            elif (sName == 'rx_buffer'):
+                self.m_nRxBuffer = int(sValue)
+            elif (sName == 'tx_dedup'):
+                self.m_bTxDedup = (sValue == 'true')
+            elif (sName == 'tx_queue'):
+                self.m_bTxQueue = (sValue == 'true')
+            elif (sName == 'tx_immediate'):
+                self.m_aTxImmediate = self.parse_list(sValue)
+            elif (sName == 'record'):
+                self.m_bRecord = (sValue == 'true')
+            elif (sName == 'record_max_mb'):
+                self.m_nRecordMaxMb = int(sValue)
+            elif (sName == 'profile'):
+                self.m_bProfile = (sValue == 'true')
+            elif (sName == 'profile_dump'):
+                self.m_nProfileDump = int(sValue)
+            elif (sName == 'live_proxy'):
+                self.m_bLiveProxy = (sValue == 'true')
+            elif (sName == 'live_proxy_dump'):
+                self.m_nLiveProxyDump = int(sValue)
+            elif (sName == 'sched_budget_ms'):
+                self.m_nSchedBudget = int(sValue)
+            elif (sName == 'event_coalesce'):
+                self.m_aEventCoalesce = self.parse_list(sValue)
+            elif (sName == 'modules'):
+                self.m_aModulesOn = None if (sValue == 'all') else self.parse_list(sValue)
+            elif (sName == 'modules_lazy'):
+                self.m_aModulesLazy = self.parse_list(sValue)
 
             elif (sName == 'log'):
                 self.m_hConfig['bLog'] = (sValue == 'true')
             elif (sName == 'log_rx_msgs'):
                 self.m_hConfig['bLogRxMsgs'] = (sValue == 'true')
+            elif (sName == 'log_level'):
+                self.m_sLogLevel = sValue
+            elif (sName == 'log_levels'):
+                for sItem in self.parse_list(sValue):
+                    aItem = sItem.split(':')
+                    self.m_hLogLevels[aItem[0].strip()] = Logger.LEVELS[aItem[1].strip()]
+            elif (sName == 'log_buffer'):
+                self.m_nLogBuffer = int(sValue)
+            elif (sName == 'log_flush_ms'):
+                self.m_nLogFlushMs = int(sValue)
+            elif (sName == 'log_file_kb'):
+                self.m_nLogFileKb = int(sValue)
+            elif (sName == 'log_files'):
+                self.m_nLogFiles = int(sValue)
+            elif (sName == 'log_live'):
+                self.m_bLogLive = (sValue == 'true')
 
             elif (sName == 'send_beat'):
                 self.m_bSendBeat = (sValue == 'true')
@@ -156,19 +382,95 @@ class AaMakro5oul:
                 self.m_hConfig['nMaxTempo'] = int(sValue)
 
             else:
-                self.log('!Error: could not parse config feature "%s"!' % (sName))
+                self.log_error('!Error: could not parse config feature "%s"!', sName)
+
+        self.log('> %s: config loaded', self.m_sProductName)
+
 
-        self.log('> %s: config loaded' % (self.m_sProductName))
+    # comma separated config values, i.e. address prefixes
+    def parse_list(self, _sValue):
+        return [sItem.strip() for sItem in _sValue.split(',') if len(sItem.strip()) > 0]
 
 
     def add_modules(self, _sPrefix, _aModules):
         for sModule in _aModules:
-            exec 'import ' + _sPrefix + sModule + 'Handler'
-            eval('self.m_aModules.append(' + _sPrefix + sModule + 'Handler.' + _sPrefix + sModule + 'Handler(self.m_oCtrlInstance, self.m_oOscServer, self.m_hConfig))')
+            sName = _sPrefix + sModule
+            if (self.m_aModulesOn != None and sName not in self.m_aModulesOn):
+                continue # not configured
+
+            if (sName in self.m_aModulesLazy):
+                if (sName in AaMakro5oul.m_hModuleAddrs):
+                    self.m_hLazyModules[sName] = True
+                    continue
+                self.log_error('!Error: module "%s" has no base address, it cannot be lazy!', sName)
+
+            self.load_module(sName)
+
+
+    def load_module(self, _sName):
+        # import and construction are timed apart, the GUI reset messages
+        # of the constructor are merged in a snapshot (sent here only if
+        # no outer snapshot is open, i.e. for a lazy module)
+        nStart = time.time()
+        exec 'import ' + _sName + 'Handler'
+        nImported = time.time()
+
+        self.m_oOscServer.beginSnapshot()
+        try:
+            oModule = eval(_sName + 'Handler.' + _sName + 'Handler(self.m_oCtrlInstance, self.m_oOscServer, self.m_hConfig)')
+            nConstructed = time.time()
+        finally:
+            self.m_oOscServer.endSnapshot()
+
+        self.m_aModules.append(oModule)
+        self.m_aLoadTimes.append([_sName, nImported - nStart, nConstructed - nImported])
+        return oModule
+
+
+    # fallback of the callback manager for the addresses without callback
+    def start_lazy_module(self, _sAddress):
+        # the module with the longest base address of the address, i.e. '/track/vol/auto' before '/track/vol'
+        sModule = None
+        nLength = 0
+        for sName in self.m_hLazyModules.keys():
+            for sBase in AaMakro5oul.m_hModuleAddrs[sName]:
+                if ((_sAddress == sBase or _sAddress.startswith(sBase + '/')) and len(sBase) > nLength):
+                    sModule = sName
+                    nLength = len(sBase)
+
+        if (sModule == None):
+            return False
 
+        del self.m_hLazyModules[sModule]
+        if (len(self.m_hLazyModules) == 0):
+            self.m_oOscServer.callbackManager.setFallback(None)
 
-    def log(self, _sMessage):
-        Live.Base.log(_sMessage)
+        oModule = self.load_module(sModule)
+        if (self.m_oProfiler):
+            self.m_oProfiler.wrap_module(oModule)
+        self.log('> %s: lazy module started by "%s"', self.m_sProductName, _sAddress)
+        self.log_load_times(self.m_aLoadTimes[-1:])
+        return True
+
+
+    def log_load_times(self, _aLoadTimes):
+        # slowest first
+        for aTimes in sorted(_aLoadTimes, key = lambda aTimes: -sum(aTimes[1:])):
+            lLog = (self.m_sProductName, aTimes[0], 1000.0 * sum(aTimes[1:]), 1000.0 * aTimes[1], 1000.0 * aTimes[2])
+            self.log('> %s: module %-20s %8.1f ms (import %.1f ms, construct %.1f ms)', *lLog)
+        if (len(_aLoadTimes) > 1):
+            nTotal = sum([sum(aTimes[1:]) for aTimes in _aLoadTimes])
+            self.log('> %s: %d modules loaded in %.1f ms', self.m_sProductName, len(_aLoadTimes), 1000.0 * nTotal)
+
+
+    def log(self, _sMessage, *_aArgs):
+        if (self.m_nLogLevel <= Logger.INFO):
+            self.m_oLogger.add(self.m_sProductName, Logger.INFO, _sMessage, _aArgs)
+
+
+    def log_error(self, _sMessage, *_aArgs):
+        if (self.m_nLogLevel <= Logger.ERROR):
+            self.m_oLogger.add(self.m_sProductName, Logger.ERROR, _sMessage, _aArgs)
 
 
     def alert(self, sMessage):
@@ -179,17 +481,11 @@ class AaMakro5oul:
         self.m_oOscServer.sendOSC(_sAddress, _oMessage)
 
 
-    def update(self, _sEvent, _oArgs = None):
-        # forward the event to the modules
-        for oModule in self.m_aModules:
-            oModule.update(_sEvent, _oArgs)
-
-
 # #####################################################################
 # Standard Ableton Methods
 
     def disconnect(self):
-        self.log('> %s: disconnecting ...' % (self.m_sProductName))
+        self.log('> %s: disconnecting ...', self.m_sProductName)
 
         for oModule in self.m_aModules:
             oModule.disconnect()
@@ -199,7 +495,30 @@ class AaMakro5oul:
         self.send('/EDIT', [self.m_sDeviceId, '{"label": "-"}'])
         self.send(self.m_sDeviceAddr, 0.0)
 
-        self.log('> %s: disconnected' % (self.m_sProductName))
+        hStats = self.m_oOscServer.stats()
+        self.log('> %s: rx %d packets (%d bytes), skipped %d packets (%d bytes), %d truncated, %d ticks near buffer overflow', self.m_sProductName, hStats['receivedPackets'], hStats['receivedBytes'], hStats['skippedPackets'], hStats['skippedBytes'], hStats['truncated'], hStats['overflowRisk'])
+        self.log('> %s: rx %d decode errors, %d callback errors, %d dropped', self.m_sProductName, hStats['decodeErrors'], hStats['dispatchErrors'], hStats['dropped'])
+        self.log('> %s: tx %d bundles in %d datagrams, %d duplicates suppressed', self.m_sProductName, hStats['sentBundles'], hStats['sentDatagrams'], hStats['suppressed'])
+        hSchdStats = self.m_oScheduler.stats()
+        self.log('> %s: scheduler %d task runs, %d errors, %d overruns', self.m_sProductName, hSchdStats['runs'], hSchdStats['errors'], hSchdStats['overruns'])
+        self.m_oScheduler.clear()
+        hBusStats = self.m_oEventBus.stats()
+        self.log('> %s: events %d published, %d delivered, %d coalesced', self.m_sProductName, hBusStats['published'], hBusStats['delivered'], hBusStats['coalesced'])
+        self.m_oEventBus.close()
+        for aRow in self.m_oBeatClock.lateness():
+            self.log('> %s: beat program step "%s": %d runs, %.1f ms late on average, at most %.1f ms late and %.1f ms early', *tuple([self.m_sProductName] + aRow))
+        if (self.m_bRecord):
+            self.log('> %s: recorded %d datagrams (%d bytes)', self.m_sProductName, hStats['recordedPackets'], hStats['recordedBytes'])
+        if (self.m_oProfiler):
+            self.m_oProfiler.dump()
+        if (self.m_oApiAccount):
+            self.m_oApiAccount.dump()
+        # release the ports, Live may load the script again
+        self.m_oOscServer.shutdown()
+        hLogStats = self.m_oLogger.stats()
+        self.log('> %s: log %d records, %d dropped', self.m_sProductName, hLogStats['added'], hLogStats['dropped'])
+        self.log('> %s: disconnected', self.m_sProductName)
+        self.m_oLogger.close()
 
 
     def build_midi_map(self, midi_map_handle):
@@ -207,7 +526,7 @@ class AaMakro5oul:
 
 
     def refresh_state(self):
-        self.log('> %s: Refreshing state' % (self.m_sProductName));
+        self.log('> %s: Refreshing state', self.m_sProductName)
         try:
             self.m_oSong = self.m_oCtrlInstance.song()
             try:
@@ -231,29 +550,54 @@ class AaMakro5oul:
         This function is run every 100ms, so we use it to allow us to process incoming
         OSC commands as quickly as possible under the current listener scheme.
         """
-        # forward the event to the modules
-        for oModule in self.m_aModules:
-            oModule.update_prog_async_scheduled_tasks()
-            oModule.update_async_scheduled_tasks()
+        # everything sent during the tick goes out in bundles at its end,
+        # the coalesced events of the modules are delivered before
+        self.m_oOscServer.beginBatch()
+        self.m_oEventBus.begin_tick()
+        try:
+            # the Live API calls since the last tick
+            if (self.m_oApiAccount):
+                self.m_oApiAccount.tick()
+
+            self.m_oBeatClock.tick()
+
+            # the module tasks due now
+            self.m_oScheduler.run_timed()
 
-        if self.m_oOscServer:
+            if self.m_oOscServer:
+                # first the bundles received earlier whose timetag is due now
+                self.m_oOscServer.processDeferredBundles()
+
+                try:
+                    self.m_oOscServer.processIncomingUDP()
+                except:
+                    pass
+
+            if (self.m_oProfiler):
+                self.m_oProfiler.tick()
+
+            # the records logged since the last tick, for at most log_flush_ms
+            self.m_oLogger.flush()
+        finally:
             try:
-                self.m_oOscServer.processIncomingUDP()
-            except:
-                pass
+                self.m_oEventBus.end_tick()
+            finally:
+                self.m_oOscServer.endBatch()
 
 
+    @send_batch
     def on_current_song_time_changed(self):
-        nCurrSongTime = int(self.m_oSong.current_song_time)
+        nSongTime     = self.m_oSong.current_song_time
+        nCurrSongTime = int(nSongTime)
+        self.m_oBeatClock.on_song_time(nSongTime)
 
         if (nCurrSongTime != self.m_nCurrSongTime):
             self.m_nCurrSongTime  = nCurrSongTime
             nCurrSongBar          = nCurrSongTime / 4 + 1
             nCurrSongBeat         = nCurrSongTime % 4 + 1
 
-            # forward the event to the modules
-            for oModule in self.m_aModules:
-                oModule.schedule_beat_tasks(nCurrSongTime, nCurrSongBar, nCurrSongBeat)
+            # the module tasks due on this beat
+            self.m_oScheduler.run_beats(nCurrSongTime, nCurrSongBar, nCurrSongBeat)
 
             # update the beat meter in the remote GUI
             if (self.m_bSendBeat):
@@ -286,8 +630,10 @@ class AaMakro5oul:
         return
 
 
+    @send_batch
     def on_tempo_changed(self):
         nTempo = self.m_oSong.tempo
+        self.m_oBeatClock.on_tempo(nTempo)
         self.send('/session/tempo', '%.2f' % (nTempo))
 
         nMinTempo = self.m_hConfig['nMinTempo']
@@ -16,10 +16,47 @@
 from math import sqrt
 import os
 import time
-import datetime
 import Live
+import Logger
 from pytagger import ID3v2
 
+# ******************************************************************************
+# Decorator for the Ableton Live listeners: the messages sent while the
+# listener runs are queued by the OSC server and sent together as bundles
+# when it returns (or at the end of the tick if it runs inside one)
+# ******************************************************************************
+
+def send_batch(_fMethod):
+    def fBatched(self, *_aArgs):
+        self.m_oOscServer.beginBatch()
+        try:
+            return _fMethod(self, *_aArgs)
+        finally:
+            self.m_oOscServer.endBatch()
+    fBatched.__name__ = _fMethod.__name__
+    fBatched.__doc__  = _fMethod.__doc__
+    return fBatched
+
+# ******************************************************************************
+# Route record of an address handled by a module, made once per address when
+# its callback is registered (or when it is first received, for the addresses
+# registered as patterns) and given to the module with every message, so the
+# address is not split and its parts not converted on every message. The
+# modules fill in the typed parts they use in parse_route()
+# ******************************************************************************
+
+class Route:
+
+    def __init__(self, _sAddress, _sCmd, _aParts):
+        self.m_sAddress     = _sAddress
+        self.m_sCmd         = _sCmd   # address without the base address, i.e. 'fader/3'
+        self.m_aParts       = _aParts # parts of the command, i.e. ('fader', '3')
+        self.m_sChannel     = None   # device channel: 'a', 'b', 'c', 'd' or 'x'
+        self.m_nTrackIdxRel = None   # relative track index
+        self.m_nSceneIdxRel = None   # relative scene index
+        self.m_nBeat        = None   # beat column or beat value
+
+
 # ******************************************************************************
 # Base handler to provide logging, alert, OSC communications and
 # general Ableton Live accessors. Implements observer and observable patterns
@@ -35,11 +72,20 @@ class BaseHandler:
 
         self.m_sProductName   = _hConfig['sProductName']
         self.m_sProductDir    = _hConfig['sProductDir']
-        self.m_bLog           = _hConfig['bLog']
+        self.m_oLogger        = _hConfig['oLogger']
+        self.m_sLogName       = self.__class__.__name__.replace('Handler', '') # i.e. 'TrackDevEq3'
+        self.m_nLogLevel      = self.m_oLogger.level(self.m_sLogName)
         self.m_bLogRxMsgs     = _hConfig['bLogRxMsgs']
+        self.m_oScheduler     = _hConfig['oScheduler']
+        self.m_oEventBus      = _hConfig['oEventBus']
+        self.m_oBeatClock     = _hConfig['oBeatClock']
+        self.m_hSchdTasks     = {} # scheduler tasks by method name
 
         self.m_aObservers     = []
         self.m_bIgnoreRelease = False
+        self.m_sBaseAddress   = '' # set by config(), RootCmdHandler has none
+        self.m_nBaseDepth     = 0
+        self.m_oRoute         = None
 
 
     def disconnect(self):
@@ -57,12 +103,20 @@ class BaseHandler:
 
 
     def update_observers(self, _sEvent, _oArgs = None):
+        # the modules subscribed to the event get it through the event bus
+        self.m_oEventBus.publish(_sEvent, _oArgs)
         for oObserver in self.m_aObservers:
             oObserver.update(_sEvent, _oArgs)
 
 
     # Observer methods *********************************************************
 
+    # the events handled by update(), see EventBus.py
+    def subscribe(self, _aEvents):
+        for sEvent in _aEvents:
+            self.m_oEventBus.subscribe(sEvent, self)
+
+
     def update(self, _sEvent, _oArgs = None):
         return # subclasses should implement this method
 
@@ -71,29 +125,68 @@ class BaseHandler:
 
     def config(self, _sBaseAddress, _bIgnoreRelease, _bLogRxMsgs = False):
         self.m_sBaseAddress   = _sBaseAddress
+        self.m_nBaseDepth     = len(_sBaseAddress.split('/')) - 1 # number of parts of the base address
         self.m_bIgnoreRelease = _bIgnoreRelease
         self.m_bLogRxMsgs     = _bLogRxMsgs
 
 
     def add_callback(self, _sAddress):
         #self.log('> adding handler for: %s' % (_sAddress))
-        self.m_oCallbackMgr.add(self.handle_message, _sAddress)
+        self.m_oCallbackMgr.add(self.handle_message, _sAddress, self.make_route)
+
+
+    def make_route(self, _sAddress, _aParts):
+        oRoute = Route(_sAddress, _sAddress[len(self.m_sBaseAddress) + 1:], _aParts[self.m_nBaseDepth:])
+        try:
+            self.parse_route(oRoute)
+        except (ValueError, IndexError):
+            pass # not a command of the module, handle() decides
+        return oRoute
+
+
+    def parse_route(self, _oRoute):
+        return # subclasses should implement this method
 
 
     def add_callbacks(self, _aCmds):
-        for sCmd in _aCmds:
-            self.add_callback('%s/%s' % (self.m_sBaseAddress, sCmd))
+        self.add_callback_group(self.m_sBaseAddress, _aCmds)
 
 
     def add_callbacks_pref(self, _sPref, _aCmds):
+        self.add_callback_group('%s/%s' % (self.m_sBaseAddress, _sPref), _aCmds)
+
+
+    def add_callback_group(self, _sPrefix, _aCmds):
+        # single-part commands are registered as one address pattern,
+        # i.e. '/session/cmd/{reset,up,down}', multi-part ones one by one
+        aGroup = []
         for oCmd in _aCmds:
-            self.add_callback("%s/%s/%s" % (self.m_sBaseAddress, _sPref, str(oCmd)))
+            sCmd = str(oCmd)
+            if ('/' in sCmd):
+                self.add_callback('%s/%s' % (_sPrefix, sCmd))
+            else:
+                aGroup.append(sCmd)
+
+        if (len(aGroup) == 1):
+            self.add_callback('%s/%s' % (_sPrefix, aGroup[0]))
+        elif (len(aGroup) > 1):
+            self.add_callback('%s/{%s}' % (_sPrefix, ','.join(aGroup)))
 
 
     def add_callback_cmd(self, _sCmd):
         self.add_callback("%s/%s" % (self.m_sBaseAddress, _sCmd))
 
 
+    # continuous commands (faders) only need their newest value in a
+    # tick, the callback manager may drop the older ones when coalescing
+    def add_continuous(self, _sCmd):
+        self.m_oCallbackMgr.addContinuous("%s/%s" % (self.m_sBaseAddress, _sCmd))
+
+
+    def add_continuous_pref(self, _sPref, _aCmds):
+        self.add_continuous('%s/{%s}' % (_sPref, ','.join([str(oCmd) for oCmd in _aCmds])))
+
+
     # _aMessage[0] -> address
     # _aMessage[1] -> parameter type
     # _aMessage[2] -> parameter value
@@ -101,12 +194,17 @@ class BaseHandler:
         if (self.m_bIgnoreRelease == True and _aMessage[2] == 0.0):
             return
 
+        # the callback manager gives the route record made for the address
+        oRoute = self.m_oCallbackMgr.record
+        if (oRoute == None or oRoute.m_sAddress != _aMessage[0]):
+            oRoute = self.make_route(_aMessage[0], self.m_oCallbackMgr.parts)
+        self.m_oRoute = oRoute
         self.m_sAddr  = _aMessage[0]
-        self.m_sCmd   = _aMessage[0].replace('%s/' % (self.m_sBaseAddress), '')
-        self.m_aParts = self.m_sCmd.split('/')
+        self.m_sCmd   = oRoute.m_sCmd
+        self.m_aParts = oRoute.m_aParts
 
         if (self.m_bLogRxMsgs):
-            self.log("=> %s: %s | %s | %s" % (self.m_sBaseAddress, self.m_sCmd, str(_aMessage[1]), str(_aMessage[2])))
+            self.log("=> %s: %s | %s | %s", self.m_sBaseAddress, self.m_sCmd, _aMessage[1], _aMessage[2])
 
         self.handle(_aMessage)
 
@@ -120,8 +218,11 @@ class BaseHandler:
 
 
     def send_bundle(self, _sLogMsg, _aMessages):
-        self.log('> send_bundle: %s (%d messages)' % (_sLogMsg, len(_aMessages)))
-        self.m_oOscServer.sendBundle(_aMessages)
+        nDatagrams = self.m_oOscServer.sendBundle(_aMessages)
+        if (nDatagrams > 0):
+            self.log_debug('> send_bundle: %s (%d messages, %d datagrams)', _sLogMsg, len(_aMessages), nDatagrams)
+        else:
+            self.log_debug('> send_bundle: %s (%d messages, queued)', _sLogMsg, len(_aMessages))
 
 
     def append_msg(self, _sAddress, _nValue, _aMsgs):
@@ -142,11 +243,26 @@ class BaseHandler:
 
     # Utility methods **********************************************************
 
-    def log(self, _sMessage):
-        nTime = time.time()
-        sTime = datetime.datetime.fromtimestamp(nTime).strftime('%Y-%m-%d %H:%M:%S.%f')
-        if (self.m_bLog):
-            Live.Base.log("%s: %s" % (sTime, _sMessage))
+    # the message is formatted with the arguments when it is written (see
+    # Logger.py), a record below the level of the module costs a comparison
+
+    def log(self, _sMessage, *_aArgs):
+        if (self.m_nLogLevel <= Logger.INFO):
+            self.m_oLogger.add(self.m_sLogName, Logger.INFO, _sMessage, _aArgs)
+
+
+    def log_debug(self, _sMessage, *_aArgs):
+        if (self.m_nLogLevel <= Logger.DEBUG):
+            self.m_oLogger.add(self.m_sLogName, Logger.DEBUG, _sMessage, _aArgs)
+
+
+    def log_error(self, _sMessage, *_aArgs):
+        if (self.m_nLogLevel <= Logger.ERROR):
+            self.m_oLogger.add(self.m_sLogName, Logger.ERROR, _sMessage, _aArgs)
+
+
+    def is_logging(self, _nLevel):
+        return (self.m_nLogLevel <= _nLevel)
 
 
     def alert(self, _sMessage):
@@ -211,15 +327,41 @@ class BaseHandler:
 
     # scheduler methods ********************************************************
 
+    # runs the method on every tick (or on every beat) until it returns False,
+    # nothing is done if the method is already scheduled
+    def start_scheduled_task(self, _sMethod, _bBeat = False):
+        oTask = self.m_hSchdTasks.get(_sMethod)
+        if (oTask != None and oTask.m_bActive):
+            return
+
+        # looked up on every run, the profiler may wrap the method
+        fTask = lambda *_aArgs: getattr(self, _sMethod)(*_aArgs)
+        sName = '%s.%s' % (self.__class__.__name__, _sMethod)
+        if (_bBeat):
+            oTask = self.m_oScheduler.add_beat(sName, fTask, None, 1)
+        else:
+            oTask = self.m_oScheduler.add_timed(sName, fTask, 0.0, 0.0)
+        self.m_hSchdTasks[_sMethod] = oTask
+
+
+    def stop_scheduled_task(self, _sMethod):
+        oTask = self.m_hSchdTasks.pop(_sMethod, None)
+        if (oTask != None):
+            self.m_oScheduler.cancel(oTask)
+
+
+    # the methods below run only when scheduled with start_scheduled_task(),
+    # they return True to run again
+
     def update_prog_async_scheduled_tasks(self):
-        pass # this method should be override by subclasses
+        return False # this method should be override by subclasses
 
 
     def update_async_scheduled_tasks(self):
-        pass # this method should be override by subclasses
+        return False # this method should be override by subclasses
 
 
     def schedule_beat_tasks(self, _nCurrSongTime, _nCurrSongBar, _nCurrSongBeat):
-        pass # this method should be override by subclasses
+        return False # this method should be override by subclasses
 
 
@@ -0,0 +1,121 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+import time
+
+# ******************************************************************************
+# Beat clock: anchors the song time (in beats) to the wall time with the
+# current_song_time listener and follows the tempo changes, to predict when
+# a beat of the song will be played. The beat programs are planned one beat
+# ahead on these predictions and their steps run on the tick (update_display,
+# about every 100 ms) nearest to the predicted time instead of on the first
+# tick after it. The lateness of every executed step (the time it ran minus
+# the predicted time) is measured.
+# ******************************************************************************
+
+class BeatClock:
+
+    m_nSmooth  = 0.2  # weight of a new song time observation near the prediction
+    m_nMaxSkew = 0.1  # beats, a bigger difference is a jump (start, stop, seek)
+
+    def __init__(self, _oScript):
+        self.m_oScript    = _oScript
+        self.m_nTempo     = 120.0
+        self.m_nAnchorBts = 0.0         # song time (beats) ...
+        self.m_nAnchorSec = time.time() # ... played at this wall time
+        self.m_nTickSecs  = 0.1         # mean time between ticks
+        self.m_nLastTick  = None
+        self.m_hLateness  = {}          # step name -> [count, sum secs, max secs late, max secs early]
+
+
+    # **************************************************************************
+    # observations
+
+    # called by the current_song_time listener
+    def on_song_time(self, _nSongTime):
+        nNow       = time.time()
+        nPredicted = self.m_nAnchorBts + (nNow - self.m_nAnchorSec) * self.m_nTempo / 60.0
+        nSkew      = _nSongTime - nPredicted
+        if (abs(nSkew) < BeatClock.m_nMaxSkew):
+            # the listener is late by a varying amount, smooth it out
+            _nSongTime = nPredicted + BeatClock.m_nSmooth * nSkew
+        self.m_nAnchorBts = _nSongTime
+        self.m_nAnchorSec = nNow
+
+
+    def on_tempo(self, _nTempo):
+        nNow = time.time()
+        self.m_nAnchorBts = self.song_time(nNow)
+        self.m_nAnchorSec = nNow
+        self.m_nTempo     = float(_nTempo)
+
+
+    # called on every tick (update_display)
+    def tick(self):
+        nNow = time.time()
+        if (self.m_nLastTick != None):
+            nSecs = nNow - self.m_nLastTick
+            if (nSecs < 1.0): # not after a pause of Live
+                self.m_nTickSecs += 0.1 * (nSecs - self.m_nTickSecs)
+        self.m_nLastTick = nNow
+
+
+    # **************************************************************************
+    # predictions
+
+    def beat_secs(self):
+        return 60.0 / self.m_nTempo
+
+
+    def song_time(self, _nTime = None):
+        nTime = time.time() if (_nTime == None) else _nTime
+        return self.m_nAnchorBts + (nTime - self.m_nAnchorSec) * self.m_nTempo / 60.0
+
+
+    def beat_time(self, _nSongTime):
+        """Predicted wall time of the song time _nSongTime (beats)"""
+        return self.m_nAnchorSec + (_nSongTime - self.m_nAnchorBts) * 60.0 / self.m_nTempo
+
+
+    def is_due(self, _nTime, _nNow = None):
+        """True if this tick is the nearest one to the wall time _nTime"""
+        nNow = time.time() if (_nNow == None) else _nNow
+        return (nNow >= _nTime - self.m_nTickSecs / 2.0)
+
+
+    # **************************************************************************
+    # lateness
+
+    def add_lateness(self, _sName, _nTime, _nNow = None):
+        nNow   = time.time() if (_nNow == None) else _nNow
+        nLate  = nNow - _nTime
+        aStats = self.m_hLateness.get(_sName)
+        if (aStats == None):
+            aStats = self.m_hLateness[_sName] = [0, 0.0, 0.0, 0.0]
+        aStats[0] += 1
+        aStats[1] += nLate
+        aStats[2]  = max(aStats[2], nLate)
+        aStats[3]  = max(aStats[3], -nLate)
+        return nLate
+
+
+    def lateness(self):
+        # [name, steps, mean ms, max ms late, max ms early]
+        aRows = []
+        for sName in sorted(self.m_hLateness.keys()):
+            aStats = self.m_hLateness[sName]
+            aRows.append([sName, aStats[0], 1000.0 * aStats[1] / aStats[0], 1000.0 * aStats[2], 1000.0 * aStats[3]])
+        return aRows
@@ -13,6 +13,8 @@
 # All rights reserved.
 # ******************************************************************************
 
+import Logger
+
 from CoreHandler import CoreHandler
 
 # ******************************************************************************
@@ -27,6 +29,7 @@ class ClipCmdHandler(CoreHandler):
         bIgnoreRelease = True
         bLogRxMsgs     = False
         self.config('/clip/cmd', bIgnoreRelease, bLogRxMsgs)
+        self.subscribe(['new_track_sel', 'new_scene_sel'])
         self.add_callbacks(['left','right','up','down','fire','stop','follow','warp','duplicate','legato','seek','cut','copy','paste'])
         self.add_callbacks_pref('sel', ['left','right','up','down']) # managed by a ruby script
 
@@ -115,26 +118,29 @@ class ClipCmdHandler(CoreHandler):
                         aAudioInfoMsgs.append(['/clip/info/genre' , frame.strings[0]])
 
         except Exception as e:
-            self.log("   => Could not read id3 tags for '%s': %s" % (oClip.file_path, str(e)))
+            self.log_error("   => Could not read id3 tags for '%s': %s", oClip.file_path, str(e))
 
         sMsg = 'ClipCmdHandler, update_audio_info, clip/info, audio_track_info'
         self.send_bundle(sMsg, aAudioInfoMsgs)
 
 
     def log_info(self, _oClip):
-        self.log('  => selected    : %s' % (_oClip.file_path))
-        self.log('  => color       : %s' % (_oClip.color))
-        self.log('  => color index : %s' % (_oClip.color_index))
-        self.log('  => length      : %s' % (_oClip.length))
-        self.log('  => name        : %s' % (_oClip.name))
-        self.log('  => warp mode   : %s' % (_oClip.warp_mode))
-        self.log('  => start lopp  : %s' % (_oClip.loop_start))
-        self.log('  => end loop    : %s' % (_oClip.loop_end))
-        self.log('  => start marker: %s' % (_oClip.start_marker))
-        self.log('  => end marker  : %s' % (_oClip.end_marker))
-        self.log('  => playing pos : %s' % (_oClip.playing_position))
-        self.log('  => loop pos    : %s' % (_oClip.position))
-        self.log('  => looping     : %s' % (_oClip.looping))
+        if (self.is_logging(Logger.DEBUG) == False):
+            return # no Live API calls for nothing
+
+        self.log_debug('  => selected    : %s', _oClip.file_path)
+        self.log_debug('  => color       : %s', _oClip.color)
+        self.log_debug('  => color index : %s', _oClip.color_index)
+        self.log_debug('  => length      : %s', _oClip.length)
+        self.log_debug('  => name        : %s', _oClip.name)
+        self.log_debug('  => warp mode   : %s', _oClip.warp_mode)
+        self.log_debug('  => start lopp  : %s', _oClip.loop_start)
+        self.log_debug('  => end loop    : %s', _oClip.loop_end)
+        self.log_debug('  => start marker: %s', _oClip.start_marker)
+        self.log_debug('  => end marker  : %s', _oClip.end_marker)
+        self.log_debug('  => playing pos : %s', _oClip.playing_position)
+        self.log_debug('  => loop pos    : %s', _oClip.position)
+        self.log_debug('  => looping     : %s', _oClip.looping)
 
 
     def handle(self, _aMessage):
@@ -191,7 +197,7 @@ class ClipCmdHandler(CoreHandler):
             nLength = oClip.length
             nNewPos = nValue * nLength
 
-            self.log('> Seeking: %f, length: %f, beat/time: %f' % (nValue, nLength, nNewPos))
+            self.log('> Seeking: %f, length: %f, beat/time: %f', nValue, nLength, nNewPos)
             oClip.scrub(nNewPos)
             oClip.stop_scrub()
 
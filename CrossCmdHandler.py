@@ -33,6 +33,7 @@ class CrossCmdHandler(CoreHandler):
         self.add_callbacks(['fader', 'center', 'delay', 'factor', 'play'])
         self.add_callbacks_pref('fade', ['a', 'b'])
         self.add_callbacks_pref('auto', ['a', 'b'])
+        self.add_continuous('fader')
 
         self.m_oCrossfader = self.master().mixer_device.crossfader
         self.reset_fader()
@@ -85,7 +86,7 @@ class CrossCmdHandler(CoreHandler):
             self.m_bAutoOn = False
 
         elif (self.m_sCmd == 'delay'):
-            self.log('> new delay selected: %f [bars], factor: %s' % (_aMessage[2], self.m_nFactor))
+            self.log('> new delay selected: %f [bars], factor: %s', _aMessage[2], self.m_nFactor)
             self.m_nDelay = int(_aMessage[2])
             self.compute_params()
 
@@ -98,7 +99,7 @@ class CrossCmdHandler(CoreHandler):
             self.send_bundle(sMsg, aCrossMsgs)
 
         elif (self.m_sCmd == 'factor'):
-            self.log('> new factor selected: %f [bars], factor: %s' % (self.m_nDelay, _aMessage[2]))
+            self.log('> new factor selected: %f [bars], factor: %s', self.m_nDelay, _aMessage[2])
             self.m_nFactor = _aMessage[2]
             self.compute_params()
 
@@ -111,15 +112,17 @@ class CrossCmdHandler(CoreHandler):
                 self.compute_params()
 
             self.m_bAutoOn = bActive
+            if (bActive == True):
+                self.start_scheduled_task('update_async_scheduled_tasks')
             self.send_msg('play', _aMessage[2])
-            self.log('> play: %d' % (self.m_bAutoOn))
+            self.log('> play: %d', self.m_bAutoOn)
 
         else:
             sCmd         = self.m_aParts[0]
             self.m_sSide = self.m_aParts[1]
 
             if (sCmd == 'fade'):
-                self.log('> crossfade cmd: %s to %s immediately' % (sCmd, self.m_sSide))
+                self.log('> crossfade cmd: %s to %s immediately', sCmd, self.m_sSide)
                 nValue = -1 if (self.m_sSide == 'a') else 1
                 self.m_oCrossfader.value = nValue
                 self.send_msg('fader', nValue)
@@ -127,10 +130,11 @@ class CrossCmdHandler(CoreHandler):
                 self.m_bAutoOn = False
 
             elif (sCmd == 'auto'):
-                self.log('> crossfade cmd: %s to %s in %d bars' % (sCmd, self.m_sSide, self.m_nDelay * self.m_nFactor))
+                self.log('> crossfade cmd: %s to %s in %d bars', sCmd, self.m_sSide, self.m_nDelay * self.m_nFactor)
                 self.compute_params()
                 self.send_msg('play', 1.0)
                 self.m_bAutoOn = True
+                self.start_scheduled_task('update_async_scheduled_tasks')
 
 
     def compute_params(self):
@@ -148,12 +152,13 @@ class CrossCmdHandler(CoreHandler):
         self.m_nCount      = 0 # reset update-gui count
 
         lLog = (self.m_nTimeStart, self.m_nTimeEnd, self.m_nValueStart, self.m_nValueEnd, self.m_nSlope, nTimeDelta, nValueDelta, nTempo)
-        self.log('> time [%f, %f], value [%f, %f], slope: %f, delta time: %f, delta value: %f, tempo: %f' % lLog)
+        self.log_debug('> time [%f, %f], value [%f, %f], slope: %f, delta time: %f, delta value: %f, tempo: %f', *lLog)
 
 
+    # runs on every tick while auto crossfading
     def update_async_scheduled_tasks(self):
         if (self.m_bAutoOn == False):
-            return
+            return False
 
         nTime = time.time()
 
@@ -182,4 +187,6 @@ class CrossCmdHandler(CoreHandler):
         if (self.m_nCount % self.m_nMsgRate == 0):
             self.send_msg('fader', nNewValue)
 
+        return self.m_bAutoOn
+
 
@@ -0,0 +1,118 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Event bus of the modules: a module subscribes to the topics (events) its
+# update() method handles and an event published by a module reaches only
+# the subscribers of its topic, in subscription (module loading) order.
+#
+# The coalesced topics (config.txt: event_coalesce) published during a tick
+# are delivered once, with the last arguments, when the tick ends: scrolling
+# the session three times in a tick refreshes the tracks once. Outside a tick
+# (Live listeners) every event is delivered right away.
+# ******************************************************************************
+
+class EventBus:
+
+    def __init__(self, _oScript, _aCoalesced):
+        self.m_oScript     = _oScript
+        self.m_hSubs       = {}    # topic -> subscribers
+        self.m_hCoalesced  = dict.fromkeys(_aCoalesced, True)
+        self.m_bOpen       = False # nothing is delivered while loading the modules
+        self.m_nTickDepth  = 0
+        self.m_aPending    = []    # coalesced topics published in the tick, in order
+        self.m_hPending    = {}    # topic -> last arguments
+        self.m_nPublished  = 0
+        self.m_nDelivered  = 0
+        self.m_nCoalesced  = 0
+
+
+    def subscribe(self, _sTopic, _oSubscriber):
+        aSubs = self.m_hSubs.setdefault(_sTopic, [])
+        if (_oSubscriber not in aSubs):
+            aSubs.append(_oSubscriber)
+
+
+    def unsubscribe(self, _sTopic, _oSubscriber):
+        aSubs = self.m_hSubs.get(_sTopic, [])
+        if (_oSubscriber in aSubs):
+            aSubs.remove(_oSubscriber)
+
+
+    def open(self):
+        self.m_bOpen = True
+
+
+    def close(self):
+        self.m_bOpen    = False
+        self.m_hSubs    = {}
+        self.m_aPending = []
+        self.m_hPending = {}
+
+
+    # **************************************************************************
+    # publishing
+
+    def publish(self, _sTopic, _oArgs = None):
+        if (self.m_bOpen == False):
+            return
+        self.m_nPublished += 1
+
+        if (self.m_nTickDepth > 0 and _sTopic in self.m_hCoalesced):
+            if (_sTopic in self.m_hPending):
+                self.m_nCoalesced += 1
+            else:
+                self.m_aPending.append(_sTopic)
+            self.m_hPending[_sTopic] = _oArgs
+            return
+
+        self.deliver(_sTopic, _oArgs)
+
+
+    def deliver(self, _sTopic, _oArgs):
+        # a copy, subscribers may (un)subscribe while handling the event
+        for oSubscriber in list(self.m_hSubs.get(_sTopic, [])):
+            self.m_nDelivered += 1
+            oSubscriber.update(_sTopic, _oArgs)
+
+
+    # called around the tick (update_display)
+    def begin_tick(self):
+        self.m_nTickDepth += 1
+
+
+    def end_tick(self):
+        self.m_nTickDepth -= 1
+        if (self.m_nTickDepth > 0):
+            return
+
+        # the events published while delivering are coalesced too
+        self.m_nTickDepth = 1
+        try:
+            while (len(self.m_aPending) > 0):
+                sTopic = self.m_aPending.pop(0)
+                oArgs  = self.m_hPending.pop(sTopic)
+                self.deliver(sTopic, oArgs)
+        finally:
+            self.m_nTickDepth = 0
+
+
+    def stats(self):
+        return {
+            'published': self.m_nPublished,
+            'delivered': self.m_nDelivered,
+            'coalesced': self.m_nCoalesced,
+        }
@@ -0,0 +1,256 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+import os
+import sys
+import time
+
+# ******************************************************************************
+# Live API call accounting (debug mode, config.txt: live_proxy | true)
+#
+# The modules get a c_instance whose song() is wrapped in a LiveProxy: every
+# Live object reached from it is wrapped too, and every property read, write
+# and method call is counted for the module (and method) doing it. The counts
+# are closed on every tick, so the report shows the total, the mean per tick
+# and the worst tick of every call site, to see where caching pays off.
+#
+# A Live object always gets the same proxy, and proxies compare and hash as
+# the objects they wrap, so they work as dictionary keys (listeners) and in
+# comparisons with other proxies.
+# ******************************************************************************
+
+class LiveApiAccount:
+
+    def __init__(self, _oScript, _sRootPath, _nDumpSecs):
+        self.m_oScript   = _oScript
+        self.m_sRootPath = _sRootPath
+        self.m_nDumpSecs = _nDumpSecs
+        self.m_hProxies  = {} # Live object -> proxy
+        self.m_hTick     = {} # call site -> count in the current tick
+        self.m_hTotals   = {} # call site -> [count, max count in a tick]
+        self.m_nTicks    = 0
+        self.m_nDumpTime = time.time()
+
+
+    # **************************************************************************
+    # proxies
+
+    def wrap(self, _oValue):
+        if (isinstance(_oValue, LiveProxy)):
+            return _oValue
+
+        if (is_live_object(_oValue)):
+            oProxy = self.m_hProxies.get(_oValue)
+            if (oProxy == None):
+                oProxy = LiveProxy(_oValue, self)
+                self.m_hProxies[_oValue] = oProxy
+            return oProxy
+
+        # python sequences of Live objects (Live returns Vectors, wrapped above)
+        if (isinstance(_oValue, (tuple, list)) and len(_oValue) > 0 and is_live_object(_oValue[0])):
+            return tuple([self.wrap(oItem) for oItem in _oValue])
+
+        return _oValue
+
+
+    # **************************************************************************
+    # accounting
+
+    def count(self, _oTarget, _sName, _sKind):
+        sSite = '%s %s.%s %s' % (caller_site(), type(_oTarget).__name__, _sName, _sKind)
+        self.m_hTick[sSite] = self.m_hTick.get(sSite, 0) + 1
+
+
+    # called on every tick (update_display)
+    def tick(self):
+        for (sSite, nCount) in self.m_hTick.iteritems():
+            aTotal = self.m_hTotals.get(sSite)
+            if (aTotal == None):
+                self.m_hTotals[sSite] = [nCount, nCount]
+            else:
+                aTotal[0] += nCount
+                if (nCount > aTotal[1]):
+                    aTotal[1] = nCount
+        self.m_hTick   = {}
+        self.m_nTicks += 1
+
+        if (self.m_nDumpSecs > 0 and time.time() - self.m_nDumpTime >= self.m_nDumpSecs):
+            self.dump()
+
+
+    def top(self, _nRows = 0):
+        # [call site, total, mean per tick, max in a tick], most calls first
+        nTicks = max(self.m_nTicks, 1)
+        aRows  = [[sSite, aTotal[0], float(aTotal[0]) / nTicks, aTotal[1]] for (sSite, aTotal) in self.m_hTotals.iteritems()]
+        aRows.sort(key = lambda aRow: -aRow[1])
+        return aRows[:_nRows] if (_nRows > 0) else aRows
+
+
+    def per_module(self):
+        hModules = {}
+        for (sSite, aTotal) in self.m_hTotals.iteritems():
+            sModule = sSite.split('.')[0]
+            hModules[sModule] = hModules.get(sModule, 0) + aTotal[0]
+        return sorted(hModules.items(), key = lambda aItem: -aItem[1])
+
+
+    def on_stats_query(self, _aMessage = None):
+        # one message per call site: site, total, mean per tick, max in a tick
+        aMessages = []
+        for aRow in self.top(30):
+            aMessages.append(['/debug/liveapi', [aRow[0], aRow[1], aRow[2], aRow[3]]])
+        self.m_oScript.m_oOscServer.sendBundle(aMessages)
+
+
+    def dump(self):
+        self.m_nDumpTime = time.time()
+        sPath  = os.path.join(self.m_sRootPath, 'live_api.txt')
+        nTicks = max(self.m_nTicks, 1)
+        aLines = []
+        aLines.append('AaMakro5oul Live API calls, %s, %d ticks' % (time.strftime('%Y-%m-%d %H:%M:%S'), self.m_nTicks))
+        aLines.append('')
+        aLines.append('%-40s %12s %12s' % ('module', 'calls', 'per tick'))
+        for (sModule, nTotal) in self.per_module():
+            aLines.append('%-40s %12d %12.1f' % (sModule, nTotal, float(nTotal) / nTicks))
+        aLines.append('')
+        aLines.append('%-100s %12s %10s %10s' % ('call site', 'calls', 'per tick', 'max tick'))
+        for aRow in self.top(200):
+            aLines.append('%-100s %12d %10.1f %10d' % tuple(aRow))
+        try:
+            oFile = open(sPath, 'w')
+            oFile.write('\n'.join(aLines) + '\n')
+            oFile.close()
+        except IOError, oError:
+            self.m_oScript.log('> LiveApiAccount: could not write "%s": %s', sPath, str(oError))
+
+
+# ******************************************************************************
+
+def is_live_object(_oValue):
+    # Boost.Python classes of Live (and of the simulator in tools/Live)
+    return getattr(type(_oValue), '__module__', '').startswith('Live')
+
+
+def unwrap(_oValue):
+    if (isinstance(_oValue, LiveProxy)):
+        return object.__getattribute__(_oValue, '_LiveProxy__oTarget')
+    if (isinstance(_oValue, (tuple, list))):
+        return type(_oValue)([unwrap(oItem) for oItem in _oValue])
+    return _oValue
+
+
+def caller_site():
+    # the first frame (out of this module) running a method of an object:
+    # 'TrackClipHandler.update_track_clips'
+    oFrame = sys._getframe(3)
+    while (oFrame != None):
+        oSelf = oFrame.f_locals.get('self')
+        if (oSelf != None and not isinstance(oSelf, LiveProxy)):
+            return '%s.%s' % (oSelf.__class__.__name__, oFrame.f_code.co_name)
+        oFrame = oFrame.f_back
+    return '?'
+
+
+class LiveProxy(object):
+
+    def __init__(self, _oTarget, _oAccount):
+        object.__setattr__(self, '_LiveProxy__oTarget' , _oTarget)
+        object.__setattr__(self, '_LiveProxy__oAccount', _oAccount)
+
+
+    def __getattr__(self, _sName):
+        oTarget  = self.__oTarget
+        oAccount = self.__oAccount
+        oValue   = getattr(oTarget, _sName)
+
+        if (callable(oValue) and not is_live_object(oValue)):
+            def fCall(*_aArgs):
+                oAccount.count(oTarget, _sName, 'call')
+                return oAccount.wrap(oValue(*[unwrap(oArg) for oArg in _aArgs]))
+            return fCall
+
+        oAccount.count(oTarget, _sName, 'get')
+        return oAccount.wrap(oValue)
+
+
+    def __setattr__(self, _sName, _oValue):
+        self.__oAccount.count(self.__oTarget, _sName, 'set')
+        setattr(self.__oTarget, _sName, unwrap(_oValue))
+
+
+    # Live Vectors
+    def __len__(self):
+        self.__oAccount.count(self.__oTarget, '__len__', 'call')
+        return len(self.__oTarget)
+
+
+    def __getitem__(self, _oIdx):
+        self.__oAccount.count(self.__oTarget, '[]', 'get')
+        return self.__oAccount.wrap(self.__oTarget[_oIdx])
+
+
+    def __iter__(self):
+        self.__oAccount.count(self.__oTarget, '__iter__', 'call')
+        for oItem in self.__oTarget:
+            yield self.__oAccount.wrap(oItem)
+
+
+    def __contains__(self, _oItem):
+        return (unwrap(_oItem) in self.__oTarget)
+
+
+    # same identity as the wrapped object
+    def __eq__(self, _oOther):
+        return (self.__oTarget == unwrap(_oOther))
+
+
+    def __ne__(self, _oOther):
+        return (self.__oTarget != unwrap(_oOther))
+
+
+    def __hash__(self):
+        return hash(self.__oTarget)
+
+
+    def __nonzero__(self):
+        return bool(self.__oTarget)
+
+
+    def __str__(self):
+        return str(self.__oTarget)
+
+
+    def __unicode__(self):
+        return unicode(self.__oTarget)
+
+
+    def __repr__(self):
+        return 'LiveProxy(%r)' % (self.__oTarget)
+
+
+class CtrlInstanceProxy:
+    """The c_instance given to the modules: song() returns the proxy"""
+
+    def __init__(self, _oCtrlInstance, _oAccount):
+        self.m_oCtrlInstance = _oCtrlInstance
+        self.m_oAccount      = _oAccount
+
+
+    def song(self):
+        return self.m_oAccount.wrap(self.m_oCtrlInstance.song())
+
+
+    def __getattr__(self, _sName):
+        return getattr(self.m_oCtrlInstance, _sName)
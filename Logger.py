@@ -0,0 +1,189 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+import os
+import time
+import datetime
+import collections
+import Live
+
+# ******************************************************************************
+# Buffered logger of the modules. A record (time, module, level, format and
+# arguments) is only appended to a ring buffer when it is logged, it is
+# formatted and written to log.txt (in the root path) on the next tick, by
+# flush(), for at most 'log_flush_ms' milliseconds, the rest waits for the
+# following ticks. When the ring buffer is full the oldest records are dropped
+# (and counted). log.txt is rotated to log.txt.1 .. log.txt.N when it reaches
+# 'log_file_kb' kilobytes.
+#
+# Every module has a level (config.txt: log_level, log_levels), the modules
+# check it before logging so a record below it costs a comparison. With
+# 'log_live' the records are written to the Log.txt of Ableton Live too.
+# ******************************************************************************
+
+DEBUG = 10
+INFO  = 20
+WARN  = 30
+ERROR = 40
+OFF   = 100
+
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warn': WARN, 'error': ERROR, 'off': OFF}
+NAMES  = {DEBUG: 'D', INFO: 'I', WARN: 'W', ERROR: 'E'}
+
+class Logger:
+
+    def __init__(self):
+        # the records logged before configure() (i.e. while loading the
+        # config) are kept, configure() drops the ones below their level
+        self.m_sPath       = None
+        self.m_nLevel      = INFO
+        self.m_hLevels     = {}   # module -> level
+        self.m_oRing       = collections.deque([], 4096)
+        self.m_nFlushSecs  = 0.001
+        self.m_nFileMax    = 1024 * 1024
+        self.m_nFiles      = 3
+        self.m_bLive       = True
+        self.m_oFile       = None
+        self.m_nFileSize   = 0
+        self.m_nAdded      = 0
+        self.m_nDropped    = 0
+        self.m_nWritten    = 0
+
+
+    def configure(self, _sRootPath, _nLevel, _hLevels, _nBuffer, _nFlushMs, _nFileKb, _nFiles, _bLive):
+        self.m_sPath      = os.path.join(_sRootPath, 'log.txt')
+        self.m_nLevel     = _nLevel
+        self.m_hLevels    = _hLevels
+        # the records kept while loading the config, below their level now, go
+        aRecords          = [tRecord for tRecord in self.m_oRing if tRecord[2] >= self.level(tRecord[1])]
+        self.m_oRing      = collections.deque(aRecords, max(_nBuffer, 1))
+        self.m_nFlushSecs = _nFlushMs / 1000.0
+        self.m_nFileMax   = _nFileKb * 1024
+        self.m_nFiles     = _nFiles
+        self.m_bLive      = _bLive
+
+
+    def level(self, _sModule):
+        return self.m_hLevels.get(_sModule, self.m_nLevel)
+
+
+    # **************************************************************************
+    # records
+
+    def add(self, _sModule, _nLevel, _sMessage, _aArgs):
+        # the arguments are formatted later: only values that do not change
+        # (numbers, strings) should be logged
+        if (len(self.m_oRing) == self.m_oRing.maxlen):
+            self.m_nDropped += 1
+        self.m_oRing.append((time.time(), _sModule, _nLevel, _sMessage, _aArgs))
+        self.m_nAdded += 1
+
+
+    def format(self, _tRecord):
+        (nTime, sModule, nLevel, sMessage, aArgs) = _tRecord
+        sText = sMessage
+        if (len(aArgs) > 0):
+            try:
+                sText = sMessage % aArgs
+            except Exception, oError:
+                sText = '%s %s (could not format: %s)' % (sMessage, repr(aArgs), str(oError))
+        sTime = datetime.datetime.fromtimestamp(nTime).strftime('%Y-%m-%d %H:%M:%S.%f')
+        return '%s %s %-18s %s' % (sTime, NAMES.get(nLevel, '?'), sModule, sText)
+
+
+    # called on every tick (update_display), _bAll -> no time limit
+    def flush(self, _bAll = False):
+        if (len(self.m_oRing) == 0):
+            return 0
+
+        nEnd   = time.time() + self.m_nFlushSecs
+        aLines = []
+        while (len(self.m_oRing) > 0):
+            aLines.append(self.format(self.m_oRing.popleft()))
+            if (_bAll == False and time.time() >= nEnd):
+                break
+
+        if (self.m_bLive):
+            for sLine in aLines:
+                Live.Base.log(sLine)
+        self.write(aLines)
+        self.m_nWritten += len(aLines)
+        return len(aLines)
+
+
+    # **************************************************************************
+    # file
+
+    def write(self, _aLines):
+        if (self.m_sPath == None):
+            return # not configured or not writable
+        try:
+            if (self.m_oFile == None):
+                self.m_oFile     = open(self.m_sPath, 'a')
+                self.m_nFileSize = self.m_oFile.tell()
+            sText = '\n'.join(_aLines) + '\n'
+            self.m_oFile.write(sText)
+            self.m_oFile.flush()
+            self.m_nFileSize += len(sText)
+            if (self.m_nFileMax > 0 and self.m_nFileSize >= self.m_nFileMax):
+                self.rotate()
+        except (IOError, OSError), oError:
+            Live.Base.log('> Logger: could not write "%s": %s' % (self.m_sPath, str(oError)))
+            self.m_sPath = None
+            self.close_file()
+
+
+    def rotate(self):
+        # log.txt -> log.txt.1 -> ... -> log.txt.N (dropped), os.rename()
+        # does not replace an existing file on Windows
+        self.close_file()
+        self.remove_file('%s.%d' % (self.m_sPath, self.m_nFiles))
+        for nIdx in range(self.m_nFiles - 1, 0, -1):
+            sOld = '%s.%d' % (self.m_sPath, nIdx)
+            if (os.path.isfile(sOld)):
+                sNew = '%s.%d' % (self.m_sPath, nIdx + 1)
+                self.remove_file(sNew)
+                os.rename(sOld, sNew)
+        if (self.m_nFiles > 0):
+            self.remove_file('%s.1' % (self.m_sPath))
+            os.rename(self.m_sPath, '%s.1' % (self.m_sPath))
+        else:
+            os.remove(self.m_sPath)
+
+
+    def remove_file(self, _sPath):
+        if (os.path.isfile(_sPath)):
+            os.remove(_sPath)
+
+
+    def close_file(self):
+        if (self.m_oFile != None):
+            self.m_oFile.close()
+            self.m_oFile = None
+
+
+    def close(self):
+        self.flush(True)
+        self.close_file()
+
+
+    def stats(self):
+        return {
+            'added'  : self.m_nAdded,
+            'dropped': self.m_nDropped,
+            'written': self.m_nWritten,
+            'pending': len(self.m_oRing),
+        }
@@ -36,6 +36,11 @@ class LoopJumpHandler(CoreHandler):
         self.add_callbacks_pref('pos/forw'  , self.beats_list())
 
 
+    # 'start/back/0050' -> 0.5 beats
+    def parse_route(self, _oRoute):
+        _oRoute.m_nBeat = self.beat_value(_oRoute.m_aParts[2])
+
+
     def handle(self, _aMessage):
         oClip = self.song().view.highlighted_clip_slot.clip
         if (oClip.looping == False):
@@ -43,8 +48,7 @@ class LoopJumpHandler(CoreHandler):
 
         sPos  = self.m_aParts[0]
         sDir  = self.m_aParts[1]
-        sBeat = self.m_aParts[2]
-        nBeat = self.beat_value(sBeat)
+        nBeat = self.m_oRoute.m_nBeat
 
         nLoopStart = oClip.loop_start
         nLoopEnd   = oClip.loop_end
@@ -36,6 +36,11 @@ class LoopRollHandler(CoreHandler):
         self.add_callbacks_pref('pos/curr' , self.beats_list())
 
 
+    # 'bar/curr/0050' -> 0.5 beats
+    def parse_route(self, _oRoute):
+        _oRoute.m_nBeat = self.beat_value(_oRoute.m_aParts[2])
+
+
     def handle(self, _aMessage):
         oClip = self.song().view.highlighted_clip_slot.clip
         if (oClip.looping):
@@ -45,8 +50,7 @@ class LoopRollHandler(CoreHandler):
         # parse command parts
         sLen   = self.m_aParts[0]
         sPos   = self.m_aParts[1]
-        sBeat  = self.m_aParts[2]
-        nBeat  = self.beat_value(sBeat)
+        nBeat  = self.m_oRoute.m_nBeat
 
         nPlayPos  = oClip.playing_position
         nCurrBar  = (math.floor(math.floor(nPlayPos)/ 4.0)) * 4.0
@@ -39,6 +39,11 @@ class MovePosHandler(CoreHandler):
         self.m_nBackBeatForCue = 16
 
 
+    # 'curr/back/0050' -> 0.5 beats, 'cue' is not parsed
+    def parse_route(self, _oRoute):
+        _oRoute.m_nBeat = self.beat_value(_oRoute.m_aParts[2])
+
+
     def handle(self, _aMessage):
         # parse command parts
         sPos = self.m_aParts[0]
@@ -53,8 +58,7 @@ class MovePosHandler(CoreHandler):
             return
 
         sDir  = self.m_aParts[1]
-        sBeat = self.m_aParts[2]
-        nBeat = self.beat_value(sBeat)
+        nBeat = self.m_oRoute.m_nBeat
 
         if (sPos == 'curr'):
             if (sDir == 'back'):
@@ -32,7 +32,10 @@
 # Updated June 2007 by Hans Huebner (hans.huebner@gmail.com)
 #   Improved bundle support, API cleanup
 
+import re
 import sys
+import time
+import heapq
 import struct
 import math
 import string
@@ -131,6 +134,11 @@ def abs_to_timestamp(abs):
     return struct.pack('!LL', sec_1900, picos)
 
 
+def timestamp_to_abs(timetag):
+    """ since 1900 64b OSC => since 1970 """
+    return (timetag >> 32) - JAN_1970 + (timetag & 0xFFFFFFFFL) / float(SECS_TO_PICOS)
+
+
 class OSCBundle:
     """Builds OSC bundles"""
     def __init__(self, when=None):
@@ -241,6 +249,114 @@ def OSCArgument(next):
     return (tag, binary)
 
 
+# OSC Encoder **********************************************
+
+BUNDLE_HEADER = OSCArgument('#bundle')[1]
+
+class OSCEncoder:
+    """Encodes OSC messages with precompiled templates.
+
+    A template is compiled once for every (address, typetags) pair
+    (plus the padded sizes of its string arguments, since they are
+    part of the binary layout). It keeps the padded address and
+    typetags as a cached header and a precompiled struct.Struct
+    for the whole message, so encoding a message is a single pack."""
+
+    def __init__(self, maxTemplates = 4096):
+        self.headers      = {}
+        self.templates    = {}
+        self.maxTemplates = maxTemplates
+
+
+    def clear(self):
+        self.headers   = {}
+        self.templates = {}
+
+
+    def typeArguments(self, args):
+        """Returns the (typetags, string sizes, values) of the arguments.
+        Like OSCArgument, arguments of unsupported types are skipped."""
+        tags   = [',']
+        sizes  = []
+        values = []
+        for arg in args:
+            argType = type(arg)
+            if argType is float:
+                tags.append('f')
+            elif argType is int:
+                tags.append('i')
+            elif argType is str:
+                tags.append('s')
+                sizes.append((len(arg) + 4) & ~3)
+            else:
+                continue
+            values.append(arg)
+
+        return (''.join(tags), tuple(sizes), values)
+
+
+    def header(self, address, typetags):
+        """Returns the cached padded address and typetags."""
+        key    = (address, typetags)
+        header = self.headers.get(key)
+        if header is None:
+            header = OSCArgument(address)[1] + OSCArgument(typetags)[1]
+            self.headers[key] = header
+        return header
+
+
+    def template(self, address, typetags, sizes, element = False):
+        """Returns the (struct, header) template of a message. Bundle
+        element templates start with the size of the message."""
+        key      = (address, typetags, sizes, element)
+        template = self.templates.get(key)
+        if template is None:
+            header = self.header(address, typetags)
+            fmt    = ['>i%ds' % len(header)] if element else ['>%ds' % len(header)]
+            nextSize = 0
+            for tag in typetags[1:]:
+                if tag == 's':
+                    fmt.append('%ds' % sizes[nextSize])
+                    nextSize += 1
+                else:
+                    fmt.append(tag)
+
+            template = (struct.Struct(''.join(fmt)), header)
+            if len(self.templates) >= self.maxTemplates:
+                self.templates = {}
+            self.templates[key] = template
+        return template
+
+
+    def encodeMessage(self, address, args = ()):
+        """Returns the binary OSC message."""
+        typetags, sizes, values = self.typeArguments(args)
+        packer, header = self.template(address, typetags, sizes)
+        return packer.pack(header, *values)
+
+
+    def encodeElement(self, address, args = ()):
+        """Returns the binary OSC message prefixed with its size,
+        ready to be joined into a bundle."""
+        typetags, sizes, values = self.typeArguments(args)
+        packer, header = self.template(address, typetags, sizes, True)
+        return packer.pack(packer.size - 4, header, *values)
+
+
+    def bundleHeader(self, when = None):
+        """Returns the '#bundle' string and timetag of a bundle to be
+        executed at time 'when' (seconds since 1970) or immediately
+        if it is None."""
+        if when is None:
+            return BUNDLE_HEADER + '\0\0\0\0\0\0\0\0'
+        return BUNDLE_HEADER + abs_to_timestamp(when)
+
+
+    def encodeBundle(self, elements, when = None):
+        """Returns the binary OSC bundle of some encoded elements."""
+        return ''.join([self.bundleHeader(when)] + elements)
+
+
 def parseArgs(args):
     """Given a list of strings, produces a list
     where those strings have been parsed (where
@@ -292,6 +408,257 @@ def decodeOSC(data):
     return decoded
 
 
+# OSC Decoder **********************************************
+
+INT_STRUCT     = struct.Struct('>i')
+FLOAT_STRUCT   = struct.Struct('>f')
+TIMETAG_STRUCT = struct.Struct('>Q')
+
+# typetags with only numbers -> struct of their arguments
+NUMBERS_STRUCTS = dict([(typetags, struct.Struct('>' + typetags[1:]))
+    for typetags in [',f', ',i', ',ff', ',if', ',fi', ',ii', ',fff', ',iff', ',fif', ',iif']])
+
+def decodeString(data, offset, end):
+    """Reads the OSC string starting at offset,
+    returning a (string, next offset) tuple."""
+    null = data.find('\0', offset, end)
+    if null < 0:
+        raise ValueError('unterminated OSC string at offset %d' % offset)
+    return (str(data[offset:null]), offset + ((null - offset + 4) & ~3))
+
+
+def checkSize(offset, size, end):
+    """Raises a ValueError unless size bytes can be read at offset
+    before end, so a truncated datagram is never decoded from the
+    stale bytes left past it in a reused buffer."""
+    if size < 0 or offset + size > end:
+        raise ValueError('truncated OSC data at offset %d' % offset)
+
+
+def decodeOSCBuffer(data, offset = 0, end = None):
+    """Converts a typetagged OSC message or bundle to a Python list,
+    like decodeOSC, walking a single buffer with integer offsets.
+    Only the argument values are copied out of the buffer, nested
+    bundles are decoded in place."""
+    if end is None:
+        end = len(data)
+
+    address, offset = decodeString(data, offset, end)
+    decoded = [address]
+
+    if address == "#bundle":
+        checkSize(offset, 8, end)
+        decoded.append(TIMETAG_STRUCT.unpack_from(data, offset)[0])
+        offset += 8
+        while offset < end:
+            checkSize(offset, 4, end)
+            length  = INT_STRUCT.unpack_from(data, offset)[0]
+            offset += 4
+            checkSize(offset, length, end)
+            decoded.append(decodeOSCBuffer(data, offset, offset + length))
+            offset += length
+
+    elif offset < end:
+        typetags, offset = decodeString(data, offset, end)
+        decoded.append(typetags)
+
+        # fast path: only numbers (faders, toggles), unpacked at once
+        numbers = NUMBERS_STRUCTS.get(typetags)
+        if numbers is not None:
+            checkSize(offset, numbers.size, end)
+            decoded.extend(numbers.unpack_from(data, offset))
+            return decoded
+
+        if typetags[:1] != ",":
+            raise ValueError("OSC typetags lack the magic ','")
+
+        for tag in typetags[1:]:
+            if tag == "f":
+                checkSize(offset, 4, end)
+                decoded.append(FLOAT_STRUCT.unpack_from(data, offset)[0])
+                offset += 4
+            elif tag == "i":
+                checkSize(offset, 4, end)
+                decoded.append(INT_STRUCT.unpack_from(data, offset)[0])
+                offset += 4
+            elif tag == "s":
+                value, offset = decodeString(data, offset, end)
+                decoded.append(value)
+            elif tag == "b":
+                checkSize(offset, 4, end)
+                length  = INT_STRUCT.unpack_from(data, offset)[0]
+                offset += 4
+                checkSize(offset, length, end)
+                decoded.append(str(data[offset:offset + length]))
+                offset += (length + 3) & ~3
+            else:
+                raise ValueError("unsupported OSC typetag '%s'" % tag)
+
+    else:
+        decoded.append(",")
+
+    return decoded
+
+
+# Address Patterns *****************************************
+
+PATTERN_CHARS = '*?[]{}'
+
+def isAddressPattern(address):
+    """Tells if an address has any OSC 1.0 pattern character."""
+    for char in PATTERN_CHARS:
+        if char in address:
+            return True
+    return False
+
+
+def addressParts(address):
+    """Splits an address into its parts, without the leading empty one."""
+    if address[:1] != '/':
+        return ()
+    return tuple(address.split('/')[1:])
+
+
+def expandAlternatives(group):
+    """Expands the body of a '{a,b}' group, where an item
+    like '0..7' stands for the numbers in that range."""
+    alternatives = []
+    for item in group.split(','):
+        bounds = item.split('..')
+        if len(bounds) == 2 and bounds[0].isdigit() and bounds[1].isdigit():
+            for number in range(int(bounds[0]), int(bounds[1]) + 1):
+                alternatives.append(str(number))
+        else:
+            alternatives.append(item)
+    return alternatives
+
+
+def compilePart(part):
+    """Compiles the pattern of an address part, returning a
+    (test, alternatives) tuple. Parts made of a single '{..}' group
+    are tested with a set lookup and keep their alternatives, the
+    rest are tested with a regular expression."""
+    if (part[:1] == '{' and part[-1:] == '}' and
+        not isAddressPattern(part[1:-1])):
+        alternatives = expandAlternatives(part[1:-1])
+        return (frozenset(alternatives).__contains__, alternatives)
+
+    regex = []
+    index = 0
+    while index < len(part):
+        char = part[index]
+        close = -1
+        if char == '[' or char == '{':
+            close = part.find(char == '[' and ']' or '}', index)
+
+        if char == '*':
+            regex.append('.*')
+        elif char == '?':
+            regex.append('.')
+        elif char == '[' and close > index:
+            body = part[index + 1:close].replace('\\', '\\\\')
+            if body[:1] == '!':
+                body = '^' + body[1:]
+            regex.append('[%s]' % body)
+            index = close
+        elif char == '{' and close > index:
+            alternatives = expandAlternatives(part[index + 1:close])
+            regex.append('(?:%s)' % '|'.join([re.escape(a) for a in alternatives]))
+            index = close
+        else:
+            regex.append(re.escape(char))
+        index += 1
+
+    return (re.compile(''.join(regex) + '$').match, None)
+
+
+class AddressNode:
+    """A node of the address trie. Literal children are found with a
+    dict lookup and pattern children are tried in registration order,
+    so finding a callback costs the depth of the address and not the
+    number of registered addresses."""
+
+    def __init__(self):
+        self.children = {}
+        self.patterns = [] # [pattern, test, alternatives, node]
+        self.callback = None
+
+
+    def insert(self, parts, callback):
+        node = self
+        for part in parts:
+            if isAddressPattern(part):
+                child = None
+                for entry in node.patterns:
+                    if entry[0] == part:
+                        child = entry[3]
+                        break
+                if child is None:
+                    child = AddressNode()
+                    test, alternatives = compilePart(part)
+                    node.patterns.append([part, test, alternatives, child])
+            else:
+                child = node.children.get(part)
+                if child is None:
+                    child = AddressNode()
+                    node.children[part] = child
+            node = child
+        node.callback = callback
+
+
+    def match(self, parts, index):
+        """Returns the callback of a literal address."""
+        if index == len(parts):
+            return self.callback
+
+        part  = parts[index]
+        child = self.children.get(part)
+        if child is not None:
+            callback = child.match(parts, index + 1)
+            if callback is not None:
+                return callback
+
+        for entry in self.patterns:
+            if entry[1](part):
+                callback = entry[3].match(parts, index + 1)
+                if callback is not None:
+                    return callback
+
+        return None
+
+
+    def expand(self, parts, index, path, matches):
+        """Collects the (path, callback) of every registered address
+        matched by an incoming address pattern. Registered patterns
+        are matched through their alternatives, if they have any."""
+        if index == len(parts):
+            if self.callback is not None and path not in matches:
+                matches[path] = self.callback
+            return
+
+        part = parts[index]
+        if not isAddressPattern(part):
+            child = self.children.get(part)
+            if child is not None:
+                child.expand(parts, index + 1, path + (part,), matches)
+            for entry in self.patterns:
+                if entry[1](part):
+                    entry[3].expand(parts, index + 1, path + (part,), matches)
+            return
+
+        test = compilePart(part)[0]
+        for key in self.children:
+            if test(key):
+                self.children[key].expand(parts, index + 1, path + (key,), matches)
+        for entry in self.patterns:
+            if entry[2] is not None:
+                for alternative in entry[2]:
+                    if test(alternative):
+                        entry[3].expand(parts, index + 1, path + (alternative,), matches)
+            elif entry[0] == part:
+                entry[3].expand(parts, index + 1, path + (part,), matches)
+
+
 # Callback Manager *****************************************
 
 class CallbackManager:
@@ -299,51 +666,408 @@ class CallbackManager:
 
     The CallbackManager calls its callbacks with a list
     of decoded OSC arguments, including the address and
-    the typetags as the first two arguments."""
+    the typetags as the first two arguments.
+
+    Callbacks can be registered for OSC 1.0 address patterns
+    ('/track/clip/{0..7}/*') and incoming addresses can be
+    patterns too. Before calling a callback the address parts
+    are left in 'parts', so callbacks do not split it again.
+    A callback registered with a router gets a record too (left
+    in 'record'): the router parses an address once, when it is
+    registered or first routed, and the record is cached with
+    the route.
+
+    Bundles with a timetag in the future are parked in a deadline
+    heap and dispatched by processDeferred, which should be called
+    on every tick of the host.
+
+    Addresses can be flagged as continuous (faders): when coalescing
+    is on, handleBatch only dispatches the newest message of every
+    continuous address among the datagrams drained in one tick.
+
+    handleBatch can be given a budget of messages and of time per
+    tick, the messages left are carried to the next tick. Address
+    prefixes can be ranked as high or low priority, the messages of
+    a tick are dispatched by priority and then in order."""
+
+    def __init__(self, decoder = decodeOSCBuffer, maxRoutes = 4096, maxDelay = 60.0):
+        self.callbacks = {} # registered address or pattern -> callback
+        self.literals  = {} # registered literal address -> (callback, parts, record)
+        self.routes    = {} # matched literal address -> (callback, parts, record)
+        self.routers   = {} # callback -> router, called with (address, parts)
+        self.trie      = AddressNode()
+        self.maxRoutes = maxRoutes
+        self.parts     = ()
+        self.record    = None
+        self.decode    = decoder
+
+        self.deferred  = [] # heap of [deadline, sequence, bundle]
+        self.sequence  = 0
+        self.maxDelay  = maxDelay # seconds, later timetags are taken as clock skew
+        self.tick      = 0.1      # seconds between host ticks, measured by processDeferred
+        self.lastTick  = None
+
+        self.receiver   = None          # called with every dispatched address
+        self.fallback   = None          # called with the addresses without callback
+        self.logger     = None          # called with the errors, Live log if None
+        self.coalescing = False
+        self.continuous = AddressNode() # trie of the continuous addresses
+        self.isContinuousCache = {}     # address -> continuous or not
+
+        self.pending    = []   # messages carried over to the next tick
+        self.maxPending = 4096 # the lowest priority ones are dropped beyond this
+        self.maxMessages = 0   # messages dispatched per tick, 0 -> no limit
+        self.maxTime    = 0.0  # seconds spent dispatching per tick, 0 -> no limit
+        self.high       = ()   # address prefixes of the high priority messages
+        self.low        = ()   # address prefixes of the low priority messages
+        self.priorities = {}   # address -> 0 (high), 1 (normal) or 2 (low)
+
+        self.dispatched     = 0
+        self.decodeErrors   = 0
+        self.dispatchErrors = 0
+        self.carried        = 0
+        self.dropped        = 0
 
-    def __init__(self):
-        self.callbacks = {}
         self.add(self.unbundler, "#bundle")
 
 
     def handle(self, data, source = None):
         """Given OSC data, tries to call the callback with the
         right address."""
-        decoded = decodeOSC(data)
+        decoded = self.decode(data)
         self.dispatch(decoded)
 
 
+    def receive(self, data, end = None):
+        """Decodes an OSC datagram, or the first end bytes of a
+        buffer, for the next handleBatch. A bad datagram only loses
+        its own messages."""
+        try:
+            if end is None:
+                decoded = self.decode(data)
+            else:
+                decoded = self.decode(data, 0, end)
+            self.flatten(decoded, self.pending)
+        except Exception, e:
+            self.decodeErrors += 1
+            self.log("-> Could not decode datagram: %s", str(e))
+
+
+    def handleBatch(self, datagrams = ()):
+        """Given the OSC datagrams drained in one tick, decodes them
+        and calls the callbacks of the messages received since the
+        last batch, after the ones carried over from the previous
+        tick, coalescing the messages of continuous addresses if
+        coalescing is on. A failing callback only loses its own
+        message. Returns the number of messages dispatched."""
+        for data in datagrams:
+            self.receive(data)
+        messages = self.pending
+
+        if self.coalescing:
+            messages = self.coalesce(messages)
+
+        if len(self.high) > 0 or len(self.low) > 0:
+            messages.sort(key = self.priority) # stable, keeps the order in a class
+
+        count = len(messages)
+        if self.maxMessages > 0 and count > self.maxMessages:
+            count = self.maxMessages
+
+        deadline = None
+        if self.maxTime > 0:
+            deadline = time.time() + self.maxTime
+
+        index = 0
+        while index < count:
+            message = messages[index]
+            index  += 1
+            try:
+                self.dispatch(message)
+            except Exception, e:
+                self.dispatchErrors += 1
+                self.log("-> Exception, address: '%s', callback: [%s]", message[0], str(e))
+
+            if deadline is not None and time.time() >= deadline:
+                break
+
+        self.dispatched += index
+        self.pending     = messages[index:]
+        self.carried    += len(self.pending)
+
+        if len(self.pending) > self.maxPending:
+            self.dropped += len(self.pending) - self.maxPending
+            del self.pending[self.maxPending:]
+
+        return index
+
+
+    def setBudget(self, maxMessages = 0, maxTime = 0.0):
+        """Limits the messages dispatched and the seconds spent by
+        every handleBatch, 0 means no limit."""
+        self.maxMessages = maxMessages
+        self.maxTime     = maxTime
+
+
+    def setPriorities(self, high = (), low = ()):
+        """Sets the address prefixes of the messages dispatched
+        before and after all the others."""
+        self.high = tuple(high)
+        self.low  = tuple(low)
+        self.priorities = {}
+
+
+    def priority(self, message):
+        address  = message[0]
+        priority = self.priorities.get(address)
+        if priority is None:
+            if address.startswith(self.high):
+                priority = 0
+            elif address.startswith(self.low):
+                priority = 2
+            else:
+                priority = 1
+            if len(self.priorities) >= self.maxRoutes:
+                self.priorities = {}
+            self.priorities[address] = priority
+        return priority
+
+
+    def stats(self):
+        """Returns the counters of handleBatch."""
+        return {
+            'dispatched'    : self.dispatched,
+            'decodeErrors'  : self.decodeErrors,
+            'dispatchErrors': self.dispatchErrors,
+            'carried'       : self.carried,
+            'dropped'       : self.dropped,
+            'pending'       : len(self.pending),
+        }
+
+
+    def flatten(self, message, messages):
+        """Appends a decoded message to the list, or the messages of
+        a bundle to be run immediately so they can be coalesced too."""
+        if message[0] == "#bundle" and message[1] <= 1:
+            for element in message[2:]:
+                self.flatten(element, messages)
+        else:
+            messages.append(message)
+
+
+    def coalesce(self, messages):
+        """Drops every message of a continuous address but the newest,
+        which keeps its position. Other messages keep their order."""
+        newest = {}
+        for index in range(len(messages)):
+            address = messages[index][0]
+            if self.isContinuous(address):
+                newest[address] = index
+
+        if len(newest) == 0:
+            return messages
+
+        coalesced = []
+        for index in range(len(messages)):
+            message = messages[index]
+            if newest.get(message[0], index) == index:
+                coalesced.append(message)
+        return coalesced
+
+
+    def setReceiver(self, receiver):
+        """Sets a function called with the address of every message
+        before it is dispatched."""
+        self.receiver = receiver
+
+
+    def setCoalescing(self, coalescing):
+        self.coalescing = coalescing
+
+
+    def addContinuous(self, name):
+        """Flags an address (or address pattern) as continuous,
+        its messages can be coalesced."""
+        self.continuous.insert(addressParts(name), True)
+        self.isContinuousCache = {}
+
+
+    def setFallback(self, fallback):
+        """The fallback is called with an address without callback
+        and returns True if it registered one (i.e. it started the
+        module of the address), the message is routed again then."""
+        self.fallback = fallback
+
+
+    def setLogger(self, logger):
+        """The logger is called with a format string and its
+        arguments, which it may format later (or never)."""
+        self.logger = logger
+
+
+    def log(self, message, *args):
+        if self.logger is not None:
+            self.logger(message, *args)
+        else:
+            Live.Base.log(message % args)
+
+
+    def isContinuous(self, address):
+        continuous = self.isContinuousCache.get(address)
+        if continuous is None:
+            if isAddressPattern(address):
+                continuous = False
+            else:
+                continuous = self.continuous.match(addressParts(address), 0) is True
+            if len(self.isContinuousCache) >= self.maxRoutes:
+                self.isContinuousCache = {}
+            self.isContinuousCache[address] = continuous
+        return continuous
+
+
     def dispatch(self, message):
         """Sends decoded OSC data to an appropriate callback"""
+        address = message[0]
+        if self.receiver is not None:
+            self.receiver(address)
+
+        route   = self.literals.get(address)
+        if route is None:
+            route = self.routes.get(address)
+        if route is None:
+            route = self.route(address)
+        if route is None and self.fallback is not None and self.fallback(address):
+            route = self.route(address)
+
+        if route is None:
+            if isAddressPattern(address):
+                self.dispatchPattern(message)
+            else:
+                self.log("-> Callback not found for address '%s'. Msg: [%s]", address, message)
+            return
+
+        self.parts  = route[1]
+        self.record = route[2]
         try:
-            address = message[0]
-            self.callbacks[address](message)
+            route[0](message)
         except KeyError, e:
-            Live.Base.log("-> Callback not found for address '{0}'. Msg: [{1}]".format(address, message))
-            pass
-        except None, e:
-            Live.Base.log("-> Exception, address: '{0}', callback: [{1}]".format(address, e))
+            self.log("-> KeyError, address: '%s', callback: [%s]", address, str(e))
 
         return
 
 
-    def add(self, callback, name):
+    def dispatchPattern(self, message):
+        """Sends decoded OSC data with an address pattern to the
+        callbacks of every registered address that it matches."""
+        matches = {}
+        self.trie.expand(addressParts(message[0]), 0, (), matches)
+        if len(matches) == 0:
+            self.log("-> Callback not found for pattern '%s'. Msg: [%s]", message[0], message)
+            return
+
+        for parts in sorted(matches.keys()):
+            address     = '/' + '/'.join(parts)
+            self.parts  = parts
+            self.record = self.makeRecord(matches[parts], address, parts)
+            try:
+                matches[parts]([address] + message[1:])
+            except KeyError, e:
+                self.log("-> KeyError, address: '%s', callback: [%s]", message[0], str(e))
+
+
+    def route(self, address):
+        """Finds the callback of a literal address in the trie and
+        caches it, returning a (callback, parts, record) tuple or None."""
+        if isAddressPattern(address):
+            return None
+
+        parts    = addressParts(address)
+        callback = self.trie.match(parts, 0)
+        if callback is None:
+            return None
+
+        if len(self.routes) >= self.maxRoutes:
+            self.routes = {}
+        route = (callback, parts, self.makeRecord(callback, address, parts))
+        self.routes[address] = route
+        return route
+
+
+    def makeRecord(self, callback, address, parts):
+        router = self.routers.get(callback)
+        if router is None:
+            return None
+        return router(address, parts)
+
+
+    def add(self, callback, name, router = None):
         """Adds a callback to our set of callbacks,
         or removes the callback with name if callback
-        is None."""
+        is None. The name can be an address pattern.
+        The router (if any) makes the record of every
+        address of the callback."""
+        parts = addressParts(name)
         if callback == None:
             del self.callbacks[name]
+            if name in self.literals:
+                del self.literals[name]
         else:
             self.callbacks[name] = callback
+            if router is not None:
+                self.routers[callback] = router
+            if not isAddressPattern(name):
+                self.literals[name] = (callback, parts, self.makeRecord(callback, name, parts))
+
+        if len(parts) > 0:
+            self.trie.insert(parts, callback)
+        self.routes = {}
 
 
     def unbundler(self, messages):
-        """Dispatch the messages in a decoded bundle."""
+        """Dispatch the messages in a decoded bundle, or park
+        the bundle until the tick closest to its timetag."""
         # first two elements are #bundle and the time tag, rest are messages.
+        timetag = messages[1]
+        if timetag > 1: # 0 and 1 mean 'immediately'
+            now      = time.time()
+            deadline = timestamp_to_abs(timetag)
+            delay    = deadline - now
+            if delay > self.maxDelay:
+                self.log("-> Bundle timetag %.3fs ahead, dispatching now (clock skew?)", delay)
+            elif delay > self.tick / 2.0:
+                heapq.heappush(self.deferred, [deadline, self.sequence, messages])
+                self.sequence += 1
+                return
+
         for message in messages[2:]:
             self.dispatch(message)
 
 
+    def processDeferred(self):
+        """Dispatch the parked bundles whose deadline is closer to
+        this tick than to the next one. A failing callback only
+        loses its own message. Returns how many ran."""
+        now = time.time()
+        if self.lastTick is not None:
+            # smooth the measured tick, the host timer jitters
+            self.tick = 0.8 * self.tick + 0.2 * min(now - self.lastTick, 1.0)
+        self.lastTick = now
+
+        count   = 0
+        horizon = now + self.tick / 2.0
+        while len(self.deferred) > 0 and self.deferred[0][0] <= horizon:
+            bundle = heapq.heappop(self.deferred)[2]
+            for message in bundle[2:]:
+                try:
+                    self.dispatch(message)
+                except Exception, e:
+                    self.dispatchErrors += 1
+                    self.log("-> Exception, address: '%s', callback: [%s]", message[0], str(e))
+            count += 1
+
+        return count
+
+
 if __name__ == "__main__":
     hexDump("Welcome to the OSC testing program.")
     print
@@ -0,0 +1,177 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+import os
+import time
+
+# ******************************************************************************
+# Hot path profiler: times the methods of the modules that run on every tick
+# (handle, update, the scheduled tasks) and the OSC server drain. Every timed
+# method gets a call counter and a histogram of its durations in powers of two
+# microseconds, for the whole session and for the current window (the time
+# since the last dump).
+#
+# The methods are wrapped on the instances only when the profiler is on
+# (config.txt: profile | true), nothing is timed (or wrapped) otherwise.
+# The stats are sent as a reply to '/debug/stats' and written to
+# profile.txt in the root path every 'profile_dump' seconds.
+# ******************************************************************************
+
+class Profiler:
+
+    m_aModuleMethods = ['handle', 'update', 'update_async_scheduled_tasks', 'update_prog_async_scheduled_tasks', 'schedule_beat_tasks']
+    m_nBuckets       = 24 # 1 us .. 8 s
+
+    def __init__(self, _oScript, _sRootPath, _nDumpSecs):
+        self.m_oScript    = _oScript
+        self.m_sRootPath  = _sRootPath
+        self.m_nDumpSecs  = _nDumpSecs
+        self.m_hEntries   = {}  # name -> entry (see add_entry)
+        self.m_aNames     = []  # names in wrapping order
+        self.m_nStart     = time.time()
+        self.m_nWinStart  = self.m_nStart
+
+
+    # **************************************************************************
+    # instrumentation
+
+    def wrap_module(self, _oModule):
+        sClass = _oModule.__class__.__name__
+        for sMethod in Profiler.m_aModuleMethods:
+            self.wrap(_oModule, sMethod, '%s.%s' % (sClass, sMethod))
+
+
+    def wrap(self, _oObject, _sMethod, _sName):
+        fMethod = getattr(_oObject, _sMethod, None)
+        if (fMethod == None):
+            return # i.e. RootCmdHandler has no handle()
+        aEntry  = self.add_entry(_sName)
+        fTimer  = time.time
+        fAdd    = self.add_sample
+
+        def fTimed(*_aArgs):
+            nStart = fTimer()
+            try:
+                return fMethod(*_aArgs)
+            finally:
+                fAdd(aEntry, fTimer() - nStart)
+
+        # the instance attribute hides the class method
+        setattr(_oObject, _sMethod, fTimed)
+
+
+    def add_entry(self, _sName):
+        if (_sName not in self.m_hEntries):
+            # [session calls, session secs, session max, session histogram,
+            #  window calls, window secs, window max, window histogram]
+            self.m_hEntries[_sName] = [0, 0.0, 0.0, [0] * Profiler.m_nBuckets, 0, 0.0, 0.0, [0] * Profiler.m_nBuckets]
+            self.m_aNames.append(_sName)
+        return self.m_hEntries[_sName]
+
+
+    def add_sample(self, _aEntry, _nSecs):
+        nMicros = int(_nSecs * 1000000.0)
+        nBucket = min(nMicros.bit_length(), Profiler.m_nBuckets - 1) # 0 -> < 1 us, n -> < 2^n us
+
+        _aEntry[0] += 1
+        _aEntry[1] += _nSecs
+        _aEntry[3][nBucket] += 1
+        _aEntry[4] += 1
+        _aEntry[5] += _nSecs
+        _aEntry[7][nBucket] += 1
+        if (_nSecs > _aEntry[2]):
+            _aEntry[2] = _nSecs
+        if (_nSecs > _aEntry[6]):
+            _aEntry[6] = _nSecs
+
+
+    # **************************************************************************
+    # reports
+
+    def percentile(self, _aHistogram, _nCalls, _nPercent):
+        # upper bound (in microseconds) of the bucket holding the percentile
+        nRank  = _nCalls * _nPercent / 100.0
+        nCount = 0
+        for nBucket in range(len(_aHistogram)):
+            nCount += _aHistogram[nBucket]
+            if (nCount >= nRank and nCount > 0):
+                return (1 << nBucket)
+        return 0
+
+
+    def rows(self, _bWindow):
+        # [name, calls, calls per sec, mean us, p50 us, p99 us, max us], slowest first
+        nOffset = 4 if (_bWindow) else 0
+        nSecs   = time.time() - (self.m_nWinStart if (_bWindow) else self.m_nStart)
+        aRows   = []
+        for sName in self.m_aNames:
+            aEntry = self.m_hEntries[sName]
+            nCalls = aEntry[nOffset]
+            if (nCalls == 0):
+                continue
+            aHistogram = aEntry[nOffset + 3]
+            aRows.append([
+                sName,
+                nCalls,
+                nCalls / nSecs if (nSecs > 0) else 0.0,
+                1000000.0 * aEntry[nOffset + 1] / nCalls,
+                self.percentile(aHistogram, nCalls, 50),
+                self.percentile(aHistogram, nCalls, 99),
+                1000000.0 * aEntry[nOffset + 2]])
+        aRows.sort(key = lambda aRow: -aRow[1] * aRow[3]) # total time
+        return aRows
+
+
+    def reset_window(self):
+        for aEntry in self.m_hEntries.values():
+            aEntry[4] = 0
+            aEntry[5] = 0.0
+            aEntry[6] = 0.0
+            aEntry[7] = [0] * Profiler.m_nBuckets
+        self.m_nWinStart = time.time()
+
+
+    def on_stats_query(self, _aMessage = None):
+        # one message per timed method: name, calls, mean, p50, p99 and max (us)
+        aMessages = []
+        for aRow in self.rows(False):
+            aMessages.append(['/debug/stats', [aRow[0], aRow[1], float(aRow[3]), aRow[4], aRow[5], float(aRow[6])]])
+        self.m_oScript.m_oOscServer.sendBundle(aMessages)
+
+
+    # called on every tick (update_display)
+    def tick(self):
+        if (self.m_nDumpSecs <= 0):
+            return
+        if (time.time() - self.m_nWinStart >= self.m_nDumpSecs):
+            self.dump()
+
+
+    def dump(self):
+        sPath  = os.path.join(self.m_sRootPath, 'profile.txt')
+        aLines = []
+        aLines.append('AaMakro5oul profile, %s' % (time.strftime('%Y-%m-%d %H:%M:%S')))
+        for (sTitle, bWindow) in [('last %.0f s' % (time.time() - self.m_nWinStart), True), ('session', False)]:
+            aLines.append('')
+            aLines.append('%-60s %10s %9s %10s %8s %8s %10s' % (sTitle, 'calls', 'calls/s', 'mean us', 'p50 us', 'p99 us', 'max us'))
+            for aRow in self.rows(bWindow):
+                aLines.append('%-60s %10d %9.1f %10.1f %8d %8d %10.1f' % tuple(aRow))
+        try:
+            oFile = open(sPath, 'w')
+            oFile.write('\n'.join(aLines) + '\n')
+            oFile.close()
+        except IOError, oError:
+            self.m_oScript.log('> Profiler: could not write "%s": %s', sPath, str(oError))
+        self.reset_window()
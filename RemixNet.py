@@ -46,7 +46,11 @@ forward to seeing what will come next.
     packaging the script with a modified version of the socket module allows it to run on osx.
 
 """
+import re
 import sys
+import time
+import errno
+import struct
 import socket
 import OSC
 
@@ -59,14 +63,22 @@ class OSCClient:
     a simple method for sending OSC messages
     """
 
-    def __init__(self, udpClient=None, address=None, msg=None):
+    def __init__(self, udpClient=None, address=None, msg=None, encoder=None):
         """
         Initializes a RemixNet.OSCClient object. You can pass
         in a default address or default msg here. This is useful
         for making 'beacon' clients that you can attach as
         listeners on Live object attributes.
+
+        The encoder (an OSC.OSCEncoder) keeps the compiled message
+        templates, pass one in to share its cache.
         """
 
+        if encoder is not None:
+            self.encoder = encoder
+        else:
+            self.encoder = OSC.OSCEncoder()
+
         if address is not None:
             self.address = address
 
@@ -105,6 +117,17 @@ class OSCClient:
             # SHOULD RAISE EXCEPTION
             return
 
+        data = self.encode(address, msg)
+        if data:
+            # Done processing, send it off to its destination
+            self.udpClient.send(data)
+
+    def encode(self, address=None, msg=None):
+        """
+        Constructs the OSC packet of send() without sending it. Returns
+        None if the address or the msg payload can not be encoded.
+        """
+
 
         # If neither address or msg, we have nothing to do.
 
@@ -127,38 +150,72 @@ class OSCClient:
                 return
             address = self.address
 
-        oscMessage = OSC.OSCMessage()
-        oscMessage.setAddress(address)
-
         # We need to check for msgs that are actually
         # instance methods here and do something with
         # them...
         # if type(msg) == instance method:
         # blahblah
 
-        # By default OSC.py doesn't look like it'll process tuples
-        # and pack them. So, we help it along by breaking them up
-        # and appending each entity.
+        # The encoder packs tuples and lists as one argument
+        # per entity, we only check that it can encode them.
 
         if (type(msg) in (str,int,float)):
-            oscMessage.append(msg)
+            args = (msg,)
         elif type(msg) in (list,tuple):
             for m in msg:
                 if (type(m) not in (str,int,float)):
                     # SHOULD RAISE EXCEPTION
                     return
-                oscMessage.append(m)
+            args = msg
         elif msg == None:
-            self.udpClient.send(oscMessage.getBinary())
-            return
+            args = ()
         else:
             # SHOULD RAISE EXCEPTION
             # Likely, method or instancemethod object. We should
             # actually execute the code here and send the result,
             # but for now we'll just return.
             return
-        # Done processing, send it off to its destination
-        self.udpClient.send(oscMessage.getBinary())
+        return self.encoder.encodeMessage(address, args)
+
+class OSCTarget:
+
+    def __init__(self, udpClient, prefixes=('',)):
+        """
+        A client of the OSC server: the UDP client to reach it, the
+        address prefixes it subscribes to and the last message sent to
+        it for every address (or /EDIT id). /EDIT messages go to every
+        target, their ids are not addresses. If the client is connected
+        to the TCP server too, everything sent to it (bundles and single
+        messages) goes through that stream, so it arrives in order.
+        """
+        self.udpClient  = udpClient
+        self.stream     = None
+        self.prefixes   = tuple(prefixes)
+        self.sentCache  = {}
+        self.suppressed = 0
+
+    def accepts(self, address):
+        return address.startswith(self.prefixes) or address == '/EDIT'
+
+    def isDuplicate(self, key, data):
+        """
+        Returns True if data is what was last sent with this key,
+        otherwise remembers it as the last one sent.
+        """
+        if self.sentCache.get(key) == data:
+            self.suppressed += 1
+            return True
+        self.sentCache[key] = data
+        return False
+
+    def send(self, data):
+        if self.hasStream():
+            self.stream.send(data)
+        else:
+            self.udpClient.send(data)
+
+    def hasStream(self):
+        return self.stream is not None and not self.stream.closed
 
 class OSCServer:
 
@@ -199,7 +256,8 @@ class OSCServer:
 
         It should be noted that performance even with the added ops isn't that bad.
         On my dualcore system I was able to process about 1380 OSC callbacks per
-        second. Or, ~86 callbacks per 60ms tick.
+        second. Or, ~86 callbacks per 60ms tick. Current numbers (callbacks per
+        second, feedback latency, bytes per action) come from tools/bench_e2e.py.
         """
         self.parent = parent
         self.src_host = src
@@ -208,15 +266,52 @@ class OSCServer:
         self.udpClient = UDPClient(parent, dst, dstPort)
         self.udpClient.open()
 
-        self.oscClient = OSCClient(self.udpClient,None, None)
+        # Messages and bundles share the same compiled templates
+        self.oscEncoder = OSC.OSCEncoder()
+        self.oscClient  = OSCClient(self.udpClient, None, None, self.oscEncoder)
+
+        # Outgoing bundles are split in datagrams of this size at most
+        self.maxDatagramSize = 8192
+        self.sentBundles     = 0
+        self.sentDatagrams   = 0
+
+        # Every target gets the messages of its prefixes, encoded once.
+        # Identical messages are not sent again while dedup is on.
+        self.targets     = [OSCTarget(self.udpClient)]
+        self.dedup       = False
+
+        # Messages sent inside a batch (a tick or a listener callback)
+        # are queued and sent as bundles when the outermost batch ends,
+        # except those starting with an immediate prefix
+        self.queueing    = False
+        self.batchDepth  = 0
+        self.queue       = []
+        self.immediate   = ()
+
+        # Messages sent inside a snapshot (startup, session reset) are
+        # merged, the last one sent to an address (or /EDIT element and
+        # attributes) wins, and sent together when the outermost ends
+        self.snapshotDepth    = 0
+        self.snapshot         = []  # [address, msg] or None (overwritten)
+        self.snapshotIdx      = {}  # snapshot key -> index in snapshot
+        self.snapshotGathered = 0
+        self.snapshotSent     = 0
 
         # Create our callback manager and register some utility
         # callbacks to show how its done.
 
         self.callbackManager = OSC.CallbackManager()
+        self.callbackManager.setReceiver(self.invalidateSent)
 
         self.udpServer = UDPServer(parent, self.src_host, self.src_port)
         self.udpServer.setCallbackManager(self.callbackManager)
+        self.udpServer.setPeerListener(self.invalidatePeer)
+
+        # Optional, see openStream()
+        self.tcpServer = None
+
+        # Optional, see setRecorder()
+        self.recorder  = None
 
         self.try_server()
         self.retry = 1
@@ -248,35 +343,350 @@ class OSCServer:
 
         self.oscClient.send('/remix/time', time.time())
 
-    def sendBundle(self, messages):
-        if len(messages) > 99:
-            self.doSendBundle(messages[0:99])
-            self.doSendBundle(messages[99:])
-        else:
-            self.doSendBundle(messages)
+    def setMaxDatagramSize(self, size):
+        """
+        Sets the byte budget of the bundles sent by sendBundle. Use 1472
+        (a 1500 bytes ethernet MTU minus the IP and UDP headers) to avoid
+        fragmentation over the network, localhost takes much bigger ones.
+        """
+        if size > 0:
+            self.maxDatagramSize = size
 
 
-    def doSendBundle(self, messages):
+    def setQueueing(self, queueing, immediate=()):
+        """
+        Turns on or off the queueing of the messages sent inside a
+        batch. Messages whose address starts with one of the immediate
+        prefixes are always sent right away.
+        """
+        self.queueing  = queueing
+        self.immediate = tuple(immediate)
+
+
+    def beginBatch(self):
+        """
+        Starts a batch, batches can be nested.
+        """
+        self.batchDepth += 1
+
+
+    def endBatch(self):
+        """
+        Ends a batch, the queue is flushed when the outermost ends.
+        """
+        self.batchDepth -= 1
+        if self.batchDepth <= 0:
+            self.batchDepth = 0
+            self.flushQueue()
+
+
+    def beginSnapshot(self):
+        """
+        Starts a snapshot, snapshots can be nested.
+        """
+        self.snapshotDepth += 1
+
+
+    def endSnapshot(self):
+        """
+        Ends a snapshot, when the outermost ends the merged messages are
+        sent as bundles (queued if inside a batch). Returns the number
+        of messages sent.
+        """
+        self.snapshotDepth -= 1
+        if self.snapshotDepth > 0:
+            return 0
+
+        self.snapshotDepth = 0
+        messages = [message for message in self.snapshot if message is not None]
+        self.snapshot    = []
+        self.snapshotIdx = {}
+        self.snapshotSent += len(messages)
         if len(messages) > 0:
-            bundle = OSC.OSCMessage()
-            bundle.setAddress("")
-            bundle.append("#bundle")
-            bundle.append(0)
-            bundle.append(0)
+            self.sendBundle(messages)
+        return len(messages)
 
-            for message in messages:
-                msg = OSC.OSCMessage()
-                msg.setAddress(message[0])
 
-                if type (message[1]) == type([]):
-                    for arg in message[1]:
-                        msg.append(arg)
-                else:
-                    msg.append(message[1])
+    def addSnapshot(self, address, msg):
+        if type(msg) == type(()):
+            msg = list(msg)
+        self.snapshotGathered += 1
+
+        key = self.snapshotKey(address, msg)
+        idx = self.snapshotIdx.get(key)
+        if idx is not None:
+            self.snapshot[idx] = None # the newer goes last
+        self.snapshotIdx[key] = len(self.snapshot)
+        self.snapshot.append([address, msg])
 
-                bundle.append(msg.getBinary(), 'b')
 
-            self.sendUDP(bundle.message)
+    def snapshotKey(self, address, msg):
+        """
+        The address, or for /EDIT messages the element id and the names
+        of the attributes changed: '{"label": ..}' and '{"color": ..}'
+        of an element do not replace each other. The messages with several
+        arguments to multi-toggles and multi-faders carry the element index
+        first: '/seq/beat/bit/0 [3, 0.0]' and '/seq/beat/bit/0 [4, 0.0]'
+        do not replace each other either.
+        """
+        if type(msg) == type([]) and len(msg) > 1:
+            if address == '/EDIT':
+                return (address, msg[0], tuple(sorted(re.findall(r'"([^"]+)"\s*:', str(msg[1])))))
+            return (address, msg[0])
+        return address
+
+
+    def flushQueue(self):
+        """
+        Sends the queued messages, a single one as a plain message and
+        several of them as bundles. Returns the number of datagrams sent.
+        """
+        if len(self.queue) == 0:
+            return 0
+
+        messages   = self.queue
+        self.queue = []
+
+        if len(messages) == 1:
+            self.sendOSC(messages[0][0], messages[0][1])
+            return 1
+        return self.sendBundle(messages)
+
+
+    def isQueued(self, address):
+        return self.batchDepth > 0 and self.queueing and not address.startswith(self.immediate)
+
+
+    def addTarget(self, dst, dstPort, prefixes=('',)):
+        """
+        Adds a client that gets the messages whose address starts with
+        one of the prefixes, all of them by default.
+        """
+        udpClient = UDPClient(self.parent, dst, dstPort)
+        udpClient.open()
+        udpClient.recorder = self.recorder
+        target = OSCTarget(udpClient, prefixes)
+        self.targets.append(target)
+        return target
+
+
+    def setRecorder(self, recorder):
+        """
+        Records the datagrams received and sent over UDP with the
+        given TrafficRecorder, None stops recording.
+        """
+        if self.recorder and self.recorder is not recorder:
+            self.recorder.close()
+        self.recorder = recorder
+        self.udpServer.recorder = recorder
+        for target in self.targets:
+            target.udpClient.recorder = recorder
+
+
+    def setDefaultPrefixes(self, prefixes):
+        """
+        Sets the prefixes of the default client (dst:dstPort).
+        """
+        self.targets[0].prefixes = tuple(prefixes)
+
+
+    def openStream(self, src, srcPort, framing='slip'):
+        """
+        Starts a TCP server, a client gets everything sent to the target
+        of its host through the stream, the bundles whatever their size.
+        A client of a host without target gets nothing. Framing is 'slip'
+        or 'length'.
+        """
+        self.tcpServer = TCPServer(self.parent, src, srcPort, framing)
+        self.tcpServer.setCallbackManager(self.callbackManager)
+        self.tcpServer.setConnectionListener(self.streamChanged)
+        self.tcpServer.bind()
+
+
+    def streamChanged(self, connection):
+        """
+        Attaches a new TCP connection to its targets, or detaches it
+        when it is closed.
+        """
+        if connection.closed:
+            for target in self.targets:
+                if target.stream is connection:
+                    target.stream = None
+            return
+
+        # only the targets of its host, another host can not take them over
+        targets = [target for target in self.targets if target.udpClient.dst == connection.addr[0]]
+        for target in targets:
+            target.stream = connection
+            target.sentCache.clear()
+
+
+    def setDedup(self, dedup):
+        """
+        Turns on or off the suppression of messages identical to the
+        last one sent to the same address.
+        """
+        self.dedup = dedup
+        self.invalidateSentCache()
+
+
+    def sentKey(self, address, msg):
+        """
+        The cache key of a message: its address, or the element id
+        for /EDIT messages, all the GUI elements share that address.
+        """
+        if address == '/EDIT' and type(msg) in (list,tuple) and len(msg) > 0:
+            return (address, msg[0])
+        return address
+
+
+    def invalidateSent(self, address):
+        """
+        Forgets what was last sent to an address. Called for every
+        received message: the GUI has changed that control by itself,
+        so the next value must be sent even if it was already sent.
+        """
+        for target in self.targets:
+            if address in target.sentCache:
+                del target.sentCache[address]
+
+
+    def invalidateSentCache(self):
+        """
+        Forgets everything sent, i.e. when the GUI (re)connects or the
+        session is reset and the GUI needs the whole state again.
+        """
+        for target in self.targets:
+            target.sentCache.clear()
+
+
+    def invalidatePeer(self, addr):
+        """
+        A new client is sending to us: forgets what was sent to the
+        targets in its host, or to all of them if none is there.
+        """
+        targets = [target for target in self.targets if target.udpClient.dst == addr[0]]
+        if len(targets) == 0:
+            targets = self.targets
+        for target in targets:
+            target.sentCache.clear()
+
+
+    def getSuppressed(self):
+        return sum([target.suppressed for target in self.targets])
+
+
+    def encodeMessages(self, messages):
+        """
+        Encodes [address, value or list of values] messages as
+        [address, cache key, bundle element].
+        """
+        encoder  = self.oscEncoder
+        elements = []
+
+        for message in messages:
+            if type (message[1]) == type([]):
+                element = encoder.encodeElement(message[0], message[1])
+            else:
+                element = encoder.encodeElement(message[0], (message[1],))
+            elements.append([message[0], self.sentKey(message[0], message[1]), element])
+
+        return elements
+
+
+    def targetElements(self, target, elements):
+        """
+        The bundle elements for a target, leaving out the duplicates
+        if dedup is on (the cache holds messages, without their size).
+        """
+        if self.dedup:
+            return [element[2] for element in elements if target.accepts(element[0]) and not target.isDuplicate(element[1], element[2][4:])]
+        return [element[2] for element in elements if target.accepts(element[0])]
+
+
+    def sendBundle(self, messages, when=None):
+        """
+        Sends the messages as OSC bundles. If 'when' is given (seconds
+        since 1970, like time.time()) the receiver should execute the
+        bundles at that time, otherwise immediately.
+
+        Every datagram is filled with messages up to maxDatagramSize
+        bytes and built with a single join, a message that does not fit
+        alone is sent alone. The messages are encoded once and every
+        target gets its own. Returns the number of datagrams sent.
+
+        Inside a batch the messages without a timetag are queued instead,
+        inside a snapshot they are merged into it.
+        """
+        if when is None and self.snapshotDepth > 0:
+            for message in messages:
+                self.addSnapshot(message[0], message[1])
+            return 0
+
+        if when is None and self.batchDepth > 0 and self.queueing:
+            immediate = []
+            for message in messages:
+                if message[0].startswith(self.immediate):
+                    immediate.append(message)
+                else:
+                    self.queue.append(message)
+            messages = immediate
+
+        if len(messages) == 0:
+            return 0
+
+        elements = self.encodeMessages(messages)
+        header   = self.oscEncoder.bundleHeader(when)
+        budget   = self.maxDatagramSize - len(header)
+        total    = 0
+
+        for target in self.targets:
+            if target.hasStream():
+                # no datagram limits in a stream
+                targetElements = self.targetElements(target, elements)
+                if len(targetElements) > 0:
+                    target.stream.send(''.join([header] + targetElements))
+                    total += 1
+                continue
+
+            datagram = [header]
+            size     = 0
+            count    = 0
+
+            for element in self.targetElements(target, elements):
+                if size + len(element) > budget and size > 0:
+                    target.send(''.join(datagram))
+                    count   += 1
+                    datagram = [header]
+                    size     = 0
+
+                datagram.append(element)
+                size += len(element)
+
+            if size > 0:
+                target.send(''.join(datagram))
+                count += 1
+            total += count
+
+        if total > 0:
+            self.sentBundles   += 1
+            self.sentDatagrams += total
+        return total
+
+
+    def doSendBundle(self, messages, when=None):
+        """
+        Sends all the messages in a single bundle, whatever its size.
+        """
+        elements = self.encodeMessages(messages)
+        for target in self.targets:
+            targetElements = self.targetElements(target, elements)
+            if len(targetElements) == 0:
+                continue
+            if target.hasStream():
+                target.stream.send(self.oscEncoder.encodeBundle(targetElements, when))
+            else:
+                target.send(self.oscEncoder.encodeBundle(targetElements, when))
 
 
     def sendOSC(self, address=None, msg=None):
@@ -286,7 +696,26 @@ class OSCServer:
         """
 
         if address and msg != None:
-            self.oscClient.send(address, msg)
+            if self.snapshotDepth > 0:
+                self.addSnapshot(address, msg)
+                return
+
+            if self.isQueued(address):
+                if type(msg) == type(()):
+                    msg = list(msg)
+                self.queue.append([address, msg])
+                return
+
+            data = self.oscClient.encode(address, msg)
+            if not data:
+                return
+
+            key = self.sentKey(address, msg)
+            for target in self.targets:
+                if target.accepts(address):
+                    if self.dedup and target.isDuplicate(key, data):
+                        continue
+                    target.send(data)
 
 
     def sendUDP(self, data):
@@ -379,9 +808,52 @@ class OSCServer:
           One final note -- I make no promises as to the latency of triggers recieved.
           I haven't tested that at all yet. Since the window is 60ms, don't get
           your hopes up about MIDI over OSC.
+
+        The TCP clients (if any) are served first, the UDP drain then
+        dispatches their messages along with its own. The buffered TCP
+        output is written here too.
         """
+        if self.tcpServer:
+            self.tcpServer.process()
+
         if self.udpServer.is_bound():
             self.udpServer.processIncomingUDP()
+        elif len(self.callbackManager.pending) > 0:
+            self.callbackManager.handleBatch()
+
+        # once per tick, a crash loses one tick of traffic at most
+        if self.recorder:
+            self.recorder.flush()
+
+
+    def stats(self):
+        """
+        Returns the counters of the incoming and outgoing traffic.
+        """
+        stats = self.callbackManager.stats()
+        stats['skippedPackets'] = self.udpServer.skippedPackets
+        stats['skippedBytes']   = self.udpServer.skippedBytes
+        stats['receivedPackets'] = self.udpServer.receivedPackets
+        stats['receivedBytes']  = self.udpServer.receivedBytes
+        stats['truncated']      = self.udpServer.truncated
+        stats['overflowRisk']   = self.udpServer.overflowRisk
+        stats['sentBundles']    = self.sentBundles
+        stats['sentDatagrams']  = self.sentDatagrams
+        stats['suppressed']     = self.getSuppressed()
+        stats['recordedPackets'] = self.recorder.packets if self.recorder else 0
+        stats['recordedBytes']  = self.recorder.bytes if self.recorder else 0
+        stats['snapshotGathered'] = self.snapshotGathered
+        stats['snapshotSent']   = self.snapshotSent
+        return stats
+
+
+    def processDeferredBundles(self):
+        """
+        Dispatches the received bundles whose timetag is due. Call it on
+        every tick: a bundle runs on the tick closest to its timetag, so
+        the polling jitter only delays its delivery, not its execution.
+        """
+        return self.callbackManager.processDeferred()
 
 
     def bind(self):
@@ -393,8 +865,13 @@ class OSCServer:
         """If we get shutdown by our parent, close the socket we had open"""
         if self.udpServer:
             self.udpServer.close()
-        if self.udpClient:
-            self.udpClient.close()
+        if self.tcpServer:
+            self.tcpServer.close()
+        for target in self.targets:
+            if target.udpClient:
+                target.udpClient.close()
+        if self.recorder:
+            self.recorder.close()
 
 
 class UDPClient:
@@ -412,6 +889,7 @@ class UDPClient:
         """
         self.parent = parent
         self._outgoing = 1
+        self.recorder = None
 
         if dst:
             self.dst = dst
@@ -491,6 +969,8 @@ class UDPClient:
         """
         # Only send if we have data.
         if not data == '':
+            if self.recorder:
+                self.recorder.record(TrafficRecorder.OUT, self.dstPort, data)
             try:
                 self.UDPSock.sendto(data,self.addr)
             except:
@@ -524,7 +1004,7 @@ class UDPServer:
         """
         Sets up the UDPServer component of this package. By default
         we listen to all interfaces on port 9000 for incoming requests
-        with a 4096 byte buffer.
+        of 8192 bytes at most, received into a single preallocated buffer.
 
         You can modify these settings by using the methods setport() and setHost()
         """
@@ -539,10 +1019,31 @@ class UDPServer:
         else:
             self.src = ''
 
-        self.buf = 4096
         self.bound = 0
         self.UDPSock = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
 
+        # One more byte than the biggest datagram, to detect truncation
+        self.maxDatagram = 8192
+        self.buffer      = bytearray(self.maxDatagram + 1)
+        self.rcvBufSize  = self.UDPSock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+        self.receivedPackets = 0
+        self.receivedBytes   = 0
+        self.truncated       = 0
+        self.overflowRisk    = 0 # ticks that drained more than half the socket buffer
+
+        # The addresses of the clients heard of
+        self.peers = {}
+        self.peerListener = None
+
+        # Datagrams starting with these bytes are dropped undecoded
+        self.dropPrefixes   = ()
+        self.skippedPackets = 0
+        self.skippedBytes   = 0
+
+        # Optional, see OSCServer.setRecorder()
+        self.recorder = None
+
 
     def set_network(self, ip, port):
         self.srcPort = port
@@ -562,27 +1063,99 @@ class UDPServer:
         You can specify a callback manager using the UDPServer.setCallbackManager()
         function and passing it a populated OSC.Manager object.
         """
+        newPeers  = []
+        buffer    = self.buffer
+        nBytes    = 0
         try:
             # You'd think this while 1 loop would get stuck and block the
             # program. But. As it turns out. It doesn't.
             while 1:
-                self.data,self.addr = self.UDPSock.recvfrom(self.buf)
-                if not self.data:
+                size,self.addr = self.UDPSock.recvfrom_into(buffer)
+                if not size:
                 # No data buffered this round!
-                    return
+                    break
                 else:
-                    #Live.Base.log("-> Rx: '{0}'".format(self.data))
-                    if self.data != '\n':
+                    nBytes += size
+                    #Live.Base.log("-> Rx: '{0}'".format(buffer[:size]))
+                    if self.recorder:
+                        # everything that arrived, even what is dropped below
+                        self.recorder.record(TrafficRecorder.IN, self.addr[1], buffer, size)
+                    if size > self.maxDatagram:
+                        # Bigger than the buffer, the rest is lost
+                        self.truncated += 1
+                    elif buffer.startswith(self.dropPrefixes, 0, size):
+                        # Nobody in Live handles these, do not decode them
+                        self.skippedPackets += 1
+                        self.skippedBytes   += size
+                    elif size != 1 or buffer[0] != 10: # '\n'
                         # Oh snap, we have data!
                         # If you want to write your own special handlers for dealing
-                        # with incoming data, this is the place. self.data contains
-                        # the raw data sent to our UDP socket.
+                        # with incoming data, this is the place. The buffer holds
+                        # the raw data sent to our UDP socket, decoded right away
+                        # since the next datagram overwrites it.
+                        self.receivedPackets += 1
+                        self.receivedBytes   += size
                         if self.callbackManager:
-                            self.callbackManager.handle(self.data)
+                            self.callbackManager.receive(buffer, size)
+                        if self.addr not in self.peers:
+                            self.peers[self.addr] = True
+                            newPeers.append(self.addr)
 
         except Exception, e:
             pass
 
+        # The datagrams wait in the socket buffer between two ticks, if
+        # they fill it up the newest ones are lost without notice
+        if nBytes > self.rcvBufSize / 2:
+            self.overflowRisk += 1
+            self.parent.log('> UDPServer - %d bytes received in a tick, the receive buffer (%d bytes) may overflow' % (nBytes, self.rcvBufSize))
+
+        # A new client (or the same one restarted on another port)
+        # knows nothing about the state sent to the previous one
+        for addr in newPeers:
+            if self.peerListener:
+                self.peerListener(addr)
+        if len(self.peers) >= 64:
+            self.peers.clear()
+
+        # The whole drain is dispatched at once, so the callback manager
+        # can coalesce the fader messages that arrived in this tick,
+        # it also has to dispatch what it could not in the last tick.
+        if self.callbackManager and len(self.callbackManager.pending) > 0:
+            self.callbackManager.handleBatch()
+
+    def setReceiveBuffer(self, maxDatagram, rcvBufSize=0):
+        """
+        Sets the size of the biggest datagram received, bigger ones are
+        dropped as truncated, and the socket receive buffer (SO_RCVBUF)
+        holding the datagrams that arrive between two ticks, 0 leaves
+        the system default.
+        """
+        if maxDatagram > 0:
+            self.maxDatagram = maxDatagram
+            self.buffer      = bytearray(maxDatagram + 1)
+        if rcvBufSize > 0:
+            try:
+                self.UDPSock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvBufSize)
+            except:
+                self.parent.log('> UDPServer - Could not set the receive buffer to %d bytes' % (rcvBufSize))
+        self.rcvBufSize = self.UDPSock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+    def setDropPrefixes(self, prefixes):
+        """
+        Sets the raw byte prefixes of the datagrams dropped before
+        decoding, i.e. OSC addresses handled by another program.
+        Bundles start with '#bundle' and are never dropped.
+        """
+        self.dropPrefixes = tuple(prefixes)
+
+    def setPeerListener(self, peerListener):
+        """
+        Sets a function called with the (host, port) of a new client
+        address when datagrams start arriving from it.
+        """
+        self.peerListener = peerListener
+
     def setCallbackManager(self, callbackManager):
         """
         You can specify a callbackManager here as derived from OSC.py.
@@ -615,3 +1188,296 @@ class UDPServer:
         """
         # Closing time!
         self.UDPSock.close()
+
+
+class TCPConnection:
+    """
+    RemixNet.TCPConnection
+
+    A client connected to the TCPServer. OSC packets are framed in the
+    stream with SLIP (OSC 1.1, 'slip') or with a 32 bit big-endian size
+    (OSC 1.0, 'length'). The socket is non-blocking: what can not be
+    written now is buffered and written by later calls to flush().
+    """
+
+    END     = '\xc0'
+    ESC     = '\xdb'
+    ESC_END = '\xdb\xdc'
+    ESC_ESC = '\xdb\xdd'
+
+    def __init__(self, sock, addr, framing='slip', maxBuffer=4194304):
+        self.sock      = sock
+        self.addr      = addr
+        self.framing   = framing
+        self.maxBuffer = maxBuffer # bytes, beyond this the client is too slow
+        self.incoming  = ''
+        self.outgoing  = []
+        self.pending   = 0         # bytes in outgoing
+        self.closed    = False
+
+        self.sock.setblocking(0)
+
+    def frame(self, data):
+        """
+        Frames an OSC packet for the stream.
+        """
+        if self.framing == 'slip':
+            data = data.replace(self.ESC, self.ESC_ESC).replace(self.END, self.ESC_END)
+            return ''.join([self.END, data, self.END])
+        return ''.join([OSC.INT_STRUCT.pack(len(data)), data])
+
+    def unframe(self):
+        """
+        Returns the complete OSC packets received, the incomplete one
+        is kept until the rest of it arrives.
+        """
+        packets = []
+        if self.framing == 'slip':
+            frames        = self.incoming.split(self.END)
+            self.incoming = frames.pop()
+            for frame in frames:
+                if len(frame) > 0:
+                    packets.append(frame.replace(self.ESC_END, self.END).replace(self.ESC_ESC, self.ESC))
+        else:
+            offset = 0
+            while len(self.incoming) - offset >= 4:
+                size = OSC.INT_STRUCT.unpack_from(self.incoming, offset)[0]
+                if size < 0 or size > self.maxBuffer:
+                    # not a size, the stream can not be resynchronized
+                    self.incoming = ''
+                    self.close()
+                    return packets
+                if len(self.incoming) - offset - 4 < size:
+                    break
+                packets.append(self.incoming[offset + 4:offset + 4 + size])
+                offset += 4 + size
+            self.incoming = self.incoming[offset:]
+
+        if len(self.incoming) > self.maxBuffer:
+            self.close()
+        return packets
+
+    def receive(self):
+        """
+        Reads everything available, returns the complete OSC packets.
+        """
+        try:
+            while 1:
+                data = self.sock.recv(65536)
+                if not data:
+                    # The client closed the connection
+                    self.close()
+                    break
+                self.incoming += data
+        except socket.error, e:
+            if e.args[0] not in (errno.EWOULDBLOCK, errno.EAGAIN):
+                self.close()
+        return self.unframe()
+
+    def send(self, data):
+        """
+        Sends a framed OSC packet, buffering what can not be written now.
+        """
+        if self.closed:
+            return
+        frame = self.frame(data)
+        self.outgoing.append(frame)
+        self.pending += len(frame)
+        if self.pending > self.maxBuffer:
+            self.close()
+        else:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes as much of the buffered data as the socket takes now.
+        """
+        if self.closed or self.pending == 0:
+            return
+        data = ''.join(self.outgoing)
+        try:
+            sent = self.sock.send(data)
+        except socket.error, e:
+            if e.args[0] in (errno.EWOULDBLOCK, errno.EAGAIN):
+                sent = 0
+            else:
+                self.close()
+                return
+        data          = data[sent:]
+        self.outgoing = [data] if data else []
+        self.pending  = len(data)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            try:
+                self.sock.close()
+            except:
+                pass
+
+
+class TCPServer:
+    """
+    RemixNet.TCPServer
+
+    A non-blocking TCP server next to the UDPServer, for clients that
+    want the big bundles (i.e. a full state refresh) in a reliable
+    stream. The OSC packets received go to the same callback manager.
+    Everything is done from process(), called on every tick.
+    """
+
+    def __init__(self, parent, src, srcPort, framing='slip'):
+        self.parent      = parent
+        self.src         = src or ''
+        self.srcPort     = srcPort
+        self.framing     = framing
+        self.connections = []
+        self.bound       = 0
+        self.callbackManager = None
+        self.connectionListener = None
+
+        self.TCPSock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.TCPSock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+    def bind(self):
+        try:
+            self.TCPSock.bind((self.src, self.srcPort))
+            self.TCPSock.listen(4)
+            self.TCPSock.setblocking(0)
+            self.bound = 1
+        except:
+            self.bound = 0
+            self.parent.log('> TCPServer - Could not listen on %s:%d' % (self.src, self.srcPort))
+
+    def setCallbackManager(self, callbackManager):
+        self.callbackManager = callbackManager
+
+    def setConnectionListener(self, connectionListener):
+        """
+        Sets a function called with the connection whenever a client
+        connects or disconnects (check connection.closed).
+        """
+        self.connectionListener = connectionListener
+
+    def process(self):
+        """
+        Accepts the new clients, hands the complete OSC packets received
+        to the callback manager and writes the buffered outgoing data.
+        """
+        if not self.bound:
+            return
+
+        try:
+            while 1:
+                sock, addr = self.TCPSock.accept()
+                connection = TCPConnection(sock, addr, self.framing)
+                self.connections.append(connection)
+                self.parent.log('> TCPServer - %s:%d connected' % addr)
+                if self.connectionListener:
+                    self.connectionListener(connection)
+        except socket.error:
+            pass
+
+        for connection in self.connections:
+            for packet in connection.receive():
+                if self.callbackManager:
+                    self.callbackManager.receive(packet)
+            connection.flush()
+
+        self.removeClosed()
+
+    def removeClosed(self):
+        closed = [connection for connection in self.connections if connection.closed]
+        for connection in closed:
+            self.connections.remove(connection)
+            self.parent.log('> TCPServer - %s:%d disconnected' % connection.addr)
+            if self.connectionListener:
+                self.connectionListener(connection)
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+        self.connections = []
+        self.TCPSock.close()
+
+
+class TrafficRecorder:
+    """
+    RemixNet.TrafficRecorder
+
+    Appends the raw UDP datagrams received and sent to a binary file, to
+    replay the traffic of a set afterwards (see tools/replay_osc.py).
+    The file starts with MAGIC, then every datagram is a RECORD header
+    (time in seconds, direction, peer port, size) followed by its bytes.
+    Recording stops when the file reaches maxBytes.
+    """
+
+    MAGIC  = 'AaOSCRec1\n'
+    RECORD = struct.Struct('>dBHI')
+    IN     = 0
+    OUT    = 1
+
+    def __init__(self, parent, fileName, maxBytes=67108864):
+        self.parent   = parent
+        self.fileName = fileName
+        self.maxBytes = maxBytes
+        self.packets  = 0
+        self.bytes    = 0
+        self.file     = None
+        try:
+            self.file = open(fileName, 'ab')
+            self.file.seek(0, 2)
+            if self.file.tell() == 0:
+                self.file.write(TrafficRecorder.MAGIC)
+            self.parent.log('> TrafficRecorder - recording to "%s"' % (fileName))
+        except IOError, e:
+            self.parent.log('> TrafficRecorder - Could not open "%s": %s' % (fileName, str(e)))
+
+    def record(self, direction, port, data, size=None):
+        """
+        Appends a datagram, the first size bytes of data if given
+        (i.e. a receive buffer).
+        """
+        if not self.file:
+            return
+        if size is None:
+            size = len(data)
+        self.file.write(TrafficRecorder.RECORD.pack(time.time(), direction, port, size))
+        self.file.write(buffer(data, 0, size))
+        self.packets += 1
+        self.bytes   += TrafficRecorder.RECORD.size + size
+        if self.bytes >= self.maxBytes:
+            self.parent.log('> TrafficRecorder - "%s" reached %d bytes, recording stopped' % (self.fileName, self.bytes))
+            self.close()
+
+    def flush(self):
+        if self.file:
+            self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def readTraffic(fileName):
+    """
+    Yields the (time, direction, port, data) of the datagrams recorded
+    by a TrafficRecorder, a datagram cut by a crash ends the file.
+    """
+    file = open(fileName, 'rb')
+    try:
+        if file.read(len(TrafficRecorder.MAGIC)) != TrafficRecorder.MAGIC:
+            raise ValueError('"%s" is not a traffic recording' % (fileName))
+        header = TrafficRecorder.RECORD.size
+        while 1:
+            data = file.read(header)
+            if len(data) < header:
+                break
+            when, direction, port, size = TrafficRecorder.RECORD.unpack(data)
+            data = file.read(size)
+            if len(data) < size:
+                break
+            yield (when, direction, port, data)
+    finally:
+        file.close()
@@ -14,6 +14,7 @@
 # ******************************************************************************
 
 from CoreHandler import CoreHandler
+from BaseHandler import send_batch
 
 # ******************************************************************************
 # Scene commands handler
@@ -27,6 +28,7 @@ class SceneCmdHandler(CoreHandler):
         bIgnoreRelease = True
         bLogRxMsgs     = False
         self.config('/scene/cmd', bIgnoreRelease, bLogRxMsgs)
+        self.subscribe(['new_scenes_sel', 'session_reset'])
 
         self.add_callbacks(['duplicate/selected'])
         self.add_callbacks_pref('fire', self.scene_indeces_list())
@@ -86,6 +88,11 @@ class SceneCmdHandler(CoreHandler):
         self.send_bundle(sMsg, aSceneMsgs)
 
 
+    # 'fire/3' -> scene 3, 'selected' is not parsed
+    def parse_route(self, _oRoute):
+        _oRoute.m_nSceneIdxRel = int(_oRoute.m_aParts[1])
+
+
     def handle(self, _aMessage):
         sCmd         = self.m_aParts[0]
         sSceneIdxRel = self.m_aParts[1]
@@ -98,7 +105,7 @@ class SceneCmdHandler(CoreHandler):
             nSceneIdxAbs = self.sel_scene_idx_abs()
 
         else:
-            nSceneIdxAbs = self.scene_idx_abs(int(sSceneIdxRel))
+            nSceneIdxAbs = self.scene_idx_abs(self.m_oRoute.m_nSceneIdxRel)
             if (self.is_scene_available(nSceneIdxAbs) == False):
                 return # unavailable scene, nothing else to do here!
             oScene = self.get_scene(nSceneIdxAbs)
@@ -109,7 +116,7 @@ class SceneCmdHandler(CoreHandler):
             self.alert('> Playing scene %d: %s' % (nSceneIdxAbs + 1, sName))
 
         elif (sCmd == 'duplicate'):
-            self.log('> Duplicating selected scene %d: %s' % (nSceneIdxAbs, sName))
+            self.log('> Duplicating selected scene %d: %s', nSceneIdxAbs, sName)
             self.song().duplicate_scene(nSceneIdxAbs)
 
 
@@ -128,6 +135,7 @@ class SceneCmdHandler(CoreHandler):
             self.add_scene_listeners(nSceneIdxAbs, oScene)
 
 
+    @send_batch
     def on_scenes_change(self):
         self.log('> SceneCmdHandler: scenes changed, updating listeners and GUI')
         self.add_listeners()
@@ -137,6 +145,7 @@ class SceneCmdHandler(CoreHandler):
         self.update_observers('scenes_changed')
 
 
+    @send_batch
     def on_sel_scene_change(self):
         # ClipCmdHandler: update selected clip info
         self.update_observers('new_scene_sel')
@@ -151,6 +160,7 @@ class SceneCmdHandler(CoreHandler):
             self.m_hSceneListeners[_oScene] = fViewCallback
 
 
+    @send_batch
     def on_scene_view_changed(self, _oScene, _nSceneIdxAbs):
         if (self.is_scene_visible(_nSceneIdxAbs)):
             nSceneIdxRel = self.scene_idx_rel(_nSceneIdxAbs)
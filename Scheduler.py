@@ -0,0 +1,194 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+import time
+import heapq
+import traceback
+
+# ******************************************************************************
+# Central scheduler of the module tasks. A task is either timed (due at a wall
+# time, in seconds) or beat aligned (due at a song beat) and is kept in a heap
+# ordered by its deadline, so every tick only looks at the head of the heaps:
+# when nothing is due (the usual case) a tick costs one comparison.
+#
+# Periodic tasks run again after their period (seconds or beats, 0 -> every
+# tick or every beat) for as long as their function returns True, one-shot
+# tasks (no period) run once. A task raising an exception is logged and does
+# not stop the others, it is cancelled after m_nMaxErrors errors in a row.
+# A task running longer than the budget (config.txt: sched_budget_ms) is
+# logged as an overrun.
+# ******************************************************************************
+
+class Task:
+
+    def __init__(self, _sName, _fTask, _nPeriod, _bBeat):
+        self.m_sName     = _sName
+        self.m_fTask     = _fTask
+        self.m_nPeriod   = _nPeriod # None -> one-shot
+        self.m_bBeat     = _bBeat   # due at a song beat, otherwise at a wall time
+        self.m_bActive   = True
+        self.m_nRuns     = 0
+        self.m_nErrors   = 0        # errors in a row
+        self.m_nOverruns = 0
+
+
+class Scheduler:
+
+    m_nMaxErrors = 3
+
+    def __init__(self, _oScript, _nBudgetMs):
+        self.m_oScript   = _oScript
+        self.m_nBudget   = _nBudgetMs / 1000.0
+        self.m_aTimed    = [] # heap of [due time, sequence, task]
+        self.m_aBeats    = [] # heap of [due song beat, sequence, task]
+        self.m_nSeq      = 0
+        self.m_nSongTime = 0  # last song beat seen
+        self.m_nRuns     = 0
+        self.m_nErrors   = 0
+        self.m_nOverruns = 0
+
+
+    # **************************************************************************
+    # tasks
+
+    def add_timed(self, _sName, _fTask, _nDelay = 0.0, _nPeriod = None):
+        """Runs _fTask() in _nDelay seconds (on the next tick if 0)"""
+        oTask = Task(_sName, _fTask, _nPeriod, False)
+        self.push(self.m_aTimed, time.time() + _nDelay, oTask)
+        return oTask
+
+
+    def add_beat(self, _sName, _fTask, _nBeat = None, _nPeriod = None):
+        """Runs _fTask(song time, bar, beat) at the song beat _nBeat (the next beat if None)"""
+        oTask = Task(_sName, _fTask, _nPeriod, True)
+        nBeat = (self.m_nSongTime + 1) if (_nBeat == None) else _nBeat
+        self.push(self.m_aBeats, nBeat, oTask)
+        return oTask
+
+
+    def cancel(self, _oTask):
+        # removed from the heap when it reaches the head
+        _oTask.m_bActive = False
+
+
+    def clear(self):
+        for aEntry in self.m_aTimed + self.m_aBeats:
+            aEntry[2].m_bActive = False
+        self.m_aTimed = []
+        self.m_aBeats = []
+
+
+    def push(self, _aHeap, _nDue, _oTask):
+        self.m_nSeq += 1
+        heapq.heappush(_aHeap, [_nDue, self.m_nSeq, _oTask])
+
+
+    # **************************************************************************
+    # running
+
+    # called on every tick (update_display)
+    def run_timed(self):
+        aHeap = self.m_aTimed
+        if (len(aHeap) == 0):
+            return
+
+        nNow = time.time()
+        if (aHeap[0][0] > nNow):
+            return # nothing due
+
+        # the tasks scheduled while running wait for the next tick
+        aDue = []
+        while (len(aHeap) > 0 and aHeap[0][0] <= nNow):
+            aDue.append(heapq.heappop(aHeap))
+
+        for (nDue, nSeq, oTask) in aDue:
+            if (oTask.m_bActive == False):
+                continue
+            bAgain = self.run(oTask, ())
+            if (bAgain and oTask.m_bActive and oTask.m_nPeriod != None):
+                # keep the pace of the period, but never catch up missed runs
+                self.push(aHeap, max(nDue + oTask.m_nPeriod, nNow), oTask)
+            else:
+                oTask.m_bActive = False
+
+
+    # called when the song beat changes (current_song_time listener)
+    def run_beats(self, _nSongTime, _nSongBar, _nSongBeat):
+        aHeap = self.m_aBeats
+        if (_nSongTime < self.m_nSongTime):
+            # the song jumped back (i.e. stop), keep the distance of the tasks to it
+            nDelta = _nSongTime - self.m_nSongTime
+            for aEntry in aHeap:
+                aEntry[0] += nDelta
+        self.m_nSongTime = _nSongTime
+
+        if (len(aHeap) == 0 or aHeap[0][0] > _nSongTime):
+            return # nothing due
+
+        aDue = []
+        while (len(aHeap) > 0 and aHeap[0][0] <= _nSongTime):
+            aDue.append(heapq.heappop(aHeap))
+
+        aArgs = (_nSongTime, _nSongBar, _nSongBeat)
+        for (nDue, nSeq, oTask) in aDue:
+            if (oTask.m_bActive == False):
+                continue
+            bAgain = self.run(oTask, aArgs)
+            if (bAgain and oTask.m_bActive and oTask.m_nPeriod != None):
+                self.push(aHeap, _nSongTime + max(oTask.m_nPeriod, 1), oTask)
+            else:
+                oTask.m_bActive = False
+
+
+    def run(self, _oTask, _aArgs):
+        """Runs a task isolated from the others, returns if it should run again"""
+        nStart = time.time()
+        try:
+            bAgain = _oTask.m_fTask(*_aArgs)
+            _oTask.m_nErrors = 0
+        except:
+            _oTask.m_nErrors += 1
+            self.m_nErrors   += 1
+            self.log('! Scheduler: task "%s" failed: %s', _oTask.m_sName, traceback.format_exc().strip().replace('\n', ' | '))
+            bAgain = (_oTask.m_nErrors < Scheduler.m_nMaxErrors)
+            if (bAgain == False):
+                self.log('! Scheduler: task "%s" cancelled after %d errors in a row', _oTask.m_sName, _oTask.m_nErrors)
+
+        nSecs = time.time() - nStart
+        _oTask.m_nRuns += 1
+        self.m_nRuns   += 1
+        if (self.m_nBudget > 0 and nSecs > self.m_nBudget):
+            _oTask.m_nOverruns += 1
+            self.m_nOverruns   += 1
+            # the first overrun of a task and then one in a hundred
+            if (_oTask.m_nOverruns % 100 == 1):
+                lLog = (_oTask.m_sName, 1000.0 * nSecs, 1000.0 * self.m_nBudget, _oTask.m_nOverruns, _oTask.m_nRuns)
+                self.log('! Scheduler: task "%s" took %.1f ms (budget %.1f ms), %d overruns in %d runs', *lLog)
+
+        return (bAgain == True)
+
+
+    def stats(self):
+        return {
+            'pending' : len([aEntry for aEntry in self.m_aTimed + self.m_aBeats if aEntry[2].m_bActive]),
+            'runs'    : self.m_nRuns,
+            'errors'  : self.m_nErrors,
+            'overruns': self.m_nOverruns,
+        }
+
+
+    def log(self, _sMessage, *_aArgs):
+        self.m_oScript.log_error(_sMessage, *_aArgs)
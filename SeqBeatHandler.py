@@ -27,6 +27,7 @@ class SeqBeatHandler(CoreHandler):
         bIgnoreRelease = False # False -> do not ignore release!
         bLogRxMsgs     = False
         self.config('/seq/beat', bIgnoreRelease, bLogRxMsgs)
+        self.subscribe(['session_reset', 'new_track_sel', 'new_scene_sel', 'beatgrid_changed', 'duplicate_loop', 'beat_note_selected'])
 
         self.add_callbacks_pref('bit', self.beats_indeces_list())
         self.add_callbacks_pref('vel', self.beats_indeces_list() + [8])
@@ -184,6 +185,11 @@ class SeqBeatHandler(CoreHandler):
         self.send_bundle(sMsg, aNoteInfoMsgs)
 
 
+    # 'bit/3' -> beat column 3, 'tools' is not parsed
+    def parse_route(self, _oRoute):
+        _oRoute.m_nBeat = int(_oRoute.m_aParts[1])
+
+
     def handle(self, _aMessage):
         # get the selected clip slot
         oClipSlot = self.sel_clip_slot()
@@ -195,8 +201,7 @@ class SeqBeatHandler(CoreHandler):
             return # Non-MIDI clip, nothing else to do here!
 
         sCmd  = self.m_aParts[0] # cmd: 'bit', 'vel'
-        sBeat = self.m_aParts[1] # beat (string)
-        nBeat = int(sBeat)       # beat column number (beat 0 -> 0, beat 1 -> 1, ...)
+        nBeat = self.m_oRoute.m_nBeat # beat column number (beat 0 -> 0, beat 1 -> 1, ...)
 
         # handle velocity commands
         if (self.m_aParts[0] == 'vel'):
@@ -301,7 +306,7 @@ class SeqBeatHandler(CoreHandler):
 
 
     def add_note_off_msg(self, _aNoteOffMsg, _nRow, _nCol, _nBeat, _nVel):
-        self.log('> add note off msg: {0}, {1}'.format(_aNoteOffMsg[0], _aNoteOffMsg[1][0]))
+        self.log_debug('> add note off msg: %s, %s', _aNoteOffMsg[0], _aNoteOffMsg[1][0])
 
         self.m_aNoteOffMsgs.append(_aNoteOffMsg)
 
@@ -313,7 +318,7 @@ class SeqBeatHandler(CoreHandler):
 
 
     def del_note_off_msg(self, _sAddress, _nButton, _nRow, _nCol, _nBeat):
-        self.log('> del note off msg: {0}, {1}'.format(_sAddress, _nButton))
+        self.log_debug('> del note off msg: %s, %s', _sAddress, _nButton)
 
         # search the note off message index
         nIndex = 0
@@ -323,7 +328,7 @@ class SeqBeatHandler(CoreHandler):
             nIndex += 1
 
         if (nIndex < len(self.m_aNoteOffMsgs)):
-            self.log('> note found at index: {0}'.format(nIndex))
+            self.log_debug('> note found at index: %d', nIndex)
             self.m_aNoteOffMsgs.pop(nIndex)
 
         # if the note is in the selected index note then
@@ -339,7 +344,7 @@ class SeqBeatHandler(CoreHandler):
                 nIndex += 1
 
             if (nIndex < len(self.m_aVelOffMsgs)):
-                self.log('> vel found at index: {0}'.format(nIndex))
+                self.log_debug('> vel found at index: %d', nIndex)
                 self.m_aVelOffMsgs.pop(nIndex)
 
 
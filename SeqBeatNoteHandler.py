@@ -27,6 +27,7 @@ class SeqBeatNoteHandler(CoreHandler):
         bIgnoreRelease = False # False -> do not ignore release!
         bLogRxMsgs     = False
         self.config('/seq/beat/note', bIgnoreRelease, bLogRxMsgs)
+        self.subscribe(['session_reset', 'new_track_sel', 'new_scene_sel', 'beatgrid_changed'])
 
         self.add_callbacks(['mute', 'solo', 'sel'])
 
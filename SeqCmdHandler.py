@@ -27,6 +27,7 @@ class SeqCmdHandler(CoreHandler):
         bIgnoreRelease = False # False -> do not ignore release!
         bLogRxMsgs     = False
         self.config('/seq/cmd', bIgnoreRelease, bLogRxMsgs)
+        self.subscribe(['session_reset', 'new_track_sel', 'new_scene_sel'])
 
         self.add_callbacks(['left', 'right', 'up', 'down'])
 
@@ -14,6 +14,7 @@
 # ******************************************************************************
 
 from CoreHandler import CoreHandler
+from BaseHandler import send_batch
 
 # ******************************************************************************
 # Session commands handler
@@ -48,13 +49,13 @@ class SessionCmdHandler(CoreHandler):
     def handle(self, _aMessage):
         if (self.m_sCmd == 'trackincr'):
             self.m_nTrackIncr = int(_aMessage[2])
-            self.log('> new track increment: %d' % (self.m_nTrackIncr))
+            self.log('> new track increment: %d', self.m_nTrackIncr)
             self.alert('> new track increment: %d' % (self.m_nTrackIncr))
             return # nothing else to do here
 
         elif (self.m_sCmd == 'sceneincr'):
             self.m_nSceneIncr = int(_aMessage[2])
-            self.log('> new scene increment: %d' % (self.m_nSceneIncr))
+            self.log('> new scene increment: %d', self.m_nSceneIncr)
             self.alert('> new scene increment: %d' % (self.m_nSceneIncr))
             return # nothing else to do here
 
@@ -65,7 +66,14 @@ class SessionCmdHandler(CoreHandler):
             # TrackVolHandler : update track volumes
             # SceneClipHandler: update scene launch buttons
             self.alert('> %s reset' % (self.m_sProductName))
-            self.update_observers('session_reset')
+            # the GUI needs the whole state again, not only the changes,
+            # the modules reset it in a single snapshot
+            self.m_oOscServer.invalidateSentCache()
+            self.m_oOscServer.beginSnapshot()
+            try:
+                self.update_observers('session_reset')
+            finally:
+                self.m_oOscServer.endSnapshot()
 
         elif (self.m_sCmd == 'left'):
             if (self.gui_track_offset() - self.m_nTrackIncr >= 0):
@@ -138,6 +146,7 @@ class SessionCmdHandler(CoreHandler):
         if (self.song().session_record_has_listener(self.on_session_record_change) != 1):
             self.song().add_session_record_listener(self.on_session_record_change)
 
+    @send_batch
     def on_session_record_change(self):
         bSessionRec  = self.song().session_record
         nRecord      = 1.0 if (bSessionRec) else 0.0
@@ -39,10 +39,10 @@ class SessionTempoHandler(BaseHandler):
                 if oId3.tag_exists():
                     for frame in oId3.frames:
                         if frame.fid == 'TBPM':
-                            self.log('  => TBPM: {0}'.format(frame.strings[0]))
+                            self.log('  => TBPM: %s', frame.strings[0])
                             self.tempo(int(frame.strings[0]))
             except Exception as e:
-                self.log('   => Could not read id3 tags for "{0}": {1}'.format(oClip.file_path, str(e)))
+                self.log_error('   => Could not read id3 tags for "%s": %s', oClip.file_path, str(e))
             return
 
         nValue = _aMessages[2]
@@ -18,6 +18,7 @@ import time
 import datetime
 
 from CoreHandler import CoreHandler
+from BaseHandler import send_batch
 
 # ******************************************************************************
 # Track Clip commands handler
@@ -31,9 +32,12 @@ class TrackClipHandler(CoreHandler):
         bIgnoreRelease = False # we need to listen to release of next-select toggle button
         bLogRxMsgs     = False
         self.config('/track/clip', bIgnoreRelease, bLogRxMsgs)
+        self.subscribe(['new_tracks_sel', 'new_scenes_sel', 'session_reset', 'tracks_changed', 'scenes_changed', 'next_clips_clear'])
 
-        for sTrackIndex in self.track_indeces_list():
-            self.add_callbacks_pref(sTrackIndex, self.scene_indeces_list())
+        # one pattern for the whole grid: /track/clip/{0,..,master,selected}/{0,..,selected}
+        sTracks = ','.join(self.track_indeces_list())
+        sScenes = ','.join(self.scene_indeces_list())
+        self.add_callback_cmd('{%s}/{%s}' % (sTracks, sScenes))
         self.add_callbacks_pref('next', ['select', 'clear'])
         self.add_callbacks(['next/list/modal', 'navigate', 'locknavigate'])
 
@@ -154,6 +158,12 @@ class TrackClipHandler(CoreHandler):
         self.send_bundle(sMsg, aTrackClipMsgs)
 
 
+    # '2/5' -> track 2, scene 5, the navigation commands are not parsed
+    def parse_route(self, _oRoute):
+        _oRoute.m_nTrackIdxRel = int(_oRoute.m_aParts[0])
+        _oRoute.m_nSceneIdxRel = int(_oRoute.m_aParts[1])
+
+
     def handle(self, _aMessage):
         # parse command parts
         sTrackIdxRel = self.m_aParts[0]
@@ -193,9 +203,9 @@ class TrackClipHandler(CoreHandler):
 
         # parse track and scene indeces and verify clip is available ---------------------
 
-        sAddr        = '%s/%s' % (sTrackIdxRel, sSceneIdxRel)
-        nTrackIdxAbs = self.track_idx_abs(int(sTrackIdxRel))
-        nSceneIdxAbs = self.scene_idx_abs(int(sSceneIdxRel))
+        sAddr        = self.m_sCmd # 'track/scene'
+        nTrackIdxAbs = self.track_idx_abs(self.m_oRoute.m_nTrackIdxRel)
+        nSceneIdxAbs = self.scene_idx_abs(self.m_oRoute.m_nSceneIdxRel)
 
         if (self.is_clip_available(nTrackIdxAbs, nSceneIdxAbs) == False):
             self.send('/clip/info/latest/title', '-')
@@ -318,6 +328,7 @@ class TrackClipHandler(CoreHandler):
             self.m_hClipListeners[_oClip] = [fPlayCallback, fViewCallback]
 
 
+    @send_batch
     def on_clip_play_changed(self, _oClip, _nTrackIdxAbs, _nSceneIdxAbs):
         if (_oClip.is_playing):
             self.toggle_clip_on(_nTrackIdxAbs, _nSceneIdxAbs)
@@ -325,6 +336,7 @@ class TrackClipHandler(CoreHandler):
             self.toggle_clip_off(_nTrackIdxAbs, _nSceneIdxAbs)
 
 
+    @send_batch
     def on_clip_view_changed(self, _oClip, _nTrackIdxAbs, _nSceneIdxAbs):
         self.update_track_clip_label(_nTrackIdxAbs, _nSceneIdxAbs, _oClip)
 
@@ -337,6 +349,7 @@ class TrackClipHandler(CoreHandler):
             self.m_hSlotListeners[_oClipSlot] = [fViewCallback]
 
 
+    @send_batch
     def on_slot_clip_changed(self, _oClipSlot, _nTrackIdxAbs, _nSceneIdxAbs):
         # TODO: TDMA: Solve this since the oClip will not be removed if the clipslot has no clip
         oClip = _oClipSlot.clip if (_oClipSlot.has_clip) else None
@@ -388,7 +401,7 @@ class TrackClipHandler(CoreHandler):
 
 
     def toggle_clip_on(self, _nTrackIdxAbs, _nSceneIdxAbs):
-        self.log('> adding clip to history, track: %d, scene: %d' % (_nTrackIdxAbs, _nSceneIdxAbs))
+        self.log('> adding clip to history, track: %d, scene: %d', _nTrackIdxAbs, _nSceneIdxAbs)
         self.m_aTrackClipHistory.append([_nTrackIdxAbs, _nSceneIdxAbs])
 
         if (self.is_clip_visible(_nTrackIdxAbs, _nSceneIdxAbs) == False):
@@ -495,7 +508,7 @@ class TrackClipHandler(CoreHandler):
         sTime = datetime.datetime.fromtimestamp(nTime).strftime('%Y_%m_%d__%H_%M_%S')
         sPath = '%s/session_%s.txt' % (self.get_root_path(), sTime)
 
-        self.log('>  cwd: %s, root: %s, clip log: %s' % (self.get_cwd(), self.get_root_path(), sPath))
+        self.log('>  cwd: %s, root: %s, clip log: %s', self.get_cwd(), self.get_root_path(), sPath)
         self.m_oFile = open(sPath, 'w+')
         self.log_clip_msg('Opening %s session' % (self.m_sProductName))
 
@@ -14,6 +14,7 @@
 # ******************************************************************************
 
 from CoreHandler import CoreHandler
+from BaseHandler import send_batch
 
 # ******************************************************************************
 # Track commands handler
@@ -28,6 +29,7 @@ class TrackCmdHandler(CoreHandler):
         bIgnoreRelease = False # we need to listen when the toggles get off (released)
         bLogRxMsgs     = False
         self.config('/track/cmd', bIgnoreRelease)
+        self.subscribe(['new_tracks_sel', 'session_reset', 'clip_state_updated'])
 
         for sCmd in self.m_aCmds:
             self.add_callbacks_pref(sCmd, self.track_indeces_list())
@@ -229,6 +231,11 @@ class TrackCmdHandler(CoreHandler):
         self.send_bundle(sMsg, aTrackMsgs)
 
 
+    # 'solo/3' -> track 3, 'master' and 'selected' are not parsed
+    def parse_route(self, _oRoute):
+        _oRoute.m_nTrackIdxRel = int(_oRoute.m_aParts[1])
+
+
     def handle(self, _aMessage):
         sCmd       = self.m_aParts[0]
         nValue     = _aMessage[2]
@@ -236,7 +243,7 @@ class TrackCmdHandler(CoreHandler):
 
         if (sCmd == 'lockreboot'):
             self.m_bLockReboot = bActivated
-            self.log('>>> New lock reboot value: %d' % (bActivated))
+            self.log('>>> New lock reboot value: %d', bActivated)
             return # lock reboot command processed, nothing else to do here!
 
         sTrackIdxRel = self.m_aParts[1]
@@ -262,7 +269,7 @@ class TrackCmdHandler(CoreHandler):
 
         # the user tries to operate in a normal track
         else:
-            nTrackIdxRel = int(sTrackIdxRel)
+            nTrackIdxRel = self.m_oRoute.m_nTrackIdxRel
             nTrackIdxAbs = self.track_idx_abs(nTrackIdxRel)
 
             if (self.is_track_available(nTrackIdxAbs) == False):
@@ -372,6 +379,7 @@ class TrackCmdHandler(CoreHandler):
                 self.add_track_listeners(nTrackIdxAbs, oTrack)
 
 
+    @send_batch
     def on_tracks_changed(self):
         self.log('> TrackCmdHandler: tracks changed, updating listeners and GUI')
         self.add_listeners()
@@ -383,6 +391,7 @@ class TrackCmdHandler(CoreHandler):
         self.update_observers('tracks_changed')
 
 
+    @send_batch
     def on_sel_track_changed(self):
         self.update_selected_track()
 
@@ -405,6 +414,7 @@ class TrackCmdHandler(CoreHandler):
             self.m_hTrackListeners[_oTrack] = [fStateCallback, fViewCallback]
 
 
+    @send_batch
     def on_track_state_changed(self, _oTrack, _nTrackIdxAbs):
         if (self.is_track_visible(_nTrackIdxAbs)):
             aTrackMsgs = []
@@ -438,6 +448,7 @@ class TrackCmdHandler(CoreHandler):
             self.update_observers('track_solo_update', hArgs)
 
 
+    @send_batch
     def on_track_view_changed(self, _oTrack, _nTrackIdxAbs):
         if (self.is_track_visible(_nTrackIdxAbs)):
             nTrackIdxRel = self.track_idx_rel(_nTrackIdxAbs)
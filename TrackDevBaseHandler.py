@@ -16,6 +16,7 @@
 import os
 import time
 import datetime
+import Logger
 
 from CoreHandler import CoreHandler
 
@@ -48,6 +49,8 @@ class TrackDevBaseHandler(CoreHandler):
         self.m_hPresets        = {}
 
         self.config_device()
+        self.subscribe(['session_reset', 'device_values_clear', 'device_values_clear_fx', 'device_values_reset',
+                        'device_values_reset_fx', 'device_values_update', 'device_values_update_fx'])
 
         self.m_aCmds.append('settings') # dummy listener, we will not manage it ever
         self.m_aCmds.append('auto/decr')
@@ -59,6 +62,8 @@ class TrackDevBaseHandler(CoreHandler):
         # register callbacks
         for sCmd in self.m_aCmds:
             self.add_callbacks_pref(sCmd, CoreHandler.m_aChannelsFx)
+            if (sCmd.startswith('fader/')):
+                self.add_continuous_pref(sCmd, CoreHandler.m_aChannelsFx)
 
         self.clear_devices_controls()
         self.create_devices_map()
@@ -83,13 +88,13 @@ class TrackDevBaseHandler(CoreHandler):
             # is re-selected in other channel than the current or when the user
             # wants to delete the current used channel
             sChannel = _hArgs['sChannel']
-            self.log('> clear, device: %s, channel: %s' % (self.m_sDeviceClass, sChannel))
+            self.log('> clear, device: %s, channel: %s', self.m_sDeviceClass, sChannel)
             self.clear_device_controls(sChannel)
 
         elif (_sEvent == 'device_values_clear_fx'): # from TrackDevSelectHandler
             # used to clear the values of the device when the user
             # wants to delete the current used fx channel
-            self.log('> clear, device: %s, channel fx: x' % (self.m_sDeviceClass))
+            self.log('> clear, device: %s, channel fx: x', self.m_sDeviceClass)
             self.clear_device_controls('x')
 
         elif (_sEvent == 'device_values_reset'): # from TrackDevSelectHandler
@@ -97,18 +102,18 @@ class TrackDevBaseHandler(CoreHandler):
             # with their "default" value
             if ('sChannel' in _hArgs):
                 sChannel = _hArgs['sChannel']
-                self.log('> reset device: %s, channel: %s' % (self.m_sDeviceClass, sChannel))
+                self.log('> reset device: %s, channel: %s', self.m_sDeviceClass, sChannel)
                 self.reset_device_controls_by_channel(sChannel)
             else:
                 sTrackType = _hArgs['sTrackType']
                 nIdxAbs    = _hArgs['nIdxAbs']
-                self.log('> reset device: %s, type: %s, idx: %d' % (self.m_sDeviceClass, sTrackType, nIdxAbs))
+                self.log('> reset device: %s, type: %s, idx: %d', self.m_sDeviceClass, sTrackType, nIdxAbs)
                 self.reset_device_controls_by_track(sTrackType, nIdxAbs)
 
         elif (_sEvent == 'device_values_reset_fx'): # from TrackDevSelectHandler
             # used when the user want to leave the values of the device
             # with their "default" value
-            self.log('> reset device: %s, channel: x' % (self.m_sDeviceClass))
+            self.log('> reset device: %s, channel: x', self.m_sDeviceClass)
             self.reset_device_controls_by_channel_fx()
 
         elif (_sEvent == 'device_values_update'): # from TrackDevSelectHandler and TrackFxHandler
@@ -116,14 +121,14 @@ class TrackDevBaseHandler(CoreHandler):
             sTrackType = _hArgs['sTrackType'] # 'track' or 'return'
             nIdxAbs    = _hArgs['nIdxAbs']    # absolut index
 
-            self.log('> update, device: %s, channel: %s, track type: %s, idx abs: %d' % (self.m_sDeviceClass, sChannel, sTrackType, nIdxAbs))
+            self.log('> update, device: %s, channel: %s, track type: %s, idx abs: %d', self.m_sDeviceClass, sChannel, sTrackType, nIdxAbs)
             self.update_device_controls(sChannel, sTrackType, nIdxAbs)
 
         elif (_sEvent == 'device_values_update_fx'): # from TrackDevSelectHandler and TrackFxHandler
             sTrackType = _hArgs['sTrackType'] # 'track' or 'return'
             nIdxAbs    = _hArgs['nIdxAbs']    # absolut index
 
-            self.log('> update, device fx: %s, channel: x, track type: %s, idx abs: %d' % (self.m_sDeviceClass, sTrackType, nIdxAbs))
+            self.log('> update, device fx: %s, channel: x, track type: %s, idx abs: %d', self.m_sDeviceClass, sTrackType, nIdxAbs)
             self.update_device_controls_fx(sTrackType, nIdxAbs)
 
 
@@ -178,7 +183,7 @@ class TrackDevBaseHandler(CoreHandler):
         # check that there is actually a device in the selected track
         if (bHasDevice == False):
             self.send_msg('toggle/avail/%s' % (sChannel), 0.0)
-            self.log("> type: %s, abs idx: %d, has no '%s' device!" % (sTrackType, nIdxAbs, self.m_sDeviceClass))
+            self.log("> type: %s, abs idx: %d, has no '%s' device!", sTrackType, nIdxAbs, self.m_sDeviceClass)
             return # track has no device of this kind, nothing else to do here!
 
         self.send_msg('toggle/avail/%s' % (sChannel), 1.0)
@@ -223,7 +228,7 @@ class TrackDevBaseHandler(CoreHandler):
         # check that there is actually a device in the selected track
         if (bHasDevice == False):
             self.send_msg('toggle/avail/%s' % (_sChannel), 0.0)
-            self.log("> type: %s, abs idx: %d, has no '%s' device!" % (sTrackType, nIdxAbs, self.m_sDeviceClass))
+            self.log("> type: %s, abs idx: %d, has no '%s' device!", sTrackType, nIdxAbs, self.m_sDeviceClass)
             return # track has no device of this kind, nothing else to do here!
 
         self.send_msg('toggle/avail/%s' % (_sChannel), 1.0)
@@ -258,7 +263,7 @@ class TrackDevBaseHandler(CoreHandler):
 
         # check that there is actually a device in the track
         if (bHasDevice == False):
-            self.log("> type: %s, abs idx: %d, has no '%s' device!" % (_sTrackType, _nIdxAbs, self.m_sDeviceClass))
+            self.log("> type: %s, abs idx: %d, has no '%s' device!", _sTrackType, _nIdxAbs, self.m_sDeviceClass)
             return # track has no device of this kind, nothing else to do here!
 
         hDevice = self.m_hDevices[_sTrackType][_nIdxAbs]
@@ -312,10 +317,10 @@ class TrackDevBaseHandler(CoreHandler):
 
         bFileExists = os.path.isfile(sFilePath)
         if (bFileExists == False):
-            self.log('> presets file "%s" not found!' % (sFilePath))
+            self.log('> presets file "%s" not found!', sFilePath)
             return # presets file does not exist, nothing else to do here!
 
-        self.log('> reading: %s' % (sFilePath))
+        self.log('> reading: %s', sFilePath)
         # read presets file
         oFile = open(sFilePath, 'r')
 
@@ -330,18 +335,18 @@ class TrackDevBaseHandler(CoreHandler):
 
             # first value in line is the name of the preset
             sName = aValues[0].strip()
-            self.log('> parsing preset: %s' % (sName))
+            self.log('> parsing preset: %s', sName)
 
             # parse the rest of values in the line
             for nIdx in range(1, len(aValues)):
                 sCmd   = self.parse_preset_cmd(nIdx)
                 oValue = self.parse_preset_val(nIdx, aValues[nIdx].strip())
-                self.log('> parsing value: %s = %s' % (sCmd, aValues[nIdx].strip()))
+                self.log('> parsing value: %s = %s', sCmd, aValues[nIdx].strip())
                 if (sCmd != None):
                     aPreset.append([sCmd, oValue])
 
             self.m_hPresets[sName] = aPreset
-            self.log('> preset parsed: %s' % (sName))
+            self.log('> preset parsed: %s', sName)
 
 
     # subclasses should override this method
@@ -355,7 +360,7 @@ class TrackDevBaseHandler(CoreHandler):
 
 
     def apply_preset(self, _sTrackType, _nIdxAbs, _sPreset):
-        self.log('> applying preset: %s, track: %s, idx: %d' % (_sPreset, _sTrackType, _nIdxAbs))
+        self.log('> applying preset: %s, track: %s, idx: %d', _sPreset, _sTrackType, _nIdxAbs)
 
         hDevice = self.m_hDevices[_sTrackType][_nIdxAbs]
         hParams = hDevice['hParams']
@@ -365,13 +370,13 @@ class TrackDevBaseHandler(CoreHandler):
         else:
             sChannel = None
 
-        self.log('> about to update %d params!' % (len(aPreset)))
+        self.log_debug('> about to update %d params!', len(aPreset))
         for aCmdValue in aPreset:
             sCmd    = aCmdValue[0]
             oValue  = aCmdValue[1]
             oParam  = hParams[sCmd]
             oPreset = self.get_preset_value(sCmd, oValue, oParam)
-            self.log('> %s = %s (%s)' % (sCmd, str(oValue), str(oPreset)))
+            self.log_debug('> %s = %s (%s)', sCmd, oValue, oPreset)
 
             # lets try to update the device parameter value
             try:
@@ -384,13 +389,13 @@ class TrackDevBaseHandler(CoreHandler):
                     self.send_msg('%s/%s' % (sCmd, sChannel), nGuiValue)
 
             except Exception as e:
-                self.log(">! could not update param '%s' with value %s: %s" % (sCmd, str(oPreset), str(e)))
-                self.log(">! min: %s, max: %s" % (str(oParam.min), str(oParam.max)))
+                self.log_error(">! could not update param '%s' with value %s: %s", sCmd, oPreset, str(e))
+                self.log_error(">! min: %s, max: %s", oParam.min, oParam.max)
                 if (oPreset > oParam.max):
                     oParam.value = oParam.max
                 elif (oPreset < oParam.min):
                     oParam.value = oParam.min
-                self.log(">! updating param '%s' with value %s" % (sCmd, str(oParam.value)))
+                self.log_error(">! updating param '%s' with value %s", sCmd, oParam.value)
 
                 # update the remote GUI with the new value
                 nGuiValue = self.value_param_to_gui(oParam.value, oParam)
@@ -404,7 +409,7 @@ class TrackDevBaseHandler(CoreHandler):
 
 
     def value_preset_to_param_linear(self, _nValue, _nPresetMin, _nPresetMax, _nParamMin, _nParamMax):
-        self.log('> %s, Preset (%s, %s), Param (%s, %s)' % (_nValue, str(_nPresetMin), str(_nPresetMax), str(_nParamMin), str(_nParamMax)))
+        self.log_debug('> %s, Preset (%s, %s), Param (%s, %s)', _nValue, _nPresetMin, _nPresetMax, _nParamMin, _nParamMax)
         return _nParamMin + (_nValue - _nPresetMin) * (_nParamMax - _nParamMin) / (_nPresetMax - _nPresetMin)
 
 
@@ -450,7 +455,7 @@ class TrackDevBaseHandler(CoreHandler):
                 bMatch = (sClass == self.m_sDeviceClass)
 
             if (bMatch or self.m_bLogParamsVal):
-                self.log('> track: %s, device: %s, class: %s, display: %s' % (sTrack, sDevice, sClass, sDisplay))
+                self.log('> track: %s, device: %s, class: %s, display: %s', sTrack, sDevice, sClass, sDisplay)
 
             if (bMatch):
                 hDevice = {
@@ -473,10 +478,10 @@ class TrackDevBaseHandler(CoreHandler):
                         if (oParam.is_quantized):
                             for oValue in oParam.value_items:
                                 lLog = (sParam, sOriginal, str(oParam.value), str(oValue))
-                                self.log('>   param: %s, orig: %s, value: %s, item: %s' % lLog)
+                                self.log('>   param: %s, orig: %s, value: %s, item: %s', *lLog)
                         else:
                             lLog = (sParam, sOriginal, oParam.value, oParam.min, oParam.max)
-                            self.log('>   param: %s, orig: %s, value: %f, min: %f, max: %f' % lLog)
+                            self.log('>   param: %s, orig: %s, value: %f, min: %f, max: %f', *lLog)
 
 
     def register_param(self, _nIdxAbs, _sParam, _sOriginal, _oParam):
@@ -578,10 +583,15 @@ class TrackDevBaseHandler(CoreHandler):
         pass # subclasses must override this method
 
 
+    # 'fader/low/a' -> channel 'a'
+    def parse_route(self, _oRoute):
+        _oRoute.m_sChannel = _oRoute.m_aParts[2]
+
+
     def handle(self, _aMessage):
         sCmd      = self.m_aParts[0] # 'toggle', 'fader', 'auto', ...
         sType     = self.m_aParts[1] # 'low', 'mid', 'hi', 'incr', 'decr', ...
-        sChannel  = self.m_aParts[2] # 'a', 'b', 'c' or 'd'
+        sChannel  = self.m_oRoute.m_sChannel # 'a', 'b', 'c', 'd' or 'x'
         nGuiValue = _aMessage[2]     # param value in the GUI (from 0 to 1 for continuous values, i.e. faders)
 
         if (sChannel == 'x'):
@@ -596,7 +606,7 @@ class TrackDevBaseHandler(CoreHandler):
         # check that there is actually a selected track in the specified channel
         if (sTrackType == 'none'):
             self.send_msg('%s/%s/%s' % (sCmd, sType, sChannel), 0.0) # turn off toggle immediately since there is no track assigned to that channel
-            self.log("> ERROR: Channel '%s' nas not been assigned any track yet!" % (sChannel))
+            self.log_error("> ERROR: Channel '%s' nas not been assigned any track yet!", sChannel)
             self.alert("> ERROR: Channel '%s' nas not been assigned any track yet!" % (sChannel))
             return # invalid track type, nothing else to do here!
 
@@ -606,7 +616,7 @@ class TrackDevBaseHandler(CoreHandler):
         if (bHasDevice == False):
             self.send_msg('%s/%s/%s' % (sCmd, sType, sChannel), 0.0) # turn off toggle immediately since there is no track assigned to that channel
             lLog = (sTrackType, nIdxAbs, self.m_sDeviceClass)
-            self.log("> type: %s, abs idx: %d, has no '%s' device!" % lLog)
+            self.log("> type: %s, abs idx: %d, has no '%s' device!", *lLog)
             self.alert("> Type: %s, abs idx: %d, has no '%s' device!" % lLog)
             return # track has no device of this kind, nothing else to do here!
 
@@ -616,7 +626,7 @@ class TrackDevBaseHandler(CoreHandler):
 
         if (sCmd == 'auto'):
             sDevKey = '%s-%d' % (sTrackType, nIdxAbs)
-            self.log('> [%s] device auto fade: %s' % (self.m_sDeviceClass, sDevKey))
+            self.log('> [%s] device auto fade: %s', self.m_sDeviceClass, sDevKey)
 
             self.m_bAsyncUpdating = True
             hDevice = self.m_hDevices[sTrackType][nIdxAbs]
@@ -639,11 +649,12 @@ class TrackDevBaseHandler(CoreHandler):
                         hDevice['nValueEnd'] = hDevice['hParams'][self.m_sAutoCmdPrm].max
                     self.send_msg('auto/decr/%s' % (hDevice['sChannel']), 0.0)
                     self.send_msg('auto/incr/%s' % (hDevice['sChannel']), 1.0)
-                self.log('> device will fade to: %f' % (hDevice['nValueEnd']))
+                self.log('> device will fade to: %f', hDevice['nValueEnd'])
 
                 self.m_hAsyncAutoDevs[sDevKey] = [sTrackType, nIdxAbs]
                 self.compute_params(sTrackType, nIdxAbs)
                 self.m_bAsyncAutoOn = True
+                self.start_scheduled_task('update_async_scheduled_tasks')
 
             else:
                 # the user is deactivating the automatic update!
@@ -660,7 +671,7 @@ class TrackDevBaseHandler(CoreHandler):
             if (len(self.m_hAsyncAutoDevs) == 0):
                 self.m_bAsyncAutoOn = False
 
-            self.log('> auto: %d, num auto devs: %d' % (self.m_bAsyncAutoOn, len(self.m_hAsyncAutoDevs)))
+            self.log('> auto: %d, num auto devs: %d', self.m_bAsyncAutoOn, len(self.m_hAsyncAutoDevs))
             self.m_bAsyncUpdating = False
 
             return # nothing else to do here
@@ -668,7 +679,7 @@ class TrackDevBaseHandler(CoreHandler):
         elif (sCmd == 'select' and sType == 'bars'):
             self.m_bAsyncUpdating = True
             self.m_hDevices[sTrackType][nIdxAbs]['nBars'] = nGuiValue
-            self.log('> new bars for track type: %s, idx: %d, bars: %f' % (sTrackType, nIdxAbs, nGuiValue))
+            self.log('> new bars for track type: %s, idx: %d, bars: %f', sTrackType, nIdxAbs, nGuiValue)
             self.compute_params(sTrackType, nIdxAbs)
             self.m_bAsyncUpdating = False
 
@@ -692,13 +703,13 @@ class TrackDevBaseHandler(CoreHandler):
                     self.m_bBeatSchdOn = False
 
                 lLog = (self.m_sDeviceClass, sDevKey, sType)
-                self.log('> Program canceled [%s][%s] => type: %s' % lLog)
+                self.log('> Program canceled [%s][%s] => type: %s', *lLog)
                 self.alert('> Program canceled [%s][%s] => type: %s' % lLog)
                 return # nothing else to do here
 
             (nFireProgTime, nFireProgBar, nFireProgBeat) = self.current_song_time_bar_beat()
 
-            self.log('> [%s] BeatProg starting @ bar: %d, beat: %d' % (sDevKey, nFireProgBar, nFireProgBeat))
+            self.log('> [%s] BeatProg starting @ bar: %d, beat: %d', sDevKey, nFireProgBar, nFireProgBeat)
             hBeatSchdDev = {} # program event attributes
             hBeatSchdDev['hDevice']       = self.m_hDevices[sTrackType][nIdxAbs]
             hBeatSchdDev['sTrackType']    = sTrackType
@@ -707,14 +718,16 @@ class TrackDevBaseHandler(CoreHandler):
             hBeatSchdDev['nFireProgTime'] = nFireProgTime
             hBeatSchdDev['nFireProgBar']  = nFireProgBar
             hBeatSchdDev['nFireProgBeat'] = nFireProgBeat
+            hBeatSchdDev['nPlannedTime']  = nFireProgTime # last song time (beat) with planned steps
             self.m_hBeatSchdDevs[sDevKey] = hBeatSchdDev
             self.m_bBeatSchdOn = True
+            self.start_scheduled_task('schedule_beat_tasks', True)
 
             sChannel = hBeatSchdDev['hDevice']['sChannel']
             self.send_msg('bprog/%s/%s' % (sType, sChannel), 1.0) # turn the toggle button on
 
             lLog = (self.m_sDeviceClass, sDevKey, sType, nFireProgTime, nFireProgBar, nFireProgBeat)
-            self.log('> TrackDevBaseHandler, program fired [%s][%s] => type: %s, song time: %d, song bar: %d, song beat: %d' % lLog)
+            self.log('> TrackDevBaseHandler, program fired [%s][%s] => type: %s, song time: %d, song bar: %d, song beat: %d', *lLog)
             self.alert('> Program fired [%s][%s] => type: %s, song time: %d, song bar: %d, song beat: %d' % lLog)
 
             self.m_bBeatScheduling = False
@@ -723,10 +736,10 @@ class TrackDevBaseHandler(CoreHandler):
 
         oParam = self.handle_param_msg(sChannel, sTrackType, nIdxAbs, sCmd, sType, nGuiValue, bActive)
 
-        if (sCmd != 'fader'):
+        if (sCmd != 'fader' and self.is_logging(Logger.INFO)):
             sParam = self.to_ascii(oParam.name) if (oParam != None) else 'PARAM'
             lLog   = (self.m_sDeviceClass, sChannel, sTrackType, nIdxAbs, sCmd, sType, sParam, str(nGuiValue))
-            self.log('> TrackDevBaseHandler, [%s], channel: %s, track type: %s, abs idx: %d, cmd: %s, type: %s, param: %s, value: %s' % lLog)
+            self.log('> TrackDevBaseHandler, [%s], channel: %s, track type: %s, abs idx: %d, cmd: %s, type: %s, param: %s, value: %s', *lLog)
 
 
     # this method should be override by subclasses if necessary
@@ -754,10 +767,12 @@ class TrackDevBaseHandler(CoreHandler):
         hDevice['nSlope']      = nValueDelta / nTimeDelta
 
 
-    # this function is run approx every 100ms
+    # this function is run approx every 100ms while a program is running
     def update_prog_async_scheduled_tasks(self):
-        if (self.m_bProgRunOn == False or self.m_bProgUpdating):
-            return # nothing else to do here
+        if (self.m_bProgRunOn == False):
+            return False # nothing else to do here
+        if (self.m_bProgUpdating):
+            return True # try again on the next tick
 
         aDevsToDelete = []
         #self.log('> update_prog_async_scheduled_tasks: time: %f' % (time.time()))
@@ -766,25 +781,22 @@ class TrackDevBaseHandler(CoreHandler):
             hProgSchdDev = self.m_hProgSchdDevs[sDevKey]
             hSchedule    = hProgSchdDev['hSchedule']
 
-            bDone = False
-            aStepsToRemove = []
-            for sStepName in hSchedule.keys():
+            # the steps run on the tick nearest to their (predicted) exec time, in time order,
+            # a step is removed from the schedule before running (a failing step runs only once)
+            for sStepName in sorted(hSchedule.keys(), key = lambda sName: hSchedule[sName][0]):
                 aStep = hSchedule[sStepName]
                 nExecTime = aStep[0]
                 nExecIdx  = aStep[1]
                 nTime     = time.time()
 
-                if (nTime > nExecTime):
-                    aStepsToRemove.append(sStepName)
-                    self.log('> update_prog_async_scheduled_tasks: exec: nTime: %f, nExecTime: %f, nExecIdx: %d, step name: %s' % (nTime, nExecTime, nExecIdx, sStepName))
-                    bDone = self.execute_beat_program_step(nExecIdx, sDevKey)
-
-            # remove the steps from the schedule hash after iterating
-            for sStepName in aStepsToRemove:
-                if (sStepName in hSchedule):
+                if (self.m_oBeatClock.is_due(nExecTime, nTime)):
                     del hSchedule[sStepName]
+                    nLate = self.m_oBeatClock.add_lateness('%s %s' % (self.m_sDeviceClass, sStepName), nExecTime, nTime)
+                    self.log_debug('> update_prog_async_scheduled_tasks: exec: nTime: %f, nExecTime: %f, late: %.1f ms, nExecIdx: %d, step name: %s', nTime, nExecTime, 1000.0 * nLate, nExecIdx, sStepName)
+                    self.execute_beat_program_step(nExecIdx, sDevKey)
 
-            if (bDone == True):
+            # the steps of the next beats may be already planned
+            if (len(hSchedule) == 0):
                 aDevsToDelete.append(sDevKey)
 
         # remove the devices from the hash after iterating
@@ -796,15 +808,19 @@ class TrackDevBaseHandler(CoreHandler):
         if (len(self.m_hProgSchdDevs) == 0):
             self.m_bProgRunOn = False
 
+        return self.m_bProgRunOn
+
 
     def execute_beat_program_step(self, _nExecIdx, _sDevKey):
         pass # this method should be override by subclasses
 
 
-    # this function is run approx every 100ms
+    # this function is run approx every 100ms while auto updating
     def update_async_scheduled_tasks(self):
-        if (self.m_bAsyncAutoOn == False or self.m_bAsyncUpdating):
-            return # nothing else to do here
+        if (self.m_bAsyncAutoOn == False):
+            return False # nothing else to do here
+        if (self.m_bAsyncUpdating):
+            return True # try again on the next tick
 
         nTime = time.time()
         self.m_nCount += 1
@@ -843,7 +859,7 @@ class TrackDevBaseHandler(CoreHandler):
                     self.send_msg('%s/%s' % (self.m_sAutoCmdTx, hDevice['sChannel']), nGuiValue)
 
             except Exception as e:
-                self.log("   ====> Could not update param '%s' with value %f: %s" % (oParam.name, nNewValue, str(e)))
+                self.log_error("   ====> Could not update param '%s' with value %f: %s", oParam.name, nNewValue, str(e))
 
         # remove the devices from the hash after iterating
         for sDevKey in aDevsToDelete:
@@ -854,6 +870,8 @@ class TrackDevBaseHandler(CoreHandler):
         if (len(self.m_hAsyncAutoDevs) == 0):
             self.m_bAsyncAutoOn = False
 
+        return self.m_bAsyncAutoOn
+
 
     def final_value_reached(self, _sDevKey, _hDevice, _aDevsToDelete):
         nNewValue = _hDevice['nValueEnd']
@@ -865,11 +883,13 @@ class TrackDevBaseHandler(CoreHandler):
         return nNewValue
 
 
-    # this method is executed for every registered device and is actually not very accurate,
-    # it will be invoked as soon as the beat changes but not exactly in the beat transition
+    # this method is executed on every beat while a beat program is queued and is actually not
+    # very accurate, it will be invoked as soon as the beat changes but not exactly in the beat transition
     def schedule_beat_tasks(self, _nCurrSongTime, _nCurrSongBar, _nCurrSongBeat):
-        if (self.m_bBeatSchdOn == False or self.m_bBeatScheduling):
-            return # nothing else to do here
+        if (self.m_bBeatSchdOn == False):
+            return False # nothing else to do here
+        if (self.m_bBeatScheduling):
+            return True # try again on the next beat
 
         aDevsToDelete = []
         nTempo        = self.song().tempo
@@ -893,6 +913,8 @@ class TrackDevBaseHandler(CoreHandler):
         if (len(self.m_hBeatSchdDevs) == 0):
             self.m_bBeatSchdOn = False
 
+        return self.m_bBeatSchdOn
+
 
     # called when a beat occurs in ableton and the user has queued a beat program
     # NOTE! unfortunately we cannot make any change to the devices parameters in
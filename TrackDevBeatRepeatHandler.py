@@ -13,8 +13,6 @@
 # All rights reserved.
 # ******************************************************************************
 
-import time
-
 from TrackDevBaseHandler import TrackDevBaseHandler
 
 # ******************************************************************************
@@ -368,12 +366,34 @@ class TrackDevBeatRepeatHandler(TrackDevBaseHandler):
         return _oValue
 
 
+    # the steps of a program are planned one beat ahead: when the song reaches
+    # a beat the steps of the next beat are scheduled at its predicted time
+    # (see BeatClock.py) so they run on the beat, not up to a tick after it
     def schedule_beat_sync_task(self, _sDevKey, _nTempo, _nCurrSongTime, _nCurrSongBar, _nCurrSongBeat):
+        hBeatSchdDev = self.m_hBeatSchdDevs[_sDevKey]
+        if (hBeatSchdDev['nPlannedTime'] > _nCurrSongTime + 1):
+            hBeatSchdDev['nPlannedTime'] = _nCurrSongTime # the song jumped back
+
+        # the current beat too if it was not planned yet (the first beat of the program)
+        nFromTime = max(hBeatSchdDev['nPlannedTime'] + 1, _nCurrSongTime)
+        for nSongTime in range(nFromTime, _nCurrSongTime + 2):
+            hBeatSchdDev['nPlannedTime'] = nSongTime
+            if (self.plan_beat_program_steps(_sDevKey, hBeatSchdDev, nSongTime) == True):
+                return True # done with the program
+
+        return False # not done until the last program beat is planned
+
+
+    def plan_beat_program_steps(self, _sDevKey, _hBeatSchdDev, _nSongTime):
         self.m_bProgUpdating = True
 
         hSchedule    = {}
-        hBeatSchdDev = self.m_hBeatSchdDevs[_sDevKey]
-        nFireProgBar = hBeatSchdDev['nFireProgBar']
+        nFireProgBar = _hBeatSchdDev['nFireProgBar']
+        nSongBar     = _nSongTime / 4 + 1
+        nSongBeat    = _nSongTime % 4 + 1
+        nBeatTime    = self.m_oBeatClock.beat_time(_nSongTime) # predicted time of the beat
+        nBeatDelta   = self.m_oBeatClock.beat_secs()           # in seconds
+        bDone        = False
 
         # build-up program:
         # Beat | 1 | 2 | 3       | 4
@@ -383,54 +403,48 @@ class TrackDevBeatRepeatHandler(TrackDevBaseHandler):
         # Bar 3| 1 | 2 | 1       | 2
         # Bar 4| 1 | 1 | 1/2 1/2 | 1/4 1/4 1/4 1/4
 
-        if (hBeatSchdDev['sType'] == 'buildup'):
-            if (_nCurrSongBar == nFireProgBar + 1):
-                if (_nCurrSongBeat == 1):
-                    hSchedule['4 beats']  = [time.time(), 1] # turn device on, set grid to 1 bar (4 beats)
+        if (_hBeatSchdDev['sType'] == 'buildup'):
+            if (nSongBar == nFireProgBar + 1):
+                if (nSongBeat == 1):
+                    hSchedule['4 beats']  = [nBeatTime, 1] # turn device on, set grid to 1 bar (4 beats)
 
-            elif (_nCurrSongBar == nFireProgBar + 3):
-                if (_nCurrSongBeat == 1):
-                    hSchedule['2 beats']  = [time.time(), 2] # set grid to 1/2 bar (2 beats)
+            elif (nSongBar == nFireProgBar + 3):
+                if (nSongBeat == 1):
+                    hSchedule['2 beats']  = [nBeatTime, 2] # set grid to 1/2 bar (2 beats)
 
-            elif (_nCurrSongBar == nFireProgBar + 4):
-                if (_nCurrSongBeat == 1):
-                    hSchedule['1 beat']   = [time.time(), 3] # set grid to 1/4 bar (1 beat)
+            elif (nSongBar == nFireProgBar + 4):
+                if (nSongBeat == 1):
+                    hSchedule['1 beat']   = [nBeatTime, 3] # set grid to 1/4 bar (1 beat)
 
-                elif (_nCurrSongBeat == 3):
-                    nBeatDelta            = 60.0 / _nTempo   # in seconds
-                    hSchedule['1/2 beat'] = [time.time(), 4] # set grid to 1/8 bar (1/2 beat)
-                    hSchedule['1/4 beat'] = [time.time() + nBeatDelta * 0.75, 5] # set grid to 1/16 bar (1/4 beat)
+                elif (nSongBeat == 3):
+                    hSchedule['1/2 beat'] = [nBeatTime, 4] # set grid to 1/8 bar (1/2 beat)
+                    hSchedule['1/4 beat'] = [nBeatTime + nBeatDelta * 0.75, 5] # set grid to 1/16 bar (1/4 beat)
 
-                elif (_nCurrSongBeat == 4):
-                    nBeatDelta            = 60.0 / _nTempo   # in seconds
-                    hSchedule['off']      = [time.time() + nBeatDelta * 0.70, 6] # turn device off
-                    self.add_prog_schedule(_sDevKey, hBeatSchdDev, hSchedule)
-                    return True # done with the program
+                elif (nSongBeat == 4):
+                    hSchedule['off']      = [nBeatTime + nBeatDelta * 0.70, 6] # turn device off
+                    bDone = True # done with the program
 
-            self.add_prog_schedule(_sDevKey, hBeatSchdDev, hSchedule)
-            return False # not done until the last program beat is executed
+        elif (_hBeatSchdDev['sType'] == 'breakdw'):
+            bDone = True # not yet implemented
 
-        elif (hBeatSchdDev['sType'] == 'breakdw'):
-            self.m_bProgUpdating = False
-            return True # not yet implemented
+        elif (_hBeatSchdDev['sType'] == 'next4'):
+            if (nSongBar == nFireProgBar + 4 and nSongBeat == 2):
+                hSchedule['off'] = [nBeatTime, 11] # start the other clips
+                self.log('> done programming, execution about to start ...')
+                bDone = True # done with the program
 
-        elif (hBeatSchdDev['sType'] == 'next4'):
-            if (_nCurrSongBar == nFireProgBar + 4):
-                if (_nCurrSongBeat == 2):
-                    hSchedule['off'] = [time.time(), 11] # start the other clips
-                    self.add_prog_schedule(_sDevKey, hBeatSchdDev, hSchedule)
-                    self.log('> done programming, execution about to start ...')
-                    return True # done with the program
+        elif (_hBeatSchdDev['sType'] == 'next8'):
+            if (nSongBar == nFireProgBar + 8 and nSongBeat == 2):
+                hSchedule['off'] = [nBeatTime, 11] # start the other clips
+                self.log('> done programming, execution about to start ...')
+                bDone = True # done with the program
 
-        elif (hBeatSchdDev['sType'] == 'next8'):
-            if (_nCurrSongBar == nFireProgBar + 8):
-                if (_nCurrSongBeat == 2):
-                    hSchedule['off'] = [time.time(), 11] # start the other clips
-                    self.add_prog_schedule(_sDevKey, hBeatSchdDev, hSchedule)
-                    self.log('> done programming, execution about to start ...')
-                    return True # done with the program
+        if (len(hSchedule) > 0):
+            self.add_prog_schedule(_sDevKey, _hBeatSchdDev, hSchedule)
+        else:
+            self.m_bProgUpdating = False
 
-            return False
+        return bDone
 
 
     def add_prog_schedule(self, _sDevKey, _hBeatSchdDev, _hSchedule):
@@ -450,10 +464,16 @@ class TrackDevBeatRepeatHandler(TrackDevBaseHandler):
         hProgSchdDev['oMixParam']      = hParams['select/mtype']
         hProgSchdDev['hDevice']        = _hBeatSchdDev['hDevice']
         hProgSchdDev['hSchedule']      = _hSchedule
+
+        # the steps of the previous beat may be still waiting for their time
+        if (_sDevKey in self.m_hProgSchdDevs):
+            hProgSchdDev['hSchedule'] = self.m_hProgSchdDevs[_sDevKey]['hSchedule']
+            hProgSchdDev['hSchedule'].update(_hSchedule)
         self.m_hProgSchdDevs[_sDevKey] = hProgSchdDev
 
         self.m_bProgRunOn    = True
         self.m_bProgUpdating = False
+        self.start_scheduled_task('update_prog_async_scheduled_tasks')
 
 
     # ------------------------------------------------------
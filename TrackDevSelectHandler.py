@@ -28,6 +28,7 @@ class TrackDevSelectHandler(CoreHandler):
         self.m_bIgnoreRelease = False # we need to listen to toggle off messages (release messages)
         self.m_bLogRxMsgs     = False
         self.config('/track/dev/select', self.m_bIgnoreRelease, self.m_bLogRxMsgs)
+        self.subscribe(['track_reboot', 'track_solo_update', 'new_tracks_sel'])
 
         for sCmd in ['track','reset','solo','volume']:
             self.add_callbacks_pref(sCmd, CoreHandler.m_aChannels)
@@ -327,7 +328,7 @@ class TrackDevSelectHandler(CoreHandler):
                 'nIdxAbs'   : nIdxAbs
             }
             self.update_observers('device_values_update', hArgs)
-            self.log('> channel: %s, type: %s, track sel: %d' % (sChannel, sTrackType, nIdxAbs))
+            self.log('> channel: %s, type: %s, track sel: %d', sChannel, sTrackType, nIdxAbs)
             self.alert('> channel: %s, type: %s, track sel: %d' % (sChannel, sTrackType, nIdxAbs))
 
         else:
@@ -351,7 +352,7 @@ class TrackDevSelectHandler(CoreHandler):
             self.send('/EDIT', [sId, sAttrs])
             self.send_msg('solo/%s' % (sChannel), 0.0) # turn solo off
 
-            self.log('> channel: %s -> cleared' % (sChannel))
+            self.log('> channel: %s -> cleared', sChannel)
             self.alert('> channel: %s -> cleared' % (sChannel))
 
 
@@ -28,6 +28,7 @@ class TrackFxHandler(CoreHandler):
         self.m_bLogRxMsgs     = False
 
         self.config('/track/fx', self.m_bIgnoreRelease, self.m_bLogRxMsgs)
+        self.subscribe(['new_tracks_sel'])
         self.add_callbacks(['select', 'mode', 'reset', 'solo'])
 
         self.reset_track_selection()
@@ -210,7 +211,7 @@ class TrackFxHandler(CoreHandler):
                 'nIdxAbs'   : nIdxAbs
             }
             self.update_observers('device_values_update_fx', hArgs)
-            self.log('> channel: x, type: %s, track sel: %d' % (sTrackType, nIdxAbs))
+            self.log('> channel: x, type: %s, track sel: %d', sTrackType, nIdxAbs)
             self.alert('> channel: x, type: %s, track sel: %d' % (sTrackType, nIdxAbs))
 
         else:
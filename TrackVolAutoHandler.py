@@ -29,6 +29,7 @@ class TrackVolAutoHandler(CoreHandler):
         bIgnoreRelease = False # do not ignore release toggle buttons
         bLogRxMsgs     = False # do not log (fader messages overflow the log!)
         self.config('/track/vol/auto', bIgnoreRelease, bLogRxMsgs)
+        self.subscribe(['new_tracks_sel', 'session_reset', 'tracks_changed', 'track_reboot'])
 
         aRelIdxTracks = self.gui_visible_tracks_rel_range()
         self.m_aCmds = ['incr', 'decr', 'select']
@@ -117,7 +118,7 @@ class TrackVolAutoHandler(CoreHandler):
             hAutoTrack = self.m_hAutoTracks[_nTrackIdxAbs]
             self.send_msg('%s/%s' % (hAutoTrack['sAutoType'], _nTrackIdxAbs), 0.0)
             del self.m_hAutoTracks[_nTrackIdxAbs]
-            self.log('> Auto update vol OFF, track: %d, type: %s' % (_nTrackIdxAbs, sCmd))
+            self.log('> Auto update vol OFF, track: %d, type: %s', _nTrackIdxAbs, sCmd)
             self.alert('> Auto update vol OFF, track: %d, type: %s' % (_nTrackIdxAbs, sCmd))
 
         # check if is necessary to turn automatic control update off
@@ -152,10 +153,14 @@ class TrackVolAutoHandler(CoreHandler):
             hAutoTrack['nSlope']      = nSlope
 
 
+    def parse_route(self, _oRoute):
+        _oRoute.m_nTrackIdxRel = int(_oRoute.m_aParts[1])
+
+
     def handle(self, _aMessage):
         sCmd         = self.m_aParts[0]
         sTrackIdxRel = self.m_aParts[1]
-        nTrackIdxAbs = self.track_idx_abs(int(sTrackIdxRel))
+        nTrackIdxAbs = self.track_idx_abs(self.m_oRoute.m_nTrackIdxRel)
 
         self.m_bAsyncUpdating = True
 
@@ -182,7 +187,8 @@ class TrackVolAutoHandler(CoreHandler):
                 self.m_hAutoTracks[nTrackIdxAbs] = hAutoTrack
                 self.compute_params(nTrackIdxAbs)
                 self.m_bAsyncAutoOn = True
-                self.log('> Auto update vol ON, track: %d, type: %s' % (nTrackIdxAbs, sCmd))
+                self.start_scheduled_task('update_async_scheduled_tasks')
+                self.log('> Auto update vol ON, track: %d, type: %s', nTrackIdxAbs, sCmd)
                 self.alert('> Auto update vol ON, track: %d, type: %s' % (nTrackIdxAbs, sCmd))
 
             else:
@@ -192,7 +198,7 @@ class TrackVolAutoHandler(CoreHandler):
                     hAutoTrack = self.m_hAutoTracks[nTrackIdxAbs]
                     self.send_msg('%s/%s' % (hAutoTrack['sAutoType'], nTrackIdxAbs), 0.0)
                     del self.m_hAutoTracks[nTrackIdxAbs]
-                    self.log('> Auto update vol OFF, track: %d, type: %s' % (nTrackIdxAbs, sCmd))
+                    self.log('> Auto update vol OFF, track: %d, type: %s', nTrackIdxAbs, sCmd)
                     self.alert('> Auto update vol OFF, track: %d, type: %s' % (nTrackIdxAbs, sCmd))
 
                 else:
@@ -205,10 +211,12 @@ class TrackVolAutoHandler(CoreHandler):
         self.m_bAsyncUpdating = False
 
 
-    # this function is run approx every 100ms
+    # this function is run approx every 100ms while auto updating
     def update_async_scheduled_tasks(self):
-        if (self.m_bAsyncAutoOn == False or self.m_bAsyncUpdating):
-            return # nothing else to do here
+        if (self.m_bAsyncAutoOn == False):
+            return False # nothing else to do here
+        if (self.m_bAsyncUpdating):
+            return True # try again on the next tick
 
         nTime = time.time()
         aTracksToDelete = []
@@ -239,7 +247,7 @@ class TrackVolAutoHandler(CoreHandler):
                 oTrack.mixer_device.volume.value = nNewValue
 
             except Exception as e:
-                self.log("> Error: could not update track volume '%d' with value %f: %s" % (nTrackIdxAbs, nNewValue, str(e)))
+                self.log_error("> Error: could not update track volume '%d' with value %f: %s", nTrackIdxAbs, nNewValue, str(e))
 
         # remove the tracks from the hash after iterating
         for nTrackIdxAbs in aTracksToDelete:
@@ -251,6 +259,8 @@ class TrackVolAutoHandler(CoreHandler):
         if (len(self.m_hAutoTracks) == 0):
             self.m_bAsyncAutoOn = False
 
+        return self.m_bAsyncAutoOn
+
 
     def final_value_reached(self, _nTrackIdxAbs, _hAutoTrack, _aTracksToDelete):
         nTrackIdxRel = self.track_idx_rel(_nTrackIdxAbs)
@@ -14,6 +14,7 @@
 # ******************************************************************************
 
 from CoreHandler import CoreHandler
+from BaseHandler import send_batch
 
 # ******************************************************************************
 # Track Volume commands handler
@@ -27,6 +28,7 @@ class TrackVolHandler(CoreHandler):
         bIgnoreRelease = False # the index of sends can be 0 (may appear as a release)
         bLogInfo       = False # do not log (fader messages overflow the log!)
         self.config('/track/vol', bIgnoreRelease, bLogInfo)
+        self.subscribe(['new_tracks_sel', 'session_reset', 'tracks_changed', 'new_track_sel'])
 
         # these commands apply to all gui visible tracks, the master track,
         # the cue volume and to the selected track
@@ -39,6 +41,7 @@ class TrackVolHandler(CoreHandler):
         aTracks = self.track_indeces_list()
         for sCmd in self.m_aCmds:
             self.add_callbacks_pref(sCmd, aTracks + ['cue'])
+        self.add_continuous_pref('fader', aTracks + ['cue'])
 
         # NOTE: use 'aTracks' variable when we actually have separated
         #       controls for every track sends, currently we have not :-(
@@ -167,6 +170,11 @@ class TrackVolHandler(CoreHandler):
         self.send_bundle(sMsg, aTrackMsgs)
 
 
+    # 'fader/3' -> track 3, 'master', 'selected' and 'cue' are not parsed
+    def parse_route(self, _oRoute):
+        _oRoute.m_nTrackIdxRel = int(_oRoute.m_aParts[1])
+
+
     def handle(self, _aMessage):
         # first of all handle returns volumes
         if (self.m_sCmd == 'returns'):
@@ -196,7 +204,7 @@ class TrackVolHandler(CoreHandler):
             oTrack = self.master()
 
         else:
-            nTrackIdxAbs = self.track_idx_abs(int(sTrackIdxRel))
+            nTrackIdxAbs = self.track_idx_abs(self.m_oRoute.m_nTrackIdxRel)
             if (self.is_track_available(nTrackIdxAbs) == False):
                 return # unavailable track, nothing else to do here!
             oTrack = self.get_track(nTrackIdxAbs)
@@ -255,11 +263,13 @@ class TrackVolHandler(CoreHandler):
             self.add_track_listeners(nTrackIdxAbs, oTrack)
 
 
+    @send_batch
     def on_master_changed(self):
         nVolume = self.master().mixer_device.volume.value
         self.send_msg('fader/master', nVolume)
 
 
+    @send_batch
     def on_cue_changed(self):
         nVolume = self.master().mixer_device.cue_volume.value
         self.send_msg('fader/cue', nVolume)
@@ -286,6 +296,7 @@ class TrackVolHandler(CoreHandler):
             self.m_hTrackListeners[_oTrack].append(fSendCallback)
 
 
+    @send_batch
     def on_track_vol_changed(self, _nTrackIdxAbs, _oTrack):
         if (self.is_return_track(_oTrack)):
             nReturnIdxAbs = _nTrackIdxAbs - len(self.tracks())
@@ -301,6 +312,7 @@ class TrackVolHandler(CoreHandler):
             self.send_msg('fader/selected', nVolume)
 
 
+    @send_batch
     def on_track_send_changed(self, _nTrackIdxAbs, _oTrack):
         oMixDev = _oTrack.mixer_device
         aSends  = oMixDev.sends
@@ -351,7 +363,7 @@ class TrackVolHandler(CoreHandler):
                         if (aSends[nSendIdxAbs].value_has_listener(fSendCallback)):
                             aSends[nSendIdxAbs].remove_value_listener(fSendCallback)
         except IndexError as oError:
-            self.log('! Error: %s' % (str(oError)))
+            self.log_error('! Error: %s', str(oError))
 
         self.m_hTrackListeners = {}
 
@@ -0,0 +1,104 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+# ******************************************************************************
+# Live.Base stand-in: the Log.txt logger and the listener machinery shared by
+# the simulated Live objects
+# ******************************************************************************
+
+m_aLog     = []   # last lines logged, see set_log_output()
+m_nLogMax  = 1000 # max lines kept in m_aLog
+m_oLogFile = None # file object where the lines are written too (i.e. sys.stderr)
+
+
+def log(_sMessage):
+    m_aLog.append(_sMessage)
+    if (len(m_aLog) > m_nLogMax):
+        del m_aLog[:len(m_aLog) - m_nLogMax]
+    if (m_oLogFile != None):
+        m_oLogFile.write('%s\n' % (_sMessage))
+
+
+def set_log_output(_oFile):
+    global m_oLogFile
+    m_oLogFile = _oFile
+
+
+# ******************************************************************************
+# Listenable properties, Live style:
+#   obj.<name>, obj.add_<name>_listener(f), obj.remove_<name>_listener(f),
+#   obj.<name>_has_listener(f)
+# Listeners are called without arguments when the value changes.
+# ******************************************************************************
+
+class LiveObject(object):
+
+    def __init__(self):
+        self.m_hValues    = {}
+        self.m_hListeners = {}
+
+
+    def get_listeners(self, _sName):
+        return self.m_hListeners.setdefault(_sName, [])
+
+
+    def notify(self, _sName):
+        # a listener may remove itself (or others) while being called
+        for fListener in list(self.get_listeners(_sName)):
+            fListener()
+
+
+    def set_value(self, _sName, _oValue):
+        if (_sName in self.m_hValues and self.m_hValues[_sName] == _oValue):
+            return # no change, no notification (same as Live)
+        self.m_hValues[_sName] = _oValue
+        self.notify(_sName)
+
+
+def listenable(_cClass, _aNames, _bProperty = True):
+    """Adds the Live style listenable properties to a LiveObject subclass,
+    only the listener methods when _bProperty is False (i.e. playing_status)"""
+    for sName in _aNames:
+        add_listenable(_cClass, sName, _bProperty)
+    return _cClass
+
+
+def add_listenable(_cClass, _sName, _bProperty):
+    def fGet(self):
+        return self.m_hValues[_sName]
+
+    def fSet(self, _oValue):
+        self.set_value(_sName, _oValue)
+
+    def fAdd(self, _fListener):
+        aListeners = self.get_listeners(_sName)
+        if (_fListener in aListeners):
+            raise RuntimeError('Listener already connected')
+        aListeners.append(_fListener)
+
+    def fRemove(self, _fListener):
+        aListeners = self.get_listeners(_sName)
+        if (_fListener not in aListeners):
+            raise RuntimeError('Listener not connected')
+        aListeners.remove(_fListener)
+
+    def fHas(self, _fListener):
+        return (_fListener in self.get_listeners(_sName))
+
+    if (_bProperty and not hasattr(_cClass, _sName)):
+        setattr(_cClass, _sName, property(fGet, fSet))
+    setattr(_cClass, 'add_%s_listener'    % (_sName), fAdd)
+    setattr(_cClass, 'remove_%s_listener' % (_sName), fRemove)
+    setattr(_cClass, '%s_has_listener'    % (_sName), fHas)
@@ -0,0 +1,186 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.Clip stand-in. A note is a tuple (pitch, time, duration, velocity, mute).
+# The clip plays when its slot fires it, the playing position is moved by
+# the song clock (see Song.advance).
+# ******************************************************************************
+
+from Base import LiveObject, listenable
+
+
+class Clip(LiveObject):
+
+    def __init__(self, _oSlot, _sName, _nLength, _bMidi, _nColor = 0xff8800):
+        LiveObject.__init__(self)
+        self.m_oSlot           = _oSlot
+        self.m_aNotes          = []    # [pitch, time, duration, velocity, mute, selected]
+        self.m_bPlaying        = False
+        self.m_nScrub          = None  # scrub position, None -> not scrubbing
+        self.is_midi_clip      = _bMidi
+        self.is_audio_clip     = not _bMidi
+        self.length            = float(_nLength)
+        self.loop_start        = 0.0
+        self.loop_end          = float(_nLength)
+        self.start_marker      = 0.0
+        self.end_marker        = float(_nLength)
+        self.looping           = True
+        self.playing_position  = 0.0
+        self.warping           = True
+        self.warp_mode         = 0
+        self.pitch_coarse      = 0
+        self.pitch_fine        = 0
+        self.color_index       = 0
+        self.file_path         = u'' if (_bMidi) else u'/samples/%s.wav' % (_sName)
+        self.m_hValues['name']  = _sName
+        self.m_hValues['color'] = _nColor
+
+
+    # **************************************************************************
+
+    def get_is_playing(self):
+        return self.m_bPlaying
+
+
+    def set_is_playing(self, _bPlaying):
+        if (_bPlaying):
+            self.fire()
+        else:
+            self.stop()
+
+    is_playing = property(get_is_playing, set_is_playing)
+
+
+    def get_position(self):
+        return self.loop_start
+
+
+    def set_position(self, _nPosition):
+        # moves the loop keeping its length
+        nLength         = self.loop_end - self.loop_start
+        self.loop_start = _nPosition
+        self.loop_end   = _nPosition + nLength
+
+    position = property(get_position, set_position)
+
+
+    def fire(self):
+        self.m_oSlot.fire()
+
+
+    def stop(self):
+        self.m_oSlot.stop()
+
+
+    def set_playing(self, _bPlaying):
+        if (_bPlaying == self.m_bPlaying):
+            return
+        self.m_bPlaying       = _bPlaying
+        self.playing_position = self.loop_start if (_bPlaying) else 0.0
+        self.notify('playing_status')
+
+
+    def advance(self, _nBeats):
+        if (not self.m_bPlaying or self.m_nScrub != None):
+            return
+        nPosition = self.playing_position + _nBeats
+        if (self.looping and self.loop_end > self.loop_start):
+            while (nPosition >= self.loop_end):
+                nPosition -= (self.loop_end - self.loop_start)
+        self.playing_position = nPosition
+
+
+    def scrub(self, _nPosition):
+        self.m_nScrub         = _nPosition
+        self.playing_position = _nPosition
+
+
+    def stop_scrub(self):
+        self.m_nScrub = None
+
+
+    def duplicate_loop(self):
+        nLength = self.loop_end - self.loop_start
+        aCopies = []
+        for aNote in self.m_aNotes:
+            if (self.loop_start <= aNote[1] < self.loop_end):
+                aCopy     = list(aNote)
+                aCopy[1] += nLength
+                aCopies.append(aCopy)
+        self.m_aNotes.extend(aCopies)
+        self.loop_end  += nLength
+        self.length     = max(self.length, self.loop_end)
+        self.end_marker = max(self.end_marker, self.loop_end)
+
+
+    # **************************************************************************
+    # MIDI notes
+
+    def check_midi(self):
+        if (not self.is_midi_clip):
+            raise RuntimeError('Clip is not a MIDI clip')
+
+
+    def set_notes(self, _aNotes):
+        """Adds the notes (pitch, time, duration, velocity, mute), unselected"""
+        self.check_midi()
+        for aNote in _aNotes:
+            self.m_aNotes.append([aNote[0], aNote[1], aNote[2], aNote[3], aNote[4], False])
+        self.m_aNotes.sort(key = lambda aNote: (aNote[1], aNote[0]))
+
+
+    def select_all_notes(self):
+        self.check_midi()
+        for aNote in self.m_aNotes:
+            aNote[5] = True
+
+
+    def deselect_all_notes(self):
+        self.check_midi()
+        for aNote in self.m_aNotes:
+            aNote[5] = False
+
+
+    def get_selected_notes(self):
+        self.check_midi()
+        return tuple([tuple(aNote[:5]) for aNote in self.m_aNotes if aNote[5]])
+
+
+    def in_range(self, _aNote, _nTime, _nPitch, _nTimeSpan, _nPitchSpan):
+        return ((_nTime  <= _aNote[1] < _nTime  + _nTimeSpan) and
+                (_nPitch <= _aNote[0] < _nPitch + _nPitchSpan))
+
+
+    def get_notes(self, _nTime, _nPitch, _nTimeSpan, _nPitchSpan):
+        self.check_midi()
+        return tuple([tuple(aNote[:5]) for aNote in self.m_aNotes if self.in_range(aNote, _nTime, _nPitch, _nTimeSpan, _nPitchSpan)])
+
+
+    def remove_notes(self, _nTime, _nPitch, _nTimeSpan, _nPitchSpan):
+        self.check_midi()
+        self.m_aNotes = [aNote for aNote in self.m_aNotes if not self.in_range(aNote, _nTime, _nPitch, _nTimeSpan, _nPitchSpan)]
+
+
+    def replace_selected_notes(self, _aNotes):
+        self.check_midi()
+        self.m_aNotes = [aNote for aNote in self.m_aNotes if not aNote[5]]
+        self.set_notes(_aNotes)
+        for aNote in self.m_aNotes:
+            aNote[5] = (tuple(aNote[:5]) in _aNotes)
+
+listenable(Clip, ['name', 'color'])
+listenable(Clip, ['playing_status'], False)
@@ -0,0 +1,76 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.ClipSlot stand-in. Clips launch right away (no launch quantization).
+# ******************************************************************************
+
+from Base import LiveObject, listenable
+from Clip import Clip
+
+
+class ClipSlot(LiveObject):
+
+    def __init__(self, _oTrack):
+        LiveObject.__init__(self)
+        self.m_oTrack  = _oTrack
+        self.m_oClip   = None
+        self.m_hValues['has_clip'] = False
+
+
+    def get_clip(self):
+        return self.m_oClip
+
+    clip = property(get_clip)
+
+
+    def get_is_playing(self):
+        return (self.m_oClip != None and self.m_oClip.is_playing)
+
+    is_playing = property(get_is_playing)
+
+
+    def set_clip(self, _oClip):
+        if (self.m_oClip != None):
+            self.m_oClip.set_playing(False)
+        self.m_oClip = _oClip
+        self.set_value('has_clip', (_oClip != None))
+
+
+    def create_clip(self, _nLength, _sName = u'', _bMidi = True):
+        if (self.m_oClip != None):
+            raise RuntimeError('Clip slot is not empty')
+        self.set_clip(Clip(self, _sName, _nLength, _bMidi))
+        return self.m_oClip
+
+
+    def delete_clip(self):
+        self.set_clip(None)
+
+
+    def fire(self):
+        if (self.m_oClip == None):
+            # an empty slot stops the track (the slot has a stop button)
+            self.m_oTrack.stop_all_clips(False)
+            return
+        self.m_oTrack.play_slot(self)
+
+
+    def stop(self):
+        if (self.m_oClip != None):
+            self.m_oClip.set_playing(False)
+
+listenable(ClipSlot, ['has_clip'])
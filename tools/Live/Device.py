@@ -0,0 +1,35 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.Device stand-in
+# ******************************************************************************
+
+from Base import LiveObject, listenable
+
+
+class Device(LiveObject):
+
+    def __init__(self, _sName, _sClassName, _sClassDisplayName, _aParameters):
+        LiveObject.__init__(self)
+        self.class_name         = _sClassName
+        self.class_display_name = _sClassDisplayName
+        self.parameters         = tuple(_aParameters)
+        self.type               = 2 # audio effect
+        self.can_have_chains    = (_sClassName == 'AudioEffectGroupDevice')
+        self.m_hValues['name']  = _sName
+
+listenable(Device, ['name'])
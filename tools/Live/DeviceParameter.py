@@ -0,0 +1,57 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.DeviceParameter stand-in
+# ******************************************************************************
+
+from Base import LiveObject, listenable
+
+
+class DeviceParameter(LiveObject):
+
+    def __init__(self, _sName, _nValue = 0.0, _nMin = 0.0, _nMax = 1.0, _aItems = None):
+        LiveObject.__init__(self)
+        self.name          = _sName
+        self.original_name = _sName
+        self.min           = _nMin
+        self.max           = _nMax
+        self.default_value = _nValue
+        self.is_quantized  = (_aItems != None)
+        self.value_items   = tuple(_aItems) if (_aItems != None) else ()
+        self.is_enabled    = True
+        self.m_hValues['value'] = _nValue
+
+
+    def get_value(self):
+        return self.m_hValues['value']
+
+
+    def set_param_value(self, _nValue):
+        # Live refuses the values out of range
+        if (_nValue < self.min or _nValue > self.max):
+            raise RuntimeError('Invalid value')
+        self.set_value('value', _nValue)
+
+    value = property(get_value, set_param_value)
+
+
+    def __str__(self):
+        if (self.is_quantized):
+            return str(self.value_items[int(self.value)])
+        return '%.2f' % (self.value)
+
+listenable(DeviceParameter, ['value'])
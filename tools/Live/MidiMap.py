@@ -0,0 +1,39 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.MidiMap stand-in: the constants the scripts pass to Live
+# ******************************************************************************
+
+class MapMode(object):
+    absolute                      = 0
+    absolute_14_bit               = 1
+    relative_signed_bit           = 2
+    relative_binary_offset        = 3
+    relative_two_compliment       = 4
+    relative_signed_bit2          = 5
+    relative_smooth_signed_bit    = 6
+    relative_smooth_binary_offset = 7
+    relative_smooth_two_compliment= 8
+    relative_smooth_signed_bit2   = 9
+
+
+def forward_midi_cc(_hScript, _hMidiMap, _nChannel, _nCc):
+    return True
+
+
+def forward_midi_note(_hScript, _hMidiMap, _nChannel, _nNote):
+    return True
@@ -0,0 +1,41 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.MixerDevice stand-in
+# ******************************************************************************
+
+from Base import LiveObject, listenable
+from DeviceParameter import DeviceParameter
+
+
+class MixerDevice(LiveObject):
+
+    # crossfade_assign values
+    A    = 0
+    NONE = 1
+    B    = 2
+
+    def __init__(self, _nSends):
+        LiveObject.__init__(self)
+        self.volume      = DeviceParameter(u'Track Volume', 0.85)
+        self.panning     = DeviceParameter(u'Track Panning', 0.0, -1.0, 1.0)
+        self.cue_volume  = DeviceParameter(u'Cue Volume', 0.85)
+        self.crossfader  = DeviceParameter(u'Crossfade', 0.0, -1.0, 1.0)
+        self.sends       = tuple([DeviceParameter(u'%s-Send' % (chr(ord('A') + nIdx)), 0.0) for nIdx in range(_nSends)])
+        self.m_hValues['crossfade_assign'] = MixerDevice.NONE
+
+listenable(MixerDevice, ['crossfade_assign', 'sends'])
@@ -0,0 +1,44 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.Scene stand-in
+# ******************************************************************************
+
+from Base import LiveObject, listenable
+
+
+class Scene(LiveObject):
+
+    def __init__(self, _oSong, _sName, _nColor = 0x3c3c3c):
+        LiveObject.__init__(self)
+        self.m_oSong = _oSong
+        self.m_hValues['name']  = _sName
+        self.m_hValues['color'] = _nColor
+
+
+    def get_clip_slots(self):
+        nIdx = list(self.m_oSong.scenes).index(self)
+        return tuple([oTrack.clip_slots[nIdx] for oTrack in self.m_oSong.tracks])
+
+    clip_slots = property(get_clip_slots)
+
+
+    def fire(self):
+        for oSlot in self.clip_slots:
+            oSlot.fire()
+
+listenable(Scene, ['name', 'color'])
@@ -0,0 +1,119 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.Song stand-in. The song time only moves when the simulator advances
+# the clock (see Song.advance), so the runs are deterministic.
+# ******************************************************************************
+
+from Base import LiveObject, listenable
+from Scene import Scene
+from Track import copy_clip
+
+
+class Song(LiveObject):
+
+    def __init__(self):
+        LiveObject.__init__(self)
+        self.view         = View(self)
+        self.master_track = None
+        self.signature_numerator   = 4
+        self.signature_denominator = 4
+        self.m_hValues['tracks']            = ()
+        self.m_hValues['return_tracks']     = ()
+        self.m_hValues['scenes']            = ()
+        self.m_hValues['tempo']             = 120.0
+        self.m_hValues['current_song_time'] = 0.0
+        self.m_hValues['session_record']    = False
+        self.m_hValues['is_playing']        = False
+
+
+    def get_visible_tracks(self):
+        return self.tracks # no folded groups in the simulated sets
+
+    visible_tracks = property(get_visible_tracks)
+
+
+    def advance(self, _nSeconds):
+        """Moves the song time (and the playing clips) by _nSeconds"""
+        if (not self.is_playing):
+            return
+        nBeats = self.tempo / 60.0 * _nSeconds
+        for oTrack in self.tracks:
+            for oSlot in oTrack.clip_slots:
+                if (oSlot.is_playing):
+                    oSlot.clip.advance(nBeats)
+        self.current_song_time = self.current_song_time + nBeats
+
+
+    def start_playing(self):
+        self.is_playing = True
+
+
+    def continue_playing(self):
+        self.is_playing = True
+
+
+    def stop_playing(self):
+        self.is_playing = False
+
+
+    def jump_by(self, _nBeats):
+        self.current_song_time = max(0.0, self.current_song_time + _nBeats)
+
+
+    def stop_all_clips(self, _bQuantized = True):
+        for oTrack in self.tracks:
+            oTrack.stop_all_clips(_bQuantized)
+
+
+    def duplicate_scene(self, _nIdx):
+        nNewIdx = _nIdx + 1
+        oScene  = self.scenes[_nIdx]
+        oNew    = Scene(self, oScene.name, oScene.color)
+        for oTrack in self.tracks:
+            oSlot = oTrack.insert_slot(nNewIdx)
+            oClip = oTrack.clip_slots[_nIdx].clip
+            if (oClip != None):
+                copy_clip(oClip, oSlot)
+        aScenes = list(self.scenes)
+        aScenes.insert(nNewIdx, oNew)
+        self.scenes = tuple(aScenes)
+
+listenable(Song, ['tracks', 'return_tracks', 'scenes', 'tempo', 'current_song_time', 'session_record', 'is_playing'])
+
+
+class View(LiveObject):
+
+    def __init__(self, _oSong):
+        LiveObject.__init__(self)
+        self.m_oSong     = _oSong
+        self.follow_song = False
+        self.detail_clip = None
+        self.m_hValues['selected_track'] = None
+        self.m_hValues['selected_scene'] = None
+
+
+    def get_highlighted_clip_slot(self):
+        oTrack = self.selected_track
+        oScene = self.selected_scene
+        if (oTrack == None or oScene == None or len(oTrack.clip_slots) == 0):
+            return None
+        return oTrack.clip_slots[list(self.m_oSong.scenes).index(oScene)]
+
+    highlighted_clip_slot = property(get_highlighted_clip_slot)
+
+listenable(View, ['selected_track', 'selected_scene'])
@@ -0,0 +1,92 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# Live.Track stand-in, used for the audio/MIDI tracks, the returns and the
+# master track
+# ******************************************************************************
+
+from Base import LiveObject, listenable
+from ClipSlot import ClipSlot
+from MixerDevice import MixerDevice
+
+
+class Track(LiveObject):
+
+    def __init__(self, _sName, _nScenes, _nSends, _bClips = True, _nColor = 0x1aff2f):
+        LiveObject.__init__(self)
+        self.mixer_device    = MixerDevice(_nSends)
+        self.can_be_armed    = _bClips # returns and master can not be armed
+        self.is_foldable     = False
+        self.is_grouped      = False
+        self.has_audio_input = True
+        self.m_hValues['name']       = _sName
+        self.m_hValues['color']      = _nColor
+        self.m_hValues['mute']       = False
+        self.m_hValues['solo']       = False
+        self.m_hValues['arm']        = False
+        self.m_hValues['devices']    = ()
+        self.m_hValues['clip_slots'] = tuple([ClipSlot(self) for nIdx in range(_nScenes)]) if (_bClips) else ()
+        self.m_hValues['playing_slot_index'] = -1
+
+
+    def add_device(self, _oDevice):
+        self.devices = self.devices + (_oDevice,)
+
+
+    def insert_slot(self, _nIdx):
+        aSlots = list(self.clip_slots)
+        aSlots.insert(_nIdx, ClipSlot(self))
+        self.clip_slots = tuple(aSlots)
+        return aSlots[_nIdx]
+
+
+    def play_slot(self, _oSlot):
+        for oSlot in self.clip_slots:
+            if (oSlot != _oSlot):
+                oSlot.stop()
+        _oSlot.clip.set_playing(True)
+        self.playing_slot_index = list(self.clip_slots).index(_oSlot)
+
+
+    def stop_all_clips(self, _bQuantized = True):
+        for oSlot in self.clip_slots:
+            oSlot.stop()
+        self.playing_slot_index = -1
+
+
+    def duplicate_clip_slot(self, _nIdx):
+        """Copies the clip to the next empty slot below, returns its index"""
+        oSource = self.clip_slots[_nIdx].clip
+        if (oSource == None):
+            raise RuntimeError('Clip slot is empty')
+        for nIdx in range(_nIdx + 1, len(self.clip_slots)):
+            oSlot = self.clip_slots[nIdx]
+            if (oSlot.clip == None):
+                copy_clip(oSource, oSlot)
+                return nIdx
+        raise RuntimeError('No empty clip slot found')
+
+listenable(Track, ['name', 'color', 'mute', 'solo', 'arm', 'devices', 'clip_slots', 'playing_slot_index'])
+
+
+def copy_clip(_oClip, _oSlot):
+    oCopy = _oSlot.create_clip(_oClip.length, _oClip.name, _oClip.is_midi_clip)
+    for sAttr in ['loop_start', 'loop_end', 'start_marker', 'end_marker', 'looping', 'warping', 'warp_mode', 'pitch_coarse', 'color_index', 'file_path']:
+        setattr(oCopy, sAttr, getattr(_oClip, sAttr))
+    oCopy.color    = _oClip.color
+    oCopy.m_aNotes = [list(aNote) for aNote in _oClip.m_aNotes]
+    return oCopy
@@ -0,0 +1,33 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+
+# ******************************************************************************
+# In-process stand-in for Ableton Live's 'Live' module, used to run the
+# scripts outside Live (benchmarks, CI). It is a package inside tools/ so it
+# never shadows the real module when Live loads the scripts.
+# See tools/livesim.py to build a set and boot the controller.
+# ******************************************************************************
+
+import Base
+import MidiMap
+import DeviceParameter
+import Device
+import MixerDevice
+import Clip
+import ClipSlot
+import Track
+import Scene
+import Song
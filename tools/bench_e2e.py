@@ -0,0 +1,285 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+# ******************************************************************************
+# End-to-end benchmark: boots AaMakro5oul on the Live simulator (livesim.py)
+# and plays the part of the GUI over real UDP sockets. Every mix sends its
+# actions to rx_port, ticks the simulator (update_display) and reads the
+# feedback sent to tx_port. It reports, as JSON:
+#   - callbacks per second dispatched during the ticks
+#   - inbound to feedback latency (p50/p99 milliseconds)
+#   - outbound bytes and datagrams per action
+#   - time spent per update_display tick
+#
+# Usage (outside Ableton Live, with the same python 2 as Live):
+#   python tools/bench_e2e.py [--ticks N] [--rate N] [--mix NAME] [--set name=value] ...
+# ******************************************************************************
+
+import sys
+import time
+import json
+import errno
+import socket
+import argparse
+
+import livesim
+import OSC
+
+# ******************************************************************************
+# Traffic mixes, each action is a list of (address, arguments) sent at once
+# ******************************************************************************
+
+def fader_sweeps(_nTracks, _nScenes):
+    # one GUI fader moving at a time, 16 steps per sweep, up and down
+    nAction = 0
+    while (True):
+        nTrack = (nAction / 32) % min(_nTracks, 8)
+        nStep  = nAction % 32
+        nValue = (nStep if (nStep < 16) else 31 - nStep) / 15.0
+        yield [('/track/vol/fader/%d' % (nTrack), (nValue,))]
+        nAction += 1
+
+
+def clip_launches(_nTracks, _nScenes):
+    nAction = 0
+    while (True):
+        nTrack = nAction % min(_nTracks, 8)
+        nScene = (nAction / min(_nTracks, 8)) % min(_nScenes, 8)
+        yield [('/track/clip/%d/%d' % (nTrack, nScene), (1.0,))]
+        nAction += 1
+
+
+def device_toggles(_nTracks, _nScenes):
+    # channel 'a' controls the first track, its devices are switched on and off
+    yield [('/track/dev/select/track/a', (0, 1.0))]
+    aDevices = ['eq3', 'filter', 'rev', 'chor', 'flan', 'phas', 'brepeat']
+    nAction  = 0
+    while (True):
+        sDevice = aDevices[(nAction / 2) % len(aDevices)]
+        yield [('/track/dev/%s/toggle/dev/a' % (sDevice), (float((nAction + 1) % 2),))]
+        nAction += 1
+
+
+def session_scrolls(_nTracks, _nScenes):
+    aCmds   = ['down', 'down', 'right', 'up', 'up', 'left']
+    nAction = 0
+    while (True):
+        yield [('/session/cmd/%s' % (aCmds[nAction % len(aCmds)]), (1.0,))]
+        nAction += 1
+
+
+def mixed(_nTracks, _nScenes):
+    # a DJ set: mostly faders, some launches and toggles, a scroll now and then
+    aSources = [fader_sweeps(_nTracks, _nScenes), clip_launches(_nTracks, _nScenes),
+                device_toggles(_nTracks, _nScenes), session_scrolls(_nTracks, _nScenes)]
+    aPattern = [0, 0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 1, 2, 0, 3]
+    nAction  = 0
+    while (True):
+        yield aSources[aPattern[nAction % len(aPattern)]].next()
+        nAction += 1
+
+
+MIXES = [
+    ('fader_sweeps'   , fader_sweeps),
+    ('clip_launches'  , clip_launches),
+    ('device_toggles' , device_toggles),
+    ('session_scrolls', session_scrolls),
+    ('mixed'          , mixed),
+]
+
+# ******************************************************************************
+
+def percentile(_aSorted, _nPercent):
+    if (len(_aSorted) == 0):
+        return None
+    nIdx = int(round((len(_aSorted) - 1) * _nPercent / 100.0))
+    return _aSorted[nIdx]
+
+
+def summary_ms(_aSeconds):
+    aSorted = sorted(_aSeconds)
+    if (len(aSorted) == 0):
+        return None
+    return {
+        'mean': round(1000.0 * sum(aSorted) / len(aSorted), 4),
+        'p50' : round(1000.0 * percentile(aSorted, 50), 4),
+        'p99' : round(1000.0 * percentile(aSorted, 99), 4),
+        'max' : round(1000.0 * aSorted[-1], 4),
+    }
+
+
+def free_udp_port():
+    oSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    oSocket.bind(('127.0.0.1', 0))
+    nPort = oSocket.getsockname()[1]
+    oSocket.close()
+    return nPort
+
+
+class Gui:
+    """The remote side: sends the actions and collects the feedback"""
+
+    def __init__(self):
+        self.m_oEncoder = OSC.OSCEncoder()
+        self.m_oTx      = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.m_oRx      = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.m_oRx.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self.m_oRx.bind(('127.0.0.1', 0))
+        self.m_oRx.setblocking(0)
+        self.m_nRxPort  = 0
+        self.m_aBuffer  = bytearray(65536)
+
+
+    def feedback_port(self):
+        return self.m_oRx.getsockname()[1]
+
+
+    def send(self, _aAction):
+        nBytes = 0
+        for (sAddress, aArgs) in _aAction:
+            sData   = self.m_oEncoder.encodeMessage(sAddress, aArgs)
+            nBytes += self.m_oTx.sendto(sData, ('127.0.0.1', self.m_nRxPort))
+        return nBytes
+
+
+    def drain(self):
+        """Returns [time of the first datagram or None, datagrams, bytes]"""
+        nFirst     = None
+        nDatagrams = 0
+        nBytes     = 0
+        while (True):
+            try:
+                nSize = self.m_oRx.recv_into(self.m_aBuffer)
+            except socket.error, oError:
+                if (oError.errno in (errno.EAGAIN, errno.EWOULDBLOCK)):
+                    break
+                raise
+            if (nFirst == None):
+                nFirst = time.time()
+            nDatagrams += 1
+            nBytes     += nSize
+        return [nFirst, nDatagrams, nBytes]
+
+
+    def close(self):
+        self.m_oTx.close()
+        self.m_oRx.close()
+
+
+def run_mix(_oSim, _oGui, _fMix, _nTicks, _nRate, _nTracks, _nScenes):
+    oManager   = _oSim.script().m_oOscServer.callbackManager
+    oActions   = _fMix(_nTracks, _nScenes)
+    aLatencies = []
+    aTicks     = []
+    nActions   = 0
+    nSilent    = 0 # actions without feedback in their tick
+    nRxBytes   = 0
+    nTxBytes   = 0
+    nTxDgrams  = 0
+    nCallbacks = oManager.dispatched
+
+    _oGui.drain() # feedback left by the previous mix
+    for nTick in xrange(_nTicks):
+        aSent = []
+        for nAction in xrange(_nRate):
+            nSent     = time.time()
+            nRxBytes += _oGui.send(oActions.next())
+            aSent.append(nSent)
+        nActions += len(aSent)
+
+        nStart = time.time()
+        _oSim.tick()
+        aTicks.append(time.time() - nStart)
+
+        aFeedback  = _oGui.drain()
+        nTxDgrams += aFeedback[1]
+        nTxBytes  += aFeedback[2]
+        for nSent in aSent:
+            if (aFeedback[0] == None):
+                nSilent += 1
+            else:
+                aLatencies.append(aFeedback[0] - nSent)
+
+    nCallbacks = oManager.dispatched - nCallbacks
+    nTickTime  = sum(aTicks)
+    return {
+        'ticks'                 : _nTicks,
+        'actions'               : nActions,
+        'actions_without_reply' : nSilent,
+        'callbacks'             : nCallbacks,
+        'callbacks_per_sec'     : round(nCallbacks / nTickTime, 1) if (nTickTime > 0) else None,
+        'latency_ms'            : summary_ms(aLatencies),
+        'rx_bytes_per_action'   : round(float(nRxBytes) / max(nActions, 1), 2),
+        'tx_bytes_per_action'   : round(float(nTxBytes) / max(nActions, 1), 2),
+        'tx_datagrams_per_action': round(float(nTxDgrams) / max(nActions, 1), 3),
+        'tick_ms'               : summary_ms(aTicks),
+    }
+
+
+def main():
+    oParser = argparse.ArgumentParser(description = 'AaMakro5oul end-to-end OSC benchmark (JSON on stdout)')
+    oParser.add_argument('--ticks'  , type = int, default = 200, help = 'update_display ticks per mix')
+    oParser.add_argument('--rate'   , type = int, default = 4  , help = 'actions sent per tick')
+    oParser.add_argument('--tracks' , type = int, default = 8)
+    oParser.add_argument('--scenes' , type = int, default = 8)
+    oParser.add_argument('--devices', type = int, default = None, help = 'devices per track (all by default)')
+    oParser.add_argument('--mix'    , action = 'append', help = 'mix to run (all by default): %s' % (', '.join([aMix[0] for aMix in MIXES])))
+    oParser.add_argument('--set'    , action = 'append', default = [], help = 'config.txt override, i.e. --set tx_dedup=false')
+    oParser.add_argument('--play'   , action = 'store_true', help = 'run with the transport playing (beat feedback included)')
+    oArgs = oParser.parse_args()
+
+    oGui    = Gui()
+    hConfig = {
+        'rx_port': str(free_udp_port()),
+        'tx_port': str(oGui.feedback_port()),
+        'log'    : 'false',
+    }
+    for sSetting in oArgs.set:
+        (sName, sValue) = sSetting.split('=', 1)
+        hConfig[sName.strip()] = sValue.strip()
+    oGui.m_nRxPort = int(hConfig['rx_port'])
+
+    nStart = time.time()
+    oSim   = livesim.Simulator(oArgs.tracks, oArgs.scenes, 2, oArgs.devices, True, hConfig)
+    nBoot  = time.time() - nStart
+    if (oArgs.play):
+        oSim.play()
+
+    hResults = {}
+    for (sName, fMix) in MIXES:
+        if (oArgs.mix and sName not in oArgs.mix):
+            continue
+        hResults[sName] = run_mix(oSim, oGui, fMix, oArgs.ticks, oArgs.rate, oArgs.tracks, oArgs.scenes)
+
+    hStats = oSim.script().m_oOscServer.stats()
+    oSim.shutdown()
+    oGui.close()
+
+    hReport = {
+        'python'  : sys.version.split()[0],
+        'set'     : {'tracks': oArgs.tracks, 'scenes': oArgs.scenes, 'returns': 2, 'devices': oArgs.devices},
+        'ticks'   : oArgs.ticks,
+        'rate'    : oArgs.rate,
+        'playing' : oArgs.play,
+        'config'  : hConfig,
+        'boot_ms' : round(1000.0 * nBoot, 2),
+        'mixes'   : hResults,
+        'server'  : hStats,
+    }
+    print json.dumps(hReport, indent = 2, sort_keys = True)
+
+
+if __name__ == '__main__':
+    main()
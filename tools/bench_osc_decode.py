@@ -0,0 +1,98 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+# ******************************************************************************
+# OSC decoder benchmark: compares the callbacks per second that the
+# CallbackManager dispatches with the slicing decoder (OSC.decodeOSC) and
+# with the offset-based decoder (OSC.decodeOSCBuffer).
+#
+# Usage (outside Ableton Live, with the same python 2 as Live):
+#   python tools/bench_osc_decode.py [seconds per case]
+# ******************************************************************************
+
+import sys
+import time
+
+# the stand-in 'Live' package (tools/Live) and the scripts
+import livesim
+import OSC
+
+# ******************************************************************************
+
+def build_datagrams():
+    oEncoder = OSC.OSCEncoder()
+    hCases   = {}
+
+    hCases['fader'] = oEncoder.encodeMessage('/track/vol/fader/3', (0.42,))
+    hCases['edit']  = oEncoder.encodeMessage('/EDIT', ('track_clip_3_5', '{"label": "Some clip name", "css": "background-color: #ff8800"}'))
+
+    aElements = []
+    for nTrack in range(8):
+        for nScene in range(8):
+            aElements.append(oEncoder.encodeElement('/track/clip/%d/%d' % (nTrack, nScene), (0.0,)))
+    hCases['bundle_64'] = oEncoder.encodeBundle(aElements)
+
+    sBundle  = hCases['bundle_64']
+    aBundles = [OSC.INT_STRUCT.pack(len(sBundle)) + sBundle for nIdx in range(8)]
+    hCases['nested_8x64'] = oEncoder.encodeBundle(aBundles)
+
+    return hCases
+
+
+class CountingManager(OSC.CallbackManager):
+    """Counts the dispatched messages instead of looking up callbacks"""
+
+    def __init__(self, _fDecoder):
+        OSC.CallbackManager.__init__(self, _fDecoder)
+        self.m_nCount = 0
+
+    def dispatch(self, _aMessage):
+        if (_aMessage[0] == '#bundle'):
+            self.unbundler(_aMessage)
+        else:
+            self.m_nCount += 1
+
+
+def run_case(_fDecoder, _sData, _nSeconds):
+    oManager = CountingManager(_fDecoder)
+
+    nStart = time.time()
+    nEnd   = nStart + _nSeconds
+    nLoops = 0
+    while (time.time() < nEnd):
+        for nIdx in xrange(100):
+            oManager.handle(_sData)
+        nLoops += 100
+
+    nElapsed = time.time() - nStart
+    return (oManager.m_nCount / nElapsed, nLoops / nElapsed)
+
+
+def main():
+    nSeconds = float(sys.argv[1]) if (len(sys.argv) > 1) else 1.0
+    hCases   = build_datagrams()
+
+    print '%-12s %8s %16s %16s %8s' % ('case', 'bytes', 'legacy cb/s', 'buffer cb/s', 'speedup')
+    for sCase in sorted(hCases.keys()):
+        sData = hCases[sCase]
+        assert OSC.decodeOSC(sData) == OSC.decodeOSCBuffer(sData)
+
+        nLegacy = run_case(OSC.decodeOSC      , sData, nSeconds)[0]
+        nBuffer = run_case(OSC.decodeOSCBuffer, sData, nSeconds)[0]
+        print '%-12s %8d %16.0f %16.0f %7.2fx' % (sCase, len(sData), nLegacy, nBuffer, nBuffer / nLegacy)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,314 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+# ******************************************************************************
+# Headless Live simulator: builds a set with the stand-in 'Live' package
+# (tools/Live), boots the AaMakro5oul controller on it and drives it with a
+# deterministic clock (every tick moves the song time 100 ms and runs
+# update_display, as Live does).
+#
+# Usage (outside Ableton Live, with the same python 2 as Live):
+#   python tools/livesim.py [tracks] [scenes] [devices per track] [ticks]
+#
+# From other tools:
+#   import livesim
+#   oSim = livesim.Simulator(_nTracks = 16, _hConfig = {'rx_port': '12720'})
+#   oSim.play()
+#   oSim.tick(10)
+#   oSim.shutdown()
+# ******************************************************************************
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sToolsDir = os.path.dirname(os.path.abspath(__file__))
+sRootDir  = os.path.dirname(sToolsDir)
+for sDir in (sRootDir, sToolsDir): # tools first, it holds the 'Live' package
+    if (sDir in sys.path):
+        sys.path.remove(sDir)
+    sys.path.insert(0, sDir)
+
+import Live
+
+# ******************************************************************************
+# Devices (the ones the TrackDev modules look for), the parameters are
+# named as the original names of Live 9 devices
+# ******************************************************************************
+
+# quantized parameters: name -> number of value items
+QUANTIZED = {
+    'Slope'                       : 2,
+    'Filter Type'                 : 4,
+    'Filter Circuit - LP/HP'      : 5,
+    'Filter Circuit - BP/NO/Morph': 2,
+    'LFO Quantize Rate'           : 8,
+    'LFO Waveform'                : 6,
+    'LFO Sync'                    : 2,
+    'LFO Sync Rate'               : 21,
+    'LFO Stereo Mode'             : 2,
+    'Sync'                        : 2,
+    'Sync Rate'                   : 21,
+    'Quality'                     : 3,
+    'Delay 2 Mode'                : 3,
+    'Polarity'                    : 2,
+    'Poles'                       : 6,
+    'Type'                        : 2,
+    'Interval'                    : 8,
+    'Offset'                      : 16,
+    'Repeat'                      : 2,
+    'Grid'                        : 16,
+    'Variation Type'              : 4,
+    'Mix Type'                    : 3,
+}
+
+# continuous parameters out of [0, 1]: name -> (min, max)
+RANGES = {
+    'Filter Width': (0.5, 9.0),
+}
+
+DEVICES = [
+    # class name, display name, device name, parameters
+    ('FilterEQ3', 'EQ Three', 'EQ Three', [
+        'Device On', 'Slope', 'LowOn', 'MidOn', 'HighOn', 'GainLo', 'GainMid', 'GainHi', 'FreqLo', 'FreqHi']),
+    ('AutoFilter', 'Auto Filter', 'Auto Filter', [
+        'Device On', 'Env. Modulation', 'Env. Attack', 'Env. Release', 'Filter Type', 'Filter Circuit - LP/HP',
+        'Filter Circuit - BP/NO/Morph', 'Slope', 'LFO Quantize On', 'LFO Quantize Rate', 'Frequency', 'Resonance',
+        'Drive', 'LFO Amount', 'LFO Waveform', 'LFO Sync Rate', 'LFO Sync', 'LFO Phase', 'LFO Spin',
+        'LFO Stereo Mode', 'LFO Freq', 'LFO Offset', 'Morph']),
+    ('Reverb', 'Reverb', 'Reverb', [
+        'Device On', 'In LowCut On', 'In HighCut On', 'In Filter Freq', 'In Filter Width', 'PreDelay',
+        'ER Spin On', 'ER Spin Rate', 'ER Spin Amount', 'ER Shape', 'Quality', 'Room Size', 'Stereo Image',
+        'HiShelf On', 'HiShelf Freq', 'HiShelf Gain', 'LowShelf On', 'LowShelf Freq', 'LowShelf Gain',
+        'Chorus On', 'Chorus Rate', 'Chorus Amount', 'Decay Time', 'Freeze On', 'Flat On', 'Cut On', 'Density',
+        'Scale', 'ER Level', 'Diffuse Level', 'Dry/Wet']),
+    ('AudioEffectGroupDevice', 'Audio Effect Rack', 'EchoOut', [
+        'Device On', 'Macro 1', 'Macro 2', 'Macro 3', 'Macro 4', 'Macro 5', 'Macro 6', 'Macro 7', 'Macro 8']),
+    ('Chorus', 'Chorus', 'Chorus', [
+        'Device On', 'Delay 1 Time', 'Delay 1 HiPass', 'Delay 2 Time', 'Delay 2 Mode', 'Link On', 'LFO Amount',
+        'LFO Rate', 'LFO Extend On', 'Feedback', 'Polarity', 'Dry/Wet']),
+    ('Flanger', 'Flanger', 'Flanger', [
+        'Device On', 'Hi Pass', 'Dry/Wet', 'Delay Time', 'Feedback', 'Polarity', 'Env. Modulation',
+        'Env. Attack', 'Env. Release', 'LFO Amount', 'LFO Waveform', 'Frequency', 'Sync Rate', 'Sync',
+        'LFO Phase', 'LFO Spin', 'LFO Stereo Mode', 'LFO Offset', 'LFO Width (Random)']),
+    ('Phaser', 'Phaser', 'Phaser', [
+        'Device On', 'Poles', 'Type', 'Color', 'Dry/Wet', 'Frequency', 'Feedback', 'Env. Modulation',
+        'Env. Attack', 'Env. Release', 'LFO Amount', 'LFO Waveform', 'LFO Frequency', 'LFO Sync Rate',
+        'LFO Sync', 'LFO Phase', 'LFO Spin', 'LFO Stereo Mode', 'LFO Offset', 'LFO Width (Random)']),
+    ('BeatRepeat', 'Beat Repeat', 'Beat Repeat', [
+        'Device On', 'Interval', 'Offset', 'Repeat', 'Chance', 'Gate', 'Grid', 'Block Triplets', 'Variation',
+        'Variation Type', 'Pitch', 'Pitch Decay', 'Volume', 'Decay', 'Filter On', 'Filter Freq',
+        'Filter Width', 'Mix Type']),
+]
+
+
+def create_param(_sName):
+    sName = unicode(_sName)
+    if (_sName.endswith(' On') or _sName in ('LowOn', 'MidOn', 'HighOn')):
+        return Live.DeviceParameter.DeviceParameter(sName, 1.0 if (_sName == 'Device On') else 0.0, 0.0, 1.0, [u'Off', u'On'])
+    if (_sName in QUANTIZED):
+        nItems = QUANTIZED[_sName]
+        return Live.DeviceParameter.DeviceParameter(sName, 0.0, 0.0, float(nItems - 1), [u'%s %d' % (sName, nIdx) for nIdx in range(nItems)])
+    if (_sName in RANGES):
+        (nMin, nMax) = RANGES[_sName]
+        return Live.DeviceParameter.DeviceParameter(sName, (nMin + nMax) / 2.0, nMin, nMax)
+    return Live.DeviceParameter.DeviceParameter(sName, 0.5)
+
+
+def create_device(_aTemplate):
+    (sClass, sDisplay, sName, aParams) = _aTemplate
+    return Live.Device.Device(unicode(sName), sClass, sDisplay, [create_param(sParam) for sParam in aParams])
+
+
+# ******************************************************************************
+# Set builder
+# ******************************************************************************
+
+def build_song(_nTracks = 8, _nScenes = 8, _nReturns = 2, _nDevices = None, _bClips = True):
+    """
+    Builds a song with _nTracks tracks (the odd ones MIDI) of _nScenes clip
+    slots, _nReturns returns and the master. Every track and return gets the
+    first _nDevices devices of DEVICES (all of them if None). With _bClips
+    every slot gets a 4 bars clip, the MIDI ones with a note every beat.
+    """
+    oSong    = Live.Song.Song()
+    aDevices = DEVICES if (_nDevices == None) else DEVICES[:_nDevices]
+
+    aTracks = []
+    for nTrack in range(_nTracks):
+        oTrack = Live.Track.Track(u'%d-Track' % (nTrack + 1), _nScenes, _nReturns, True, 0x1aff2f + nTrack)
+        for aTemplate in aDevices:
+            oTrack.add_device(create_device(aTemplate))
+        if (_bClips):
+            for nScene in range(_nScenes):
+                bMidi = (nTrack % 2 == 1)
+                oClip = oTrack.clip_slots[nScene].create_clip(16.0, u'Clip %d-%d' % (nTrack + 1, nScene + 1), bMidi)
+                if (bMidi):
+                    oClip.set_notes([(36 + nScene, float(nBeat), 0.25, 100, False) for nBeat in range(16)])
+        aTracks.append(oTrack)
+
+    aReturns = []
+    for nReturn in range(_nReturns):
+        oReturn = Live.Track.Track(u'%s-Return' % (chr(ord('A') + nReturn)), _nScenes, _nReturns, False)
+        for aTemplate in aDevices:
+            oReturn.add_device(create_device(aTemplate))
+        aReturns.append(oReturn)
+
+    oSong.master_track  = Live.Track.Track(u'Master', _nScenes, 0, False)
+    oSong.tracks        = tuple(aTracks)
+    oSong.return_tracks = tuple(aReturns)
+    oSong.scenes        = tuple([Live.Scene.Scene(oSong, u'Scene %d' % (nScene + 1)) for nScene in range(_nScenes)])
+
+    if (len(aTracks) > 0):
+        oSong.view.selected_track = aTracks[0]
+    if (_nScenes > 0):
+        oSong.view.selected_scene = oSong.scenes[0]
+
+    return oSong
+
+
+# ******************************************************************************
+# c_instance given by Live to the control surface scripts
+# ******************************************************************************
+
+class ControlSurfaceInstance:
+
+    def __init__(self, _oSong):
+        self.m_oSong     = _oSong
+        self.m_aMessages = [] # status bar messages
+
+    def song(self):
+        return self.m_oSong
+
+    def show_message(self, _sMessage):
+        self.m_aMessages.append(_sMessage)
+
+    def log_message(self, _sMessage):
+        Live.Base.log(_sMessage)
+
+    def set_session_highlight(self, _nTrackOffset, _nSceneOffset, _nWidth, _nHeight, _bIncludeReturns):
+        self.m_aHighlight = (_nTrackOffset, _nSceneOffset, _nWidth, _nHeight, _bIncludeReturns)
+
+    def request_rebuild_midi_map(self):
+        pass
+
+    def send_midi(self, _aBytes):
+        pass
+
+
+# ******************************************************************************
+# Simulator
+# ******************************************************************************
+
+class Simulator:
+
+    TICK = 0.1 # seconds between update_display calls
+
+    def __init__(self, _nTracks = 8, _nScenes = 8, _nReturns = 2, _nDevices = None, _bClips = True, _hConfig = None):
+        """
+        Boots the controller on a new song. _hConfig entries are appended to a
+        copy of AaMakro5oul/config.txt (i.e. {'rx_port': '12720', 'log': 'false'})
+        in a temporary $HOME, which holds the presets and the logs too.
+        """
+        self.m_sHome      = tempfile.mkdtemp(prefix = 'livesim_')
+        self.m_sOldHome   = os.getenv('HOME')
+        self.m_nTicks     = 0
+        self.m_nTime      = 0.0 # simulated seconds
+        self.m_aTickTimes = []  # real seconds spent in update_display
+
+        sConfigDir = os.path.join(self.m_sHome, 'AaMakro5oul')
+        shutil.copytree(os.path.join(sRootDir, 'AaMakro5oul', 'presets'), os.path.join(sConfigDir, 'presets'))
+        shutil.copy(os.path.join(sRootDir, 'AaMakro5oul', 'config.txt'), sConfigDir)
+        if (_hConfig != None):
+            oFile = open(os.path.join(sConfigDir, 'config.txt'), 'a')
+            oFile.write('\n# livesim\n')
+            for sName in sorted(_hConfig.keys()):
+                oFile.write('%s | %s\n' % (sName, _hConfig[sName]))
+            oFile.close()
+        os.environ['HOME'] = self.m_sHome
+
+        self.m_oSong = build_song(_nTracks, _nScenes, _nReturns, _nDevices, _bClips)
+        self.m_oCtrlInstance = ControlSurfaceInstance(self.m_oSong)
+
+        # same sequence Live follows to load a control surface script
+        import AaMakro5oul
+        self.m_oScript = AaMakro5oul.AaMakro5oul(self.m_oCtrlInstance)
+        self.m_oScript.connect_script_instances(())
+        self.m_oScript.build_midi_map(None)
+        self.m_oScript.refresh_state()
+
+
+    def song(self):
+        return self.m_oSong
+
+
+    def script(self):
+        return self.m_oScript
+
+
+    def play(self):
+        self.m_oSong.start_playing()
+
+
+    def stop(self):
+        self.m_oSong.stop_playing()
+
+
+    def tick(self, _nTicks = 1):
+        """Moves the song clock 100 ms and runs update_display, _nTicks times"""
+        for nTick in range(_nTicks):
+            self.m_oSong.advance(Simulator.TICK)
+            self.m_nTime  += Simulator.TICK
+            self.m_nTicks += 1
+
+            nStart = time.time()
+            self.m_oScript.update_display()
+            self.m_aTickTimes.append(time.time() - nStart)
+
+
+    def shutdown(self):
+        self.m_oScript.disconnect()
+        if (self.m_sOldHome != None):
+            os.environ['HOME'] = self.m_sOldHome
+        shutil.rmtree(self.m_sHome, True)
+
+
+# ******************************************************************************
+
+def main():
+    aArgs    = [int(sArg) for sArg in sys.argv[1:]]
+    nTracks  = aArgs[0] if (len(aArgs) > 0) else 8
+    nScenes  = aArgs[1] if (len(aArgs) > 1) else 8
+    nDevices = aArgs[2] if (len(aArgs) > 2) else None
+    nTicks   = aArgs[3] if (len(aArgs) > 3) else 100
+
+    nStart = time.time()
+    oSim   = Simulator(nTracks, nScenes, 2, nDevices, True, {'log': 'false', 'rx_port': '0', 'tx_port': '9'})
+    nBoot  = time.time() - nStart
+
+    oSim.play()
+    oSim.tick(nTicks)
+    oSim.shutdown()
+
+    aTimes = sorted(oSim.m_aTickTimes)
+    print 'booted in %.3f s, %d ticks (%.1f s of song time, %.2f beats)' % (nBoot, nTicks, oSim.m_nTime, oSim.song().current_song_time)
+    if (len(aTimes) > 0):
+        print 'update_display: mean %.3f ms, max %.3f ms' % (1000.0 * sum(aTimes) / len(aTimes), 1000.0 * aTimes[-1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+# ******************************************************************************
+# This file is part of the AaMakro5oul project
+# (An OSC/MIDI controller for Ableton Live with DJ features)
+#
+# Full project source: https://github.com/hiramegl/AaMakro5oul
+#
+# License     : Apache License 2.0
+# Full license: https://github.com/hiramegl/AaMakro5oul/blob/master/LICENSE
+#
+# Copyright 2018, 2019 by Hiram Galicia (hiramegl@yahoo.com)
+# http://www.unasystems.com
+#
+# All rights reserved.
+# ******************************************************************************
+
+# ******************************************************************************
+# Replays a traffic recording (config.txt: record | true) made by
+# RemixNet.TrafficRecorder:
+#   --info    summary of the recording: datagrams, bytes and top addresses
+#   (default) sends the received datagrams to host:port (a running Live) at
+#             their recorded pace, --speed N times faster, 0 as fast as possible
+#   --sim     replays them in the Live simulator (livesim.py), one tick per
+#             100 ms of recorded time, and compares the outbound traffic with
+#             the recorded one (JSON on stdout)
+#
+# Usage (outside Ableton Live, with the same python 2 as Live):
+#   python tools/replay_osc.py osc_2019_05_01__21_00_00.rec [--speed N] [--host H] [--port P]
+#   python tools/replay_osc.py osc_2019_05_01__21_00_00.rec --info
+#   python tools/replay_osc.py osc_2019_05_01__21_00_00.rec --sim [--tracks N] [--scenes N]
+# ******************************************************************************
+
+import sys
+import time
+import json
+import socket
+import argparse
+
+import livesim
+import bench_e2e
+import RemixNet
+
+# ******************************************************************************
+
+def address_of(_sData):
+    if (_sData.startswith('#bundle')):
+        return '#bundle'
+    return _sData[:_sData.find('\0')]
+
+
+def info(_sFile):
+    hCounts    = {RemixNet.TrafficRecorder.IN: [0, 0], RemixNet.TrafficRecorder.OUT: [0, 0]}
+    hAddresses = {}
+    nFirst     = None
+    nLast      = None
+    for (nTime, nDirection, nPort, sData) in RemixNet.readTraffic(_sFile):
+        if (nFirst == None):
+            nFirst = nTime
+        nLast = nTime
+        hCounts[nDirection][0] += 1
+        hCounts[nDirection][1] += len(sData)
+        if (nDirection == RemixNet.TrafficRecorder.IN):
+            sAddress = address_of(sData)
+            hAddresses[sAddress] = hAddresses.get(sAddress, 0) + 1
+
+    aTop = sorted(hAddresses.items(), key = lambda aItem: -aItem[1])[:20]
+    print 'duration: %.1f s' % ((nLast - nFirst) if (nFirst != None) else 0.0)
+    print 'in : %8d datagrams %10d bytes' % tuple(hCounts[RemixNet.TrafficRecorder.IN])
+    print 'out: %8d datagrams %10d bytes' % tuple(hCounts[RemixNet.TrafficRecorder.OUT])
+    for (sAddress, nCount) in aTop:
+        print '%8d %s' % (nCount, sAddress)
+
+
+def replay(_sFile, _sHost, _nPort, _nSpeed):
+    oSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    nStart  = time.time()
+    nFirst  = None
+    nSent   = 0
+    nLate   = 0.0 # worst delay behind the recorded pace
+    for (nTime, nDirection, nPort, sData) in RemixNet.readTraffic(_sFile):
+        if (nDirection != RemixNet.TrafficRecorder.IN):
+            continue
+        if (nFirst == None):
+            nFirst = nTime
+        if (_nSpeed > 0):
+            nDue   = nStart + (nTime - nFirst) / _nSpeed
+            nDelay = nDue - time.time()
+            if (nDelay > 0):
+                time.sleep(nDelay)
+            else:
+                nLate = max(nLate, -nDelay)
+        oSocket.sendto(sData, (_sHost, _nPort))
+        nSent += 1
+    oSocket.close()
+    print 'sent %d datagrams in %.2f s, at most %.1f ms late' % (nSent, time.time() - nStart, 1000.0 * nLate)
+
+
+def replay_sim(_sFile, _nTracks, _nScenes):
+    aRecords = list(RemixNet.readTraffic(_sFile))
+    aIn      = [aRecord for aRecord in aRecords if aRecord[1] == RemixNet.TrafficRecorder.IN]
+    aOut     = [aRecord for aRecord in aRecords if aRecord[1] == RemixNet.TrafficRecorder.OUT]
+
+    oGui    = bench_e2e.Gui()
+    hConfig = {
+        'rx_port': str(bench_e2e.free_udp_port()),
+        'tx_port': str(oGui.feedback_port()),
+        'log'    : 'false',
+        'record' : 'false',
+    }
+    oGui.m_nRxPort = int(hConfig['rx_port'])
+    oSim = livesim.Simulator(_nTracks, _nScenes, 2, None, True, hConfig)
+
+    nTxDgrams = 0
+    nTxBytes  = 0
+    nIdx      = 0
+    nTickEnd  = aIn[0][0] if (len(aIn) > 0) else 0.0
+    while (nIdx < len(aIn)):
+        nTickEnd += livesim.Simulator.TICK
+        while (nIdx < len(aIn) and aIn[nIdx][0] < nTickEnd):
+            oGui.m_oTx.sendto(aIn[nIdx][3], ('127.0.0.1', oGui.m_nRxPort))
+            nIdx += 1
+        oSim.tick()
+        aFeedback  = oGui.drain()
+        nTxDgrams += aFeedback[1]
+        nTxBytes  += aFeedback[2]
+
+    hStats = oSim.script().m_oOscServer.stats()
+    oSim.shutdown()
+    oGui.close()
+
+    hReport = {
+        'recorded': {
+            'in_datagrams' : len(aIn),
+            'in_bytes'     : sum([len(aRecord[3]) for aRecord in aIn]),
+            'out_datagrams': len(aOut),
+            'out_bytes'    : sum([len(aRecord[3]) for aRecord in aOut]),
+        },
+        'replayed': {
+            'ticks'        : oSim.m_nTicks,
+            'out_datagrams': nTxDgrams,
+            'out_bytes'    : nTxBytes,
+            'tick_ms'      : bench_e2e.summary_ms(oSim.m_aTickTimes),
+        },
+        'server': hStats,
+    }
+    print json.dumps(hReport, indent = 2, sort_keys = True)
+
+
+def main():
+    oParser = argparse.ArgumentParser(description = 'Replays an AaMakro5oul OSC traffic recording')
+    oParser.add_argument('file')
+    oParser.add_argument('--info'  , action = 'store_true', help = 'print a summary of the recording')
+    oParser.add_argument('--sim'   , action = 'store_true', help = 'replay in the Live simulator')
+    oParser.add_argument('--speed' , type = float, default = 1.0, help = 'pace factor, 0 -> as fast as possible')
+    oParser.add_argument('--host'  , default = '127.0.0.1')
+    oParser.add_argument('--port'  , type = int, default = 2720)
+    oParser.add_argument('--tracks', type = int, default = 8)
+    oParser.add_argument('--scenes', type = int, default = 8)
+    oArgs = oParser.parse_args()
+
+    if (oArgs.info):
+        info(oArgs.file)
+    elif (oArgs.sim):
+        replay_sim(oArgs.file, oArgs.tracks, oArgs.scenes)
+    else:
+        replay(oArgs.file, oArgs.host, oArgs.port, oArgs.speed)
+
+
+if __name__ == '__main__':
+    main()